@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Batch Driver Benchmark
+
+Runs templates/batch_driver.py over a directory of synthetic job manifests
+with stand-in stage tasks (child processes that sleep for a fixed time per
+stage and print the RESULT lines the real tasks print), so the scheduling
+and the job state are measured, not Manim or TTS:
+
+- one by one:  each job through all stages before the next starts
+               (one video per interactive session)
+- pools:       all jobs through the per-stage worker pools
+
+It then checks the job state:
+
+- crash:    a batch is killed (SIGKILL of the driver and its tasks)
+            part-way through; the rerun must run only the tasks that had
+            not finished, and every job must end up done
+- failure:  a job whose render fails is reported failed while the other
+            jobs finish; the rerun runs only that job's remaining tasks
+- edit:     changing one manifest's ending setting reruns only its mix
+            and upload; changing an uploaded job's title reruns nothing
+
+The stand-in tasks sleep, so the pools' speedup here is the overlap of
+stages; real renders are CPU-bound and gain from RENDER_WORKERS only up
+to the number of cores.
+
+Usage:
+    uv run python benchmarks/bench_batch.py
+    uv run python benchmarks/bench_batch.py --jobs 24 --aspects 3 --workers 4 2 2 2
+"""
+
+import argparse
+import json
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+TEMPLATES_DIR = Path(__file__).resolve().parent.parent / "skills" / "manim-video-creator" / "templates"
+sys.path.insert(0, str(TEMPLATES_DIR))
+
+from batch_driver import STAGES, BatchDriver, JobState  # noqa: E402
+
+ASPECT_NAMES = ["16_9", "9_16", "1_1"]
+
+# Seconds a stand-in task takes (a render per aspect ratio)
+STAGE_SECONDS = {"tts": 0.3, "render": 0.6, "mix": 0.3, "upload": 0.4}
+
+
+class StandInDriver(BatchDriver):
+    """BatchDriver whose tasks are this script in --stand-in mode."""
+
+    def __init__(self, workdir: Path, workers: list, scale: float):
+        super().__init__(str(workdir / "jobs"), str(workdir / "batch"),
+                         str(workdir / "batch" / "state.json"),
+                         dict(zip(STAGES, workers)), upload_command=["unused"])
+        self.record = str(workdir / "tasks.log")
+        self.scale = scale
+
+    def task_command(self, job: dict, stage: str) -> tuple:
+        return ([sys.executable, __file__, "--stand-in", stage, "--record", self.record,
+                 "--scale", str(self.scale)], job["workdir"])
+
+
+def stand_in(args):
+    """Pretend to be a stage task: read its input, sleep, print RESULT lines."""
+    job_id = os.environ["PIPELINE_RUN_ID"]
+    payload = json.loads(sys.stdin.read())
+    unit = payload.get("unit") if isinstance(payload, dict) else None
+    task = args.stand_in if unit is None else f"{args.stand_in}:{unit}"
+    time.sleep(STAGE_SECONDS[args.stand_in] * args.scale)
+    if f"{job_id} {task}" in os.environ.get("BENCH_FAIL", "").split(","):
+        sys.exit(f"injected failure in {task}")
+
+    if args.stand_in == "upload":
+        results = [{"file": entry["file"], "video_id": f"id-{Path(entry['file']).stem}"}
+                   for entry in payload]
+    elif args.stand_in == "render":
+        results = [{"movie": os.path.abspath(f"{unit}.mp4"), "seconds": 0}]
+    elif args.stand_in == "mix":
+        results = [{"outputs": {render["variant"]: os.path.abspath(f"final_{render['variant']}.mp4")
+                                for render in payload["renders"]}}]
+    else:
+        results = [{"duration": 1.0}]
+    # Record the task before reporting it: a task killed in between runs again
+    with open(args.record, "a", encoding="utf-8") as f:
+        f.write(f"{job_id} {task}\n")
+    for result in results:
+        print("RESULT " + json.dumps(result), flush=True)
+
+
+def make_jobs(workdir: Path, count: int, aspects: int):
+    jobs_dir = workdir / "jobs"
+    jobs_dir.mkdir(parents=True)
+    (jobs_dir / "scene.py").write_text("class BenchScene:\n    pass\n")
+    for i in range(count):
+        manifest = {
+            "scene": "scene.py", "scene_class": "BenchScene",
+            "narrations": [f"ナレーション {i}-{n}" for n in range(3)],
+            "aspects": ASPECT_NAMES[:aspects], "bgm": None,
+            "upload": {"title": f"Video {i}", "privacy": "private",
+                       "variants": {"9_16": {"title": f"Video {i} #Shorts"}}},
+        }
+        (jobs_dir / f"job_{i:03d}.json").write_text(json.dumps(manifest, ensure_ascii=False))
+
+
+def recorded(workdir: Path) -> Counter:
+    path = workdir / "tasks.log"
+    if not path.exists():
+        return Counter()
+    return Counter(path.read_text(encoding="utf-8").splitlines())
+
+
+def done_tasks(workdir: Path) -> set:
+    state = JobState(str(workdir / "batch" / "state.json"))
+    return {f"{job_id} {task}" for job_id, tasks in state.jobs.items()
+            for task, entry in tasks.items() if entry["status"] == "done"}
+
+
+def timed_run(driver: BatchDriver) -> tuple:
+    start = time.perf_counter()
+    outcome = driver.run()
+    return time.perf_counter() - start, outcome
+
+
+def one_by_one(workdir: Path, count: int, aspects: int, scale: float) -> float:
+    """Each job through all stages before the next one starts."""
+    make_jobs(workdir, count, aspects)
+    start = time.perf_counter()
+    for manifest in sorted((workdir / "jobs").glob("job_*.json")):
+        single = workdir / manifest.stem
+        (single / "jobs").mkdir(parents=True)
+        (single / "jobs" / "scene.py").write_text((workdir / "jobs" / "scene.py").read_text())
+        manifest.rename(single / "jobs" / manifest.name)
+        StandInDriver(single, [1, 1, 1, 1], scale).run()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the batch driver's pools and job state")
+    parser.add_argument("--jobs", type=int, default=12, help="Job manifests (default: 12)")
+    parser.add_argument("--aspects", type=int, default=2, choices=[1, 2, 3],
+                        help="Aspect ratios per job (default: 2)")
+    parser.add_argument("--workers", type=int, nargs=4, default=[3, 2, 2, 2],
+                        metavar=("TTS", "RENDER", "MIX", "UPLOAD"),
+                        help="Workers per stage (default: 3 2 2 2)")
+    parser.add_argument("--scale", type=float, default=1.0,
+                        help="Multiplier for the stand-in task times (default: 1)")
+    parser.add_argument("--stand-in", choices=STAGES, help=argparse.SUPPRESS)
+    parser.add_argument("--record", help=argparse.SUPPRESS)
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.stand_in:
+        stand_in(args)
+        return
+    if args.child:
+        StandInDriver(Path(args.child), args.workers, args.scale).run()
+        return
+
+    tasks_per_job = 3 + args.aspects
+    total_tasks = args.jobs * tasks_per_job
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        sequential = one_by_one(root / "sequential", args.jobs, args.aspects, args.scale)
+
+        pooled_dir = root / "pooled"
+        make_jobs(pooled_dir, args.jobs, args.aspects)
+        pooled, outcome = timed_run(StandInDriver(pooled_dir, args.workers, args.scale))
+        assert all(outcome.values()), "the batch did not finish every job"
+        assert sum(recorded(pooled_dir).values()) == total_tasks
+
+        # Crash: kill the driver and its running tasks part-way through
+        crash_dir = root / "crash"
+        make_jobs(crash_dir, args.jobs, args.aspects)
+        process = subprocess.Popen([sys.executable, __file__, "--child", str(crash_dir),
+                                    "--workers", *map(str, args.workers), "--scale", str(args.scale)],
+                                   stdout=subprocess.DEVNULL, start_new_session=True)
+        while sum(recorded(crash_dir).values()) < total_tasks * 0.4:
+            assert process.poll() is None, "batch finished before it could be interrupted"
+            time.sleep(0.02)
+        os.killpg(process.pid, signal.SIGKILL)
+        process.wait()
+        finished_before = done_tasks(crash_dir)
+        ran_before = recorded(crash_dir)
+        resumed, outcome = timed_run(StandInDriver(crash_dir, args.workers, args.scale))
+        rerun = recorded(crash_dir) - ran_before
+        assert all(outcome.values()), "the resumed batch did not finish every job"
+        assert not set(rerun) & finished_before, "finished tasks ran again after the crash"
+        assert set(rerun) | finished_before == set(recorded(crash_dir)), "tasks are missing"
+        assert len(done_tasks(crash_dir)) == total_tasks
+
+        # Failure: one job's render fails, the others finish; the rerun completes it
+        fail_dir = root / "failure"
+        make_jobs(fail_dir, args.jobs, args.aspects)
+        os.environ["BENCH_FAIL"] = f"job_001 render:{ASPECT_NAMES[0]}"
+        _, outcome = timed_run(StandInDriver(fail_dir, args.workers, args.scale))
+        del os.environ["BENCH_FAIL"]
+        failed = [job_id for job_id, finished in outcome.items() if not finished]
+        ran_before = recorded(fail_dir)
+        _, outcome = timed_run(StandInDriver(fail_dir, args.workers, args.scale))
+        retried = sorted(recorded(fail_dir) - ran_before)
+        assert failed == ["job_001"], f"expected only job_001 to fail: {failed}"
+        assert all(outcome.values()), "the retried job did not finish"
+        assert {task.split()[0] for task in retried} == {"job_001"}, "other jobs ran again"
+
+        # Edit: a new ending setting reruns that job's mix and upload, a new
+        # title of an uploaded video nothing
+        manifest_path = fail_dir / "jobs" / "job_002.json"
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        manifest["add_ending"] = False
+        manifest_path.write_text(json.dumps(manifest, ensure_ascii=False), encoding="utf-8")
+        ran_before = recorded(fail_dir)
+        StandInDriver(fail_dir, args.workers, args.scale).run()
+        edited = sorted(recorded(fail_dir) - ran_before)
+        assert edited == ["job_002 mix", "job_002 upload"], f"changing the ending reran {edited}"
+
+        manifest["upload"]["title"] += " (revised)"
+        manifest_path.write_text(json.dumps(manifest, ensure_ascii=False), encoding="utf-8")
+        ran_before = recorded(fail_dir)
+        StandInDriver(fail_dir, args.workers, args.scale).run()
+        retitled = sorted(recorded(fail_dir) - ran_before)
+        assert not retitled, f"changing an uploaded video's title reran {retitled}"
+
+    print(f"\n{args.jobs} jobs x {tasks_per_job} tasks ({args.aspects} aspect ratios), "
+          f"stand-in task times {STAGE_SECONDS} x {args.scale:g}")
+    print(f"  one by one:            {sequential:7.2f}s")
+    print(f"  pools {' '.join(map(str, args.workers))} "
+          f"(tts render mix upload): {pooled:7.2f}s  ({sequential / pooled:.1f}x faster)")
+    print(f"  crash: killed after {len(finished_before)}/{total_tasks} tasks, resumed in "
+          f"{resumed:.2f}s running {sum(rerun.values())} tasks, none twice after finishing")
+    print(f"  failure: {failed[0]} failed alone, retry ran {len(retried)} of its tasks")
+    print(f"  edit: new ending setting reran {', '.join(edited)}; new title of an uploaded "
+          f"video reran nothing")
+
+
+if __name__ == "__main__":
+    main()
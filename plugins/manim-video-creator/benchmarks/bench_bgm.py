@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Ambient BGM Benchmark
+
+Compares templates/generate_bgm.py with the original per-sample recipe
+that used to live in SKILL.md, and checks that both produce the same
+16-bit samples (within 1 LSB).
+
+Usage:
+    uv run python benchmarks/bench_bgm.py
+    uv run python benchmarks/bench_bgm.py --seconds 30
+"""
+
+import argparse
+import math
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+TEMPLATES_DIR = Path(__file__).resolve().parent.parent / "skills" / "manim-video-creator" / "templates"
+sys.path.insert(0, str(TEMPLATES_DIR))
+
+import generate_bgm  # noqa: E402
+
+
+# ------------------------------------------------------------
+# Reference implementation (original SKILL.md recipe, minus file I/O)
+# ------------------------------------------------------------
+
+def reference_chord(frequencies, duration_ms, sample_rate=44100, amplitude=0.15):
+    n_samples = int(sample_rate * duration_ms / 1000)
+    samples = []
+    for i in range(n_samples):
+        t = i / sample_rate
+        value = 0
+        for freq in frequencies:
+            phase_mod = 0.002 * math.sin(2 * math.pi * 0.1 * t)
+            value += amplitude * math.sin(2 * math.pi * freq * t * (1 + phase_mod))
+        samples.append(value / len(frequencies))
+    return samples
+
+
+def reference_envelope(samples, attack_ms, decay_ms, sustain_level, release_ms, sample_rate=44100):
+    n_samples = len(samples)
+    attack_samples = int(sample_rate * attack_ms / 1000)
+    decay_samples = int(sample_rate * decay_ms / 1000)
+    release_samples = int(sample_rate * release_ms / 1000)
+    result = []
+    for i, sample in enumerate(samples):
+        if i < attack_samples:
+            envelope = i / attack_samples
+        elif i < attack_samples + decay_samples:
+            decay_progress = (i - attack_samples) / decay_samples
+            envelope = 1.0 - (1.0 - sustain_level) * decay_progress
+        elif i > n_samples - release_samples:
+            release_progress = (i - (n_samples - release_samples)) / release_samples
+            envelope = sustain_level * (1.0 - release_progress)
+        else:
+            envelope = sustain_level
+        result.append(sample * envelope)
+    return result
+
+
+def reference_bgm(duration_seconds, sample_rate=44100):
+    duration_ms = duration_seconds * 1000
+    chord_progressions = [
+        [130.81, 164.81, 196.00],
+        [146.83, 174.61, 220.00],
+        [164.81, 196.00, 246.94],
+        [130.81, 164.81, 196.00],
+    ]
+    chord_duration_ms = 8000
+    all_samples = []
+    for i in range(int(duration_ms / chord_duration_ms) + 1):
+        chord = chord_progressions[i % len(chord_progressions)]
+        samples = reference_chord(chord, chord_duration_ms, sample_rate, amplitude=0.12)
+        samples = reference_envelope(samples, 2000, 1000, 0.7, 2000, sample_rate)
+        all_samples.extend(samples)
+    all_samples = all_samples[:int(sample_rate * duration_seconds)]
+
+    drone_freq = 65.41
+    for i in range(len(all_samples)):
+        t = i / sample_rate
+        drone = 0.08 * math.sin(2 * math.pi * drone_freq * t)
+        drone += 0.04 * math.sin(2 * math.pi * drone_freq * 1.5 * t)
+        all_samples[i] += drone
+
+    fade_in_samples = int(sample_rate * 3)
+    fade_out_samples = int(sample_rate * 5)
+    for i in range(fade_in_samples):
+        all_samples[i] *= i / fade_in_samples
+    for i in range(fade_out_samples):
+        idx = len(all_samples) - fade_out_samples + i
+        all_samples[idx] *= (fade_out_samples - i) / fade_out_samples
+
+    # samples_to_wav() quantization
+    return np.array([int(max(-1.0, min(1.0, s)) * 32767) for s in all_samples], dtype=np.int16)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ambient BGM generation")
+    parser.add_argument("--seconds", type=float, default=130,
+                        help="Track length in seconds (default: 130)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    expected = reference_bgm(args.seconds)
+    reference_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    actual = np.frombuffer(
+        b"".join(generate_bgm.to_pcm16(chunk) for chunk in generate_bgm.iter_chunks(args.seconds)),
+        dtype="<i2",
+    )
+    numpy_time = time.perf_counter() - start
+
+    assert len(expected) == len(actual), f"length mismatch: {len(expected)} != {len(actual)}"
+    diff = int(np.abs(expected.astype(np.int32) - actual).max())
+    assert diff <= 1, f"sample mismatch: max difference {diff} LSB"
+
+    print(f"Track length: {args.seconds:.0f}s ({len(actual)} samples)")
+    print(f"  reference (per-sample loops): {reference_time:8.2f}s")
+    print(f"  generate_bgm (vectorized):    {numpy_time:8.2f}s  ({reference_time / numpy_time:.0f}x)")
+    print(f"  max sample difference:        {diff} LSB")
+
+
+if __name__ == "__main__":
+    main()
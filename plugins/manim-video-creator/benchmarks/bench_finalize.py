@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Finalize Benchmark
+
+Compares the previous finish (combine_final.py recipe: pydub mix ->
+combined_audio.mp3 -> ffmpeg mux -> concat_ending.py stream-copy concat)
+with the one-pass templates/finalize.py on synthetic inputs.
+
+Disk I/O is counted as the bytes of every file each step reads and writes,
+so intermediate files show up on both sides of the ledger.
+
+Usage:
+    uv run python benchmarks/bench_finalize.py
+    uv run python benchmarks/bench_finalize.py --seconds 600 --size 1920x1080 --fps 60
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from pydub import AudioSegment
+
+TEMPLATES_DIR = Path(__file__).resolve().parent.parent / "skills" / "manim-video-creator" / "templates"
+sys.path.insert(0, str(TEMPLATES_DIR))
+
+import finalize  # noqa: E402
+import generate_bgm  # noqa: E402
+
+
+class IOLedger:
+    """Accumulates wall time and file bytes read/written per step."""
+
+    def __init__(self):
+        self.read = 0
+        self.written = 0
+        self.seconds = 0.0
+
+    def step(self, func, inputs: list, outputs: list):
+        start = time.perf_counter()
+        func()
+        self.seconds += time.perf_counter() - start
+        self.read += sum(os.path.getsize(p) for p in inputs)
+        self.written += sum(os.path.getsize(p) for p in outputs)
+
+
+def ffmpeg(*args):
+    subprocess.run(["ffmpeg", "-hide_banner", "-loglevel", "error", "-y", *args], check=True)
+
+
+def make_inputs(workdir: Path, seconds: float, size: str, fps: int):
+    """Synthetic render, narration, BGM and a matching ending clip."""
+    video = workdir / "main.mp4"
+    ffmpeg("-f", "lavfi", "-i", f"testsrc2=size={size}:rate={fps}", "-t", str(seconds),
+           "-c:v", "libx264", "-preset", "ultrafast", "-pix_fmt", "yuv420p", str(video))
+
+    ending = workdir / "endings" / "16_9" / "ending.mp4"
+    ending.parent.mkdir(parents=True)
+    ffmpeg("-f", "lavfi", "-i", f"testsrc=size={size}:rate={fps}", "-f", "lavfi", "-i", "sine=f=440",
+           "-t", "5", "-c:v", "libx264", "-preset", "ultrafast", "-pix_fmt", "yuv420p",
+           "-c:a", "aac", "-ar", "48000", "-ac", "2", str(ending))
+
+    narration = workdir / "narration.wav"
+    ffmpeg("-f", "lavfi", "-i", "sine=f=220:sample_rate=24000", "-t", str(seconds), str(narration))
+    bgm = workdir / "bgm.wav"
+    generate_bgm.generate_ambient_bgm(min(seconds, 130), str(bgm))
+
+    # The previous workflow consumed MP3s
+    ffmpeg("-i", str(narration), "-b:a", "192k", str(workdir / "narration.mp3"))
+    ffmpeg("-i", str(bgm), "-b:a", "128k", str(workdir / "bgm.mp3"))
+    return video, ending
+
+
+def legacy_finish(workdir: Path, video: Path, ending: Path) -> IOLedger:
+    ledger = IOLedger()
+    narration_mp3, bgm_mp3 = workdir / "narration.mp3", workdir / "bgm.mp3"
+    combined = workdir / "combined_audio.mp3"
+    main_with_audio = workdir / "main_with_audio.mp4"
+    output = workdir / "legacy_output.mp4"
+
+    def mix():
+        narration = AudioSegment.from_mp3(narration_mp3)
+        bgm = AudioSegment.from_mp3(bgm_mp3)
+        while len(bgm) < len(narration):
+            bgm = bgm + bgm
+        bgm = (bgm[:len(narration)] - 18).fade_in(3000).fade_out(4000)
+        narration.overlay(bgm).export(combined, format="mp3", bitrate="192k")
+
+    ledger.step(mix, [narration_mp3, bgm_mp3], [combined])
+    ledger.step(lambda: ffmpeg("-i", str(video), "-i", str(combined),
+                               "-c:v", "copy", "-c:a", "aac", "-b:a", "192k",
+                               "-map", "0:v:0", "-map", "1:a:0", "-shortest", str(main_with_audio)),
+                [video, combined], [main_with_audio])
+
+    concat_list = workdir / "concat_list.txt"
+    concat_list.write_text(f"file '{main_with_audio}'\nfile '{ending}'\n")
+    ledger.step(lambda: ffmpeg("-f", "concat", "-safe", "0", "-i", str(concat_list),
+                               "-c", "copy", str(output)),
+                [main_with_audio, ending], [output])
+    return ledger
+
+
+def one_pass_finish(workdir: Path, video: Path, ending: Path) -> IOLedger:
+    ledger = IOLedger()
+    narration, bgm = workdir / "narration.wav", workdir / "bgm.wav"
+    output = workdir / "finalized_output.mp4"
+    ledger.step(lambda: finalize.finalize(str(video), str(narration), str(bgm),
+                                          add_ending=True, output_path=str(output)),
+                [video, narration, bgm, ending], [output])
+    return ledger
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the finalize step")
+    parser.add_argument("--seconds", type=float, default=120, help="Main video length (default: 120)")
+    parser.add_argument("--size", default="1920x1080", help="Resolution (default: 1920x1080)")
+    parser.add_argument("--fps", type=int, default=60, help="Frame rate (default: 60)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        print(f"Preparing {args.seconds:.0f}s {args.size}@{args.fps} inputs...")
+        video, ending = make_inputs(workdir, args.seconds, args.size, args.fps)
+
+        cwd = os.getcwd()
+        os.chdir(workdir)  # finalize.find_ending_video() looks in ./endings
+        try:
+            legacy = legacy_finish(workdir, video, ending)
+            one_pass = one_pass_finish(workdir, video, ending)
+        finally:
+            os.chdir(cwd)
+
+    mb = 1024 ** 2
+    print(f"\n{'':>12} {'wall':>9} {'read':>10} {'written':>10}")
+    for name, ledger in (("legacy", legacy), ("finalize", one_pass)):
+        print(f"{name:>12} {ledger.seconds:>8.2f}s {ledger.read / mb:>8.1f}MB {ledger.written / mb:>8.1f}MB")
+    print(f"{'saved':>12} {legacy.seconds - one_pass.seconds:>8.2f}s "
+          f"{(legacy.read - one_pass.read) / mb:>8.1f}MB {(legacy.written - one_pass.written) / mb:>8.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Layout Check Benchmark
+
+Builds a synthetic scene with one text pushed past the right edge and two
+overlapping texts, then compares a low-quality `manim` render with
+templates/check_layout.py (all three aspect ratios). Checks that both
+planted problems are found at 16:9 and that a clean section reports none.
+
+Usage:
+    uv run python benchmarks/bench_layout.py
+    uv run python benchmarks/bench_layout.py --sections 40
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+TEMPLATES_DIR = Path(__file__).resolve().parent.parent / "skills" / "manim-video-creator" / "templates"
+sys.path.insert(0, str(TEMPLATES_DIR))
+
+import check_layout  # noqa: E402
+
+SECTION_SOURCE = '''
+    @section
+    def section_{index:03d}(self):
+        label = Text("Section {index}", font_size=40).to_edge(UP)
+        dots = VGroup(*[Dot(radius=0.08).shift(RIGHT * x) for x in range(-4, 5)])
+        self.play(Write(label), run_time=1)
+        self.play(LaggedStartMap(FadeIn, dots), run_time=1.5)
+        self.play(dots.animate.arrange_in_grid(3, 3).rotate(PI / 4), run_time=1.5)
+        self.wait(1)
+        self.play(FadeOut(label), FadeOut(dots), run_time=0.5)
+'''
+
+PROBLEM_SOURCE = '''
+    @section
+    def problems(self):
+        self.wide = Text("This caption is far too long for the frame", font_size=40).shift(RIGHT * 4)
+        self.first = Text("First", font_size=48)
+        self.second = Text("Second", font_size=48).shift(RIGHT * 0.4)
+        self.play(FadeIn(self.wide), FadeIn(self.first), FadeIn(self.second))
+        self.play(FadeOut(self.wide), FadeOut(self.first), FadeOut(self.second))
+'''
+
+
+def write_scene(workdir: Path, sections: int) -> Path:
+    shutil.copy(TEMPLATES_DIR / "section_scene.py", workdir / "section_scene.py")
+    source = "from manim import *\n\nfrom section_scene import SectionScene, section\n\n\n"
+    source += "class BenchScene(SectionScene):\n"
+    source += "".join(SECTION_SOURCE.format(index=i) for i in range(sections // 2))
+    source += PROBLEM_SOURCE
+    source += "".join(SECTION_SOURCE.format(index=i) for i in range(sections // 2, sections))
+    scene_file = workdir / "scene.py"
+    scene_file.write_text(source)
+    return scene_file
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the frame-sampling layout checker")
+    parser.add_argument("--sections", type=int, default=12, help="Number of clean sections (default: 12)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        cwd = os.getcwd()
+        os.chdir(workdir)
+        try:
+            scene_file = write_scene(workdir, args.sections)
+
+            start = time.perf_counter()
+            subprocess.run([sys.executable, "-m", "manim", "-ql", "--disable_caching",
+                            "--progress_bar", "none", "--media_dir", "render",
+                            str(scene_file), "BenchScene"], check=True)
+            render_seconds = time.perf_counter() - start
+
+            start = time.perf_counter()
+            report = check_layout.check_layout(str(scene_file), "BenchScene")
+            check_seconds = time.perf_counter() - start
+        finally:
+            os.chdir(cwd)
+
+    landscape = next(result for result in report["aspects"] if result["aspect"] == "16_9")
+    found = {(issue["kind"], tuple(issue["objects"])) for issue in landscape["issues"]}
+    print(f"\n{args.sections + 1} sections, {landscape['plays']} plays sampled per aspect ratio")
+    print(f"  manim -ql render:         {render_seconds:7.1f}s")
+    print(f"  check_layout (3 aspects): {check_seconds:7.1f}s  ({render_seconds / check_seconds:.1f}x faster)")
+    for result in report["aspects"]:
+        kinds = [issue["kind"] for issue in result["issues"]]
+        summary = ", ".join(f"{kinds.count(kind)} {kind}" for kind in sorted(set(kinds)))
+        print(f"  {result['aspect']:>5}: {summary or 'no problems'}")
+
+    assert any(kind == "OFFSCREEN" and objects[0].startswith("self.wide") for kind, objects in found), \
+        "off-screen caption not detected"
+    assert any(kind == "OVERLAP" and {o.split()[0] for o in objects} == {"self.first", "self.second"}
+               for kind, objects in found), "overlapping texts not detected"
+    assert all(issue["objects"][0].startswith("self.") or issue["kind"] == "MARGIN"
+               for issue in landscape["issues"]), "false positive in a clean section"
+
+
+if __name__ == "__main__":
+    main()
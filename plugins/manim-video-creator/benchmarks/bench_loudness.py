@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Loudness Assembly Benchmark
+
+Builds a narration from synthetic speech-like segments at uneven levels
+(as different TTS voices and engines produce them) and checks
+templates/loudness.py:
+
+- meter:     the NumPy BS.1770 meter against ffmpeg's ebur128 filter
+- cold/warm: NarrationLeveler mixing at the target loudness with an empty
+             and with a filled loudness cache
+- loudnorm:  what an ffmpeg two-pass loudnorm of the raw mix costs instead
+- envelope:  the BGM ducking envelope for the whole timeline
+
+Usage:
+    uv run python benchmarks/bench_loudness.py
+    uv run python benchmarks/bench_loudness.py --minutes 30 --segments 300 --target -16
+"""
+
+import argparse
+import json
+import re
+import subprocess
+import sys
+import tempfile
+import time
+import wave
+from pathlib import Path
+
+import numpy as np
+from pydub import AudioSegment
+
+TEMPLATES_DIR = Path(__file__).resolve().parent.parent / "skills" / "manim-video-creator" / "templates"
+sys.path.insert(0, str(TEMPLATES_DIR))
+
+from audio_mixer import NarrationMixer  # noqa: E402
+from loudness import NarrationLeveler, bgm_envelope, measure_samples  # noqa: E402
+
+SAMPLE_RATE = 24000
+
+
+def write_wav(path: Path, samples: np.ndarray, sample_rate: int = SAMPLE_RATE):
+    pcm = np.clip(np.rint(samples * 32767), -32768, 32767).astype("<i2")
+    with wave.open(str(path), "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(pcm.tobytes())
+
+
+def make_segments(workdir: Path, count: int, minutes: float, seed: int) -> list:
+    """(start seconds, path) of syllable-modulated noise segments at random levels."""
+    rng = np.random.default_rng(seed)
+    slot = minutes * 60 / count
+    placements = []
+    for i in range(count):
+        seconds = rng.uniform(0.4, 0.85) * slot
+        t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+        syllables = np.clip(np.sin(2 * np.pi * rng.uniform(3, 6) * t), 0, None) ** 2
+        voice = np.sin(2 * np.pi * rng.uniform(110, 240) * t) + 0.5 * rng.standard_normal(len(t))
+        samples = voice * syllables * 10 ** (rng.uniform(-20, -4) / 20)
+        path = workdir / f"segment_{i:04d}.wav"
+        write_wav(path, samples)
+        placements.append((round(i * slot + rng.uniform(0, 0.1) * slot, 3), path))
+    return placements
+
+
+def ffmpeg_loudness(path: Path) -> float:
+    out = subprocess.run(["ffmpeg", "-nostats", "-i", str(path), "-af", "ebur128", "-f", "null", "-"],
+                         capture_output=True, text=True, check=True).stderr
+    return float(re.findall(r"I:\s+(-?[\d.]+) LUFS", out)[-1])
+
+
+def assemble(placements: list, duration_ms: int, target: float, workdir: Path) -> dict:
+    start = time.perf_counter()
+    mixer = NarrationMixer(duration_ms, sample_rate=SAMPLE_RATE)
+    leveler = NarrationLeveler(target, 12.0, str(workdir / "loudness_cache.json"))
+    for position, path in placements:
+        leveler.add(mixer, AudioSegment.from_file(path), str(path), position)
+    mixer.export(str(workdir / "narration.wav"))
+    timeline = leveler.finish(mixer, str(workdir / "narration_timeline.json"))
+    return {"seconds": time.perf_counter() - start, "timeline": timeline,
+            "hits": leveler.cache.hits, "misses": leveler.cache.misses}
+
+
+def loudnorm_two_pass(source: Path, target: float, output: Path) -> float:
+    """Measure + normalize with ffmpeg loudnorm, the usual way to level a mix."""
+    start = time.perf_counter()
+    out = subprocess.run(["ffmpeg", "-nostats", "-i", str(source), "-af",
+                          f"loudnorm=I={target}:TP=-1:LRA=11:print_format=json", "-f", "null", "-"],
+                         capture_output=True, text=True, check=True).stderr
+    summary = out[out.rindex("{"):]
+    stats = json.loads(summary[:summary.index("}") + 1])
+    subprocess.run(["ffmpeg", "-v", "error", "-y", "-i", str(source), "-af",
+                    f"loudnorm=I={target}:TP=-1:LRA=11:measured_I={stats['input_i']}:"
+                    f"measured_TP={stats['input_tp']}:measured_LRA={stats['input_lra']}:"
+                    f"measured_thresh={stats['input_thresh']}:offset={stats['target_offset']}:linear=true",
+                    "-ar", str(SAMPLE_RATE), str(output)], check=True)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark loudness-normalized narration assembly")
+    parser.add_argument("--minutes", type=float, default=10, help="Narration length (default: 10)")
+    parser.add_argument("--segments", type=int, default=100, help="Narration segments (default: 100)")
+    parser.add_argument("--target", type=float, default=-16.0, help="Target LUFS (default: -16)")
+    parser.add_argument("--check", type=int, default=5,
+                        help="Segments compared with ffmpeg ebur128 (default: 5)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        placements = make_segments(workdir, args.segments, args.minutes, args.seed)
+        duration_ms = int(args.minutes * 60 * 1000)
+
+        # Raw mix (no normalization) for loudnorm and the spread of input levels
+        raw_dir = workdir / "raw"
+        raw_dir.mkdir()
+        raw = assemble(placements, duration_ms, None, raw_dir)
+        cold = assemble(placements, duration_ms, args.target, workdir)
+        warm = assemble(placements, duration_ms, args.target, workdir)
+        loudnorm_seconds = loudnorm_two_pass(raw_dir / "narration.wav", args.target,
+                                             workdir / "loudnorm.wav")
+
+        bgm = workdir / "bgm.wav"
+        write_wav(bgm, 0.05 * np.random.default_rng(args.seed).standard_normal(SAMPLE_RATE * 30))
+        timeline_path, cache_path = workdir / "narration_timeline.json", workdir / "loudness_cache.json"
+        for _ in range(2):  # the first run measures the BGM, the second one uses the cache
+            start = time.perf_counter()
+            envelope = bgm_envelope(args.minutes * 60, str(bgm), -18, 3.0, 4.0, str(timeline_path),
+                                    6.0, cache_path=str(cache_path))
+        envelope_seconds = time.perf_counter() - start
+
+        errors = []
+        for _, path in placements[:args.check]:
+            with wave.open(str(path)) as wav_file:
+                pcm = np.frombuffer(wav_file.readframes(wav_file.getnframes()), dtype="<i2")
+            errors.append(measure_samples(pcm / 32768.0, SAMPLE_RATE)["lufs"] - ffmpeg_loudness(path))
+        mix_lufs = ffmpeg_loudness(workdir / "narration.wav")
+        errors.append(cold["timeline"]["lufs"] - mix_lufs)
+
+        before = [s["lufs"] for s in raw["timeline"]["segments"]]
+        after = [s["lufs"] + s["gain_db"] for s in cold["timeline"]["segments"]]
+
+    print(f"\n{args.segments} segments over {args.minutes:g} min, target {args.target:g} LUFS")
+    print(f"  meter vs ffmpeg ebur128:  max error {max(abs(e) for e in errors):.2f} LU "
+          f"({len(errors)} files)")
+    print(f"  segment levels:           {min(before):.1f} .. {max(before):.1f} LUFS -> "
+          f"{min(after):.1f} .. {max(after):.1f} LUFS")
+    print(f"  mix:                      {mix_lufs:.1f} LUFS (ffmpeg), peak {cold['timeline']['peak']:.2f}")
+    print(f"  assembly, cold cache:     {cold['seconds']:7.2f}s  ({cold['misses']} measured)")
+    print(f"  assembly, warm cache:     {warm['seconds']:7.2f}s  ({warm['hits']} cached)")
+    print(f"  ffmpeg loudnorm 2-pass:   {loudnorm_seconds:7.2f}s  (on top of mixing)")
+    print(f"  ducking envelope:         {envelope_seconds * 1000:7.1f}ms ({len(envelope)} points)")
+
+    assert max(abs(e) for e in errors) < 0.2, "meter disagrees with ffmpeg ebur128"
+    assert abs(mix_lufs - args.target) < 1.0, f"mix is {mix_lufs} LUFS, target {args.target}"
+    assert max(after) - min(after) < 0.5, "segments are not level after normalization"
+    assert warm["misses"] == 0, "segments were measured again with a warm cache"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Narration Mixer Benchmark
+
+Compares the original AudioSegment.overlay() loop from generate_audio.py
+with the NumPy mixer in templates/audio_mixer.py. Segments are synthetic
+tones (no TTS or ffmpeg needed), one narration every SEGMENT_INTERVAL
+seconds.
+
+Usage:
+    uv run python benchmarks/bench_mixer.py
+    uv run python benchmarks/bench_mixer.py --minutes 2 10 30 --interval 5
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from pydub import AudioSegment
+from pydub.generators import Sine
+
+TEMPLATES_DIR = Path(__file__).resolve().parent.parent / "skills" / "manim-video-creator" / "templates"
+sys.path.insert(0, str(TEMPLATES_DIR))
+
+from audio_mixer import mix_segments  # noqa: E402
+
+SAMPLE_RATE = 24000
+
+
+def make_placements(minutes: float, interval: float, segment_seconds: float) -> list:
+    """One tone segment every `interval` seconds over `minutes` minutes."""
+    tone = Sine(440, sample_rate=SAMPLE_RATE).to_audio_segment(duration=segment_seconds * 1000)
+    tone = tone.set_channels(1).set_sample_width(2) - 12
+    count = int(minutes * 60 / interval)
+    return [(i * interval, tone) for i in range(count)]
+
+
+def overlay_loop(placements: list, duration_ms: int) -> AudioSegment:
+    """The original generate_audio.py mixing loop."""
+    final_audio = AudioSegment.silent(duration=duration_ms, frame_rate=SAMPLE_RATE)
+    for start_time, segment in placements:
+        final_audio = final_audio.overlay(segment, position=int(start_time * 1000))
+    return final_audio
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark narration mixing")
+    parser.add_argument("--minutes", type=float, nargs="+", default=[2, 10, 30],
+                        help="Video durations to benchmark (default: 2 10 30)")
+    parser.add_argument("--interval", type=float, default=5.0,
+                        help="Seconds between narration starts (default: 5)")
+    parser.add_argument("--segment", type=float, default=4.0,
+                        help="Length of each narration segment in seconds (default: 4)")
+    args = parser.parse_args()
+
+    print(f"{'duration':>10} {'segments':>9} {'overlay':>10} {'numpy':>10} {'speedup':>8}")
+    print("-" * 51)
+    for minutes in args.minutes:
+        placements = make_placements(minutes, args.interval, args.segment)
+        duration_ms = int(minutes * 60 * 1000)
+
+        overlay_time, expected = timed(overlay_loop, placements, duration_ms)
+        numpy_time, actual = timed(mix_segments, placements, duration_ms, SAMPLE_RATE, 1, "clip")
+
+        # Both mixers must produce the same track (tones never overlap)
+        assert len(expected.raw_data) == len(actual.raw_data), "length mismatch"
+        diff = np.abs(np.frombuffer(expected.raw_data, dtype=np.int16).astype(np.int32)
+                      - np.frombuffer(actual.raw_data, dtype=np.int16)).max()
+        assert diff <= 1, f"sample mismatch: {diff}"
+
+        print(f"{minutes:>8.0f} m {len(placements):>9d} {overlay_time:>9.2f}s "
+              f"{numpy_time:>9.2f}s {overlay_time / numpy_time:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
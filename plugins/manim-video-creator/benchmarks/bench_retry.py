@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Upload Retry Benchmark
+
+Runs the batch uploader against the local upload stand-in
+(upload_server.py) with faults injected into chunk PUTs and checks the
+retry policy (skills/youtube-uploader/scripts/retry_policy.py):
+
+- faulty:    a share of chunks is answered with 503 or cut off mid-body;
+             every upload must still finish with byte-identical content,
+             and the retry metrics (retries by reason, bytes re-sent,
+             effective throughput) are compared with a fault-free run
+- fatal:     every chunk is answered with 403; the upload must fail
+             without a single retry
+- give up:   every chunk is answered with 503; the upload must stop after
+             --max-attempts attempts, and a second run with a short
+             deadline must stop within that deadline
+
+Backoff delays are scaled down (--base-delay) so the benchmark finishes
+in seconds; the schedule (full jitter, doubling, capped) is the same.
+
+Usage:
+    uv run python benchmarks/bench_retry.py
+    uv run python benchmarks/bench_retry.py --error-rate 0.2 --reset-rate 0.1 --seed 7
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import requests
+
+BENCH_DIR = Path(__file__).resolve().parent
+UPLOADER_DIR = BENCH_DIR.parent / "skills" / "youtube-uploader" / "scripts"
+sys.path.insert(0, str(UPLOADER_DIR))
+sys.path.insert(0, str(BENCH_DIR))
+
+import youtube_uploader  # noqa: E402
+from bench_upload import completed_sessions, file_digest, make_files  # noqa: E402
+from retry_policy import RetryError, RetryMetrics, RetryPolicy  # noqa: E402
+from upload_server import UploadServer  # noqa: E402
+
+
+def run(server: UploadServer, entries: list, state_file: str, chunk_size: int,
+        workers: int, policy: RetryPolicy) -> dict:
+    uploader = youtube_uploader.BatchUploader(
+        requests.Session, state_file, chunk_size, workers, server.upload_url,
+        server.playlist_url, policy)
+    return uploader.upload_all(entries)
+
+
+def make_policy(args, seed: int, **overrides) -> RetryPolicy:
+    options = {"max_attempts": args.max_attempts, "base_delay": args.base_delay,
+               "max_delay": args.base_delay * 16, "deadline": 60.0}
+    options.update(overrides)
+    return RetryPolicy(metrics=RetryMetrics(), rng=random.Random(seed), **options)
+
+
+def print_metrics(label: str, metrics: dict):
+    reasons = ", ".join(f"{k}={v}" for k, v in sorted(metrics["retries_by_reason"].items())) or "-"
+    print(f"  {label:<8} {metrics['elapsed_seconds']:6.2f}s  "
+          f"{metrics['effective_mb_per_second']:7.1f} MB/s  "
+          f"attempts {metrics['attempts']:4d}  retries {metrics['retries']:3d} ({reasons})  "
+          f"re-sent {metrics['bytes_resent'] / (1024**2):5.1f} MB  gave up {metrics['gave_up']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark upload retries against injected faults")
+    parser.add_argument("--files", type=int, default=3, help="Number of videos (default: 3)")
+    parser.add_argument("--size-mb", type=float, default=8, help="Size of each video (default: 8)")
+    parser.add_argument("--chunk-mb", type=float, default=1, help="Chunk size (default: 1)")
+    parser.add_argument("--workers", type=int, default=3, help="Concurrent uploads (default: 3)")
+    parser.add_argument("--error-rate", type=float, default=0.15,
+                        help="Share of chunks answered with 503 (default: 0.15)")
+    parser.add_argument("--reset-rate", type=float, default=0.05,
+                        help="Share of chunks cut off mid-body (default: 0.05)")
+    parser.add_argument("--max-attempts", type=int, default=8, help="Attempts per request (default: 8)")
+    parser.add_argument("--base-delay", type=float, default=0.01,
+                        help="Backoff base delay in seconds (default: 0.01)")
+    parser.add_argument("--seed", type=int, default=1, help="Fault and jitter seed (default: 1)")
+    args = parser.parse_args()
+
+    chunk_size = int(args.chunk_mb * 1024 * 1024)
+    size = int(args.size_mb * 1024 * 1024)
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        entries = make_files(workdir, args.files, size)
+        digests = {entry["title"]: file_digest(entry["file"]) for entry in entries}
+
+        # Fault-free baseline
+        server = UploadServer().start()
+        clean = make_policy(args, args.seed)
+        run(server, entries, str(workdir / "clean.json"), chunk_size, args.workers, clean)
+        assert {t: s.digest.hexdigest() for t, s in completed_sessions(server).items()} == digests
+        server.shutdown()
+
+        # Injected 503s and connection resets
+        server = UploadServer(error_rate=args.error_rate, reset_rate=args.reset_rate,
+                              seed=args.seed).start()
+        faulty = make_policy(args, args.seed)
+        results = run(server, entries, str(workdir / "faulty.json"), chunk_size, args.workers, faulty)
+        failed = [path for path, result in results.items() if isinstance(result, Exception)]
+        identical = {t: s.digest.hexdigest() for t, s in completed_sessions(server).items()} == digests
+        faults = dict(server.faults)
+        server.shutdown()
+
+        # 403 (e.g. quota exceeded) must not be retried
+        server = UploadServer(fail_status=403).start()
+        fatal = make_policy(args, args.seed)
+        results = run(server, entries[:1], str(workdir / "fatal.json"), chunk_size, 1, fatal)
+        fatal_error = results[entries[0]["file"]]
+        server.shutdown()
+
+        # Persistent 503: stop after max attempts, then after the deadline
+        server = UploadServer(fail_status=503).start()
+        exhausted = make_policy(args, args.seed)
+        results = run(server, entries[:1], str(workdir / "exhausted.json"), chunk_size, 1, exhausted)
+        exhausted_error = results[entries[0]["file"]]
+        deadline = 0.5
+        timed = make_policy(args, args.seed, max_attempts=1000, base_delay=0.05, max_delay=0.2,
+                            deadline=deadline)
+        start = time.perf_counter()
+        results = run(server, entries[:1], str(workdir / "deadline.json"), chunk_size, 1, timed)
+        deadline_seconds = time.perf_counter() - start
+        deadline_error = results[entries[0]["file"]]
+        server.shutdown()
+
+    print(f"\n{args.files} files x {args.size_mb:g} MB, {args.chunk_mb:g} MB chunks, "
+          f"{args.workers} workers, injected {faults['errors']} x 503 and {faults['resets']} resets")
+    print_metrics("clean", clean.metrics.summary())
+    print_metrics("faulty", faulty.metrics.summary())
+    print(f"  content identical: {'yes' if identical else 'NO'}")
+    print(f"  403:        {type(fatal_error).__name__}, retries {fatal.metrics.retries}")
+    print(f"  503 always: {type(exhausted_error).__name__} after "
+          f"{exhausted.metrics.attempts} requests")
+    print(f"  deadline:   {type(deadline_error).__name__} after {deadline_seconds:.2f}s "
+          f"(deadline {deadline:g}s)")
+
+    assert not failed, f"uploads failed despite retries: {failed}"
+    assert identical, "uploaded content differs from the files"
+    assert faulty.metrics.retries >= faults["errors"] + faults["resets"] > 0, \
+        "injected faults were not retried"
+    assert isinstance(fatal_error, youtube_uploader.UploadError) and fatal_error.status == 403
+    assert fatal.metrics.retries == 0, "a 403 was retried"
+    assert isinstance(exhausted_error, RetryError)
+    # start_session + max_attempts chunk requests (+ offset queries before each retry)
+    assert exhausted.metrics.retries == args.max_attempts - 1
+    assert isinstance(deadline_error, RetryError)
+    assert deadline_seconds < deadline + 1.0, "retries ran past the deadline"
+
+
+if __name__ == "__main__":
+    main()
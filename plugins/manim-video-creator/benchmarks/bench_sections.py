@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Section Render Benchmark
+
+Renders a synthetic SectionScene serially (`manim` CLI) and with
+templates/render_sections.py, reports both wall times and checks that the
+stitched video is frame-identical to the serial render (ffmpeg framemd5).
+
+It then changes one wait() in the middle section and renders again: the
+incremental run should re-render only that section from the section cache
+and still match a fresh serial render.
+
+Usage:
+    uv run python benchmarks/bench_sections.py
+    uv run python benchmarks/bench_sections.py --sections 24 --quality high_quality --workers 8
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+TEMPLATES_DIR = Path(__file__).resolve().parent.parent / "skills" / "manim-video-creator" / "templates"
+sys.path.insert(0, str(TEMPLATES_DIR))
+
+import render_sections  # noqa: E402
+
+QUALITY_FLAGS = {
+    "low_quality": "-ql",
+    "medium_quality": "-qm",
+    "high_quality": "-qh",
+    "fourk_quality": "-qk",
+}
+
+SECTION_SOURCE = '''
+    @section
+    def section_{index:03d}(self):
+        label = Text("Section {index}", font_size=40).to_edge(UP)
+        dots = VGroup(*[Dot(radius=0.08).shift(RIGHT * x) for x in range(-4, 5)])
+        self.play(Write(label), run_time=1)
+        self.play(LaggedStartMap(FadeIn, dots), run_time=1.5)
+        self.play(dots.animate.arrange_in_grid(3, 3).rotate(PI / 4), run_time=1.5)
+        self.wait({wait})
+        self.play(FadeOut(label), FadeOut(dots), run_time=0.5)
+'''
+
+
+def write_scene(workdir: Path, sections: int, edited: int = None) -> Path:
+    shutil.copy(TEMPLATES_DIR / "section_scene.py", workdir / "section_scene.py")
+    source = "from manim import *\n\nfrom section_scene import SectionScene, section\n\n\n"
+    source += "class BenchScene(SectionScene):\n"
+    source += "".join(SECTION_SOURCE.format(index=i, wait=2 if i == edited else 1)
+                      for i in range(sections))
+    scene_file = workdir / "scene.py"
+    scene_file.write_text(source)
+    return scene_file
+
+
+def frame_hashes(path: str) -> list:
+    """(pts, md5) of every decoded video frame."""
+    result = subprocess.run(["ffmpeg", "-v", "error", "-i", path, "-map", "0:v:0", "-f", "framemd5", "-"],
+                            capture_output=True, text=True, check=True)
+    rows = [line.split(",") for line in result.stdout.splitlines() if not line.startswith("#")]
+    return [(row[2].strip(), row[5].strip()) for row in rows]
+
+
+def render_serial(scene_file: Path, quality: str, name: str):
+    """Render with the manim CLI; return (seconds, movie path)."""
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-m", "manim", QUALITY_FLAGS[quality],
+                    "--disable_caching", "--progress_bar", "none", "--media_dir", name,
+                    "-o", f"{name}.mp4", str(scene_file), "BenchScene"], check=True)
+    return time.perf_counter() - start, str(next(Path(name).rglob(f"{name}.mp4")))
+
+
+def render_parallel(scene_file: Path, quality: str, name: str, workers: int):
+    """Render with render_sections.py; return (seconds, movie path)."""
+    start = time.perf_counter()
+    render_sections.render_sections(str(scene_file), "BenchScene", quality, f"{name}.mp4", workers)
+    return time.perf_counter() - start, f"{name}.mp4"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark parallel section rendering")
+    parser.add_argument("--sections", type=int, default=12, help="Number of sections (default: 12)")
+    parser.add_argument("--quality", default="low_quality", choices=QUALITY_FLAGS, help="Manim quality")
+    parser.add_argument("--workers", type=int, default=None, help="Render processes (default: CPU count)")
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        cwd = os.getcwd()
+        os.chdir(workdir)  # section cache and media dirs live in the workdir
+        try:
+            for label, edited in (("full", None), ("1 section edited", args.sections // 2)):
+                scene_file = write_scene(workdir, args.sections, edited)
+                tag = "edited" if edited is not None else "full"
+                serial_seconds, serial_path = render_serial(scene_file, args.quality, f"serial_{tag}")
+                parallel_seconds, parallel_path = render_parallel(scene_file, args.quality,
+                                                                  f"parallel_{tag}", args.workers)
+                identical = frame_hashes(serial_path) == frame_hashes(parallel_path)
+                results.append((label, serial_seconds, parallel_seconds, identical))
+        finally:
+            os.chdir(cwd)
+
+    print(f"\n{args.sections} sections, {args.quality}")
+    print(f"{'':>18} {'serial':>9} {'sections':>9} {'speedup':>8}  frame-identical")
+    for label, serial_seconds, parallel_seconds, identical in results:
+        print(f"{label:>18} {serial_seconds:>8.1f}s {parallel_seconds:>8.1f}s "
+              f"{serial_seconds / parallel_seconds:>7.1f}x  {'yes' if identical else 'NO'}")
+    assert all(identical for *_, identical in results), "section render differs from the serial render"
+
+
+if __name__ == "__main__":
+    main()
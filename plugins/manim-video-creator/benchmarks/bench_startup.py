@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Uploader Startup Benchmark
+
+Measures what a youtube_uploader.py invocation costs before any video
+bytes move, using the local upload stand-in (upload_server.py) and a
+cached, still-valid token so no browser login or Google endpoint is
+involved (google-auth-oauthlib and google-api-python-client must be
+installed, as for the uploader itself):
+
+- fail fast:   an invocation with a missing video file, compared with the
+               import of the full Google client stack that every
+               invocation paid before validating its arguments
+- per process: N small uploads, one `--manifest` process each
+               (import, login and new connections every time)
+- service:     the same N uploads sent one by one to a single `--serve`
+               process (one login, pooled connections)
+
+Usage:
+    uv run python benchmarks/bench_startup.py
+    uv run python benchmarks/bench_startup.py --uploads 20 --size-kb 512
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+UPLOADER = BENCH_DIR.parent / "skills" / "youtube-uploader" / "scripts" / "youtube_uploader.py"
+sys.path.insert(0, str(BENCH_DIR))
+
+from upload_server import UploadServer  # noqa: E402
+
+# What the uploader imported at module level before it looked at its arguments
+GOOGLE_STACK = ("import google_auth_oauthlib.flow, google.auth.transport.requests, "
+                "google.oauth2.credentials, googleapiclient.discovery, googleapiclient.http, "
+                "googleapiclient.errors")
+
+
+def write_credentials(workdir: Path) -> Path:
+    """credentials.json plus a token.json that is valid until 2099 (no refresh, no login)"""
+    credentials = workdir / "credentials.json"
+    credentials.write_text(json.dumps({"installed": {"client_id": "bench", "client_secret": "bench"}}))
+    (workdir / "token.json").write_text(json.dumps({
+        "token": "bench-token", "refresh_token": "bench-refresh", "client_id": "bench",
+        "client_secret": "bench", "expiry": "2099-01-01T00:00:00Z",
+        "scopes": ["https://www.googleapis.com/auth/youtube.upload"],
+    }))
+    return credentials
+
+
+def timed(cmd: list, cwd: Path) -> float:
+    start = time.perf_counter()
+    subprocess.run(cmd, cwd=cwd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark uploader startup and service mode")
+    parser.add_argument("--uploads", type=int, default=10, help="Number of uploads (default: 10)")
+    parser.add_argument("--size-kb", type=int, default=256, help="Size of each video (default: 256)")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per fail-fast measurement (default: 5)")
+    args = parser.parse_args()
+
+    server = UploadServer().start()
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        credentials = write_credentials(workdir)
+        entries = []
+        for i in range(args.uploads):
+            path = workdir / f"video_{i}.mp4"
+            path.write_bytes(os.urandom(args.size_kb * 1024))
+            entries.append({"file": str(path), "title": f"Video {i}"})
+        base = [sys.executable, str(UPLOADER), "--credentials", str(credentials),
+                "--api-root", server.base_url]
+
+        imports = statistics.median(
+            timed([sys.executable, "-c", GOOGLE_STACK], workdir) for _ in range(args.repeat))
+        fail_fast = statistics.median(
+            timed(base + ["missing.mp4", "--title", "x"], workdir) for _ in range(args.repeat))
+
+        # One process per upload
+        server.connections = 0
+        start = time.perf_counter()
+        for i, entry in enumerate(entries):
+            manifest = workdir / f"job_{i}.json"
+            manifest.write_text(json.dumps([entry]))
+            result = subprocess.run(base + ["--manifest", str(manifest), "--state", f"process_{i}.json"],
+                                    cwd=workdir, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+            assert result.returncode == 0, result.stderr.decode()
+        per_process = time.perf_counter() - start
+        process_connections = server.connections
+
+        # One service process, jobs sent one at a time
+        server.connections = 0
+        start = time.perf_counter()
+        service = subprocess.Popen(base + ["--serve", "--state", "service.json"], cwd=workdir,
+                                   stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+        line = service.stdout.readline()
+        while not line.startswith("🟢"):
+            assert line, "service exited before it was ready"
+            line = service.stdout.readline()
+        startup = time.perf_counter() - start
+        latencies = []
+        for entry in entries:
+            sent = time.perf_counter()
+            service.stdin.write(json.dumps(entry) + "\n")
+            service.stdin.flush()
+            line = service.stdout.readline()
+            while not line.startswith("RESULT "):
+                assert line, "service exited early"
+                line = service.stdout.readline()
+            result = json.loads(line[len("RESULT "):])
+            assert "video_id" in result, result
+            latencies.append(time.perf_counter() - sent)
+        service.stdin.close()
+        assert service.wait() == 0
+        service_total = time.perf_counter() - start
+        service_connections = server.connections
+    server.shutdown()
+
+    print(f"\n{args.uploads} uploads x {args.size_kb} KB")
+    print(f"  Google client imports (paid first before): {imports * 1000:7.0f} ms")
+    print(f"  missing file, fail fast:                   {fail_fast * 1000:7.0f} ms "
+          f"({imports / fail_fast:.1f}x faster than the imports alone)")
+    print(f"  one process per upload: {per_process:6.2f}s  "
+          f"{per_process / args.uploads * 1000:6.0f} ms/upload  {process_connections} connections")
+    print(f"  service mode:           {service_total:6.2f}s  "
+          f"{statistics.mean(latencies) * 1000:6.0f} ms/upload  {service_connections} connections  "
+          f"(startup {startup * 1000:.0f} ms, {per_process / service_total:.1f}x faster)")
+    assert fail_fast < imports, "argument errors should be reported before the Google imports"
+    assert service_connections < process_connections, "service mode did not reuse connections"
+
+
+if __name__ == "__main__":
+    main()
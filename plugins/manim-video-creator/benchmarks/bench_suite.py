@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+"""
+Audio and Finalize Benchmark Suite
+
+Runs the audio and finish stages of the templates on synthetic narration
+scripts and compares them with a stored baseline, so that a change that
+makes generate_audio.py, generate_bgm.py, finalize.py or combine_final.py
+slower or hungrier fails the comparison run:
+
+- tts:            generate_audio.py synthesis, with a deterministic offline
+                  stand-in (ToneTTSBackend) instead of edge-tts
+- narration_mix:  generate_audio.py placing the segments and writing narration.wav
+- bgm:            generate_bgm.py for the whole video length
+- finalize:       finalize.py (mix, mux, ending) on a synthetic render
+- combine:        combine_final.py on the same inputs
+
+Scenarios are (lines, minutes) scripts: short = 10 lines / 1 min,
+medium = 100 / 10, long = 500 / 60, or any LINESxMINUTES such as 200x30.
+Scripts are generated from --seed and every segment is a sine tone of
+the length the text implies, so the same seed produces the same
+narration.wav bit for bit; its hash is part of the baseline.
+
+Each run happens in a fresh process, so stage times, CPU time (own and
+ffmpeg's) and peak RSS come from stage_profiler.py without earlier runs
+leaking into them. With --repeat N the median of N runs is kept.
+Baselines are machine-specific: save one per kind of machine (architecture,
+CPU count, Python version; the host name is not recorded) and compare
+against it on such a machine, e.g. the same CI runner type.
+
+Usage:
+    uv run python benchmarks/bench_suite.py --save-baseline baseline.json
+    uv run python benchmarks/bench_suite.py --compare baseline.json
+    uv run python benchmarks/bench_suite.py --scenario long --repeat 1
+    uv run python benchmarks/bench_suite.py --scenario 200x30 --compare baseline.json
+"""
+
+import argparse
+import asyncio
+import hashlib
+import io
+import json
+import math
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import wave
+import zlib
+from contextlib import redirect_stdout
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+TEMPLATES_DIR = Path(__file__).resolve().parent.parent / "skills" / "manim-video-creator" / "templates"
+sys.path.insert(0, str(TEMPLATES_DIR))
+
+import combine_final  # noqa: E402
+import ending_cache  # noqa: E402
+import finalize  # noqa: E402
+import generate_audio  # noqa: E402
+import generate_bgm  # noqa: E402
+from audio_encoder import probe_duration  # noqa: E402
+from stage_profiler import StageProfiler, load_records  # noqa: E402
+from tts_engine import TTSBackend  # noqa: E402
+
+SCENARIOS = {"short": (10, 1), "medium": (100, 10), "long": (500, 60)}
+DEFAULT_SCENARIOS = ["short", "medium"]
+
+# Share of each line's slot that is speech; the rest is the pause after it
+SPEECH_SHARE = 0.8
+KANA = "あいうえおかきくけこさしすせそたちつてとなにぬねのはひふへほまみむめもやゆよらりるれろわん"
+
+# A stage regresses when it exceeds the baseline by the tolerance AND by
+# these absolute amounts (tiny stages are dominated by noise)
+MIN_SECONDS = 0.05
+MIN_MB = 8.0
+
+
+class ToneTTSBackend(TTSBackend):
+    """Deterministic offline synthesizer for benchmarks.
+
+    Writes a mono 16-bit sine tone of `seconds_per_char` per character,
+    with a pitch derived from the text, so equal scripts give equal WAVs.
+    """
+
+    name = "tone"
+    version = "1"
+    extension = "wav"
+
+    def __init__(self, seconds_per_char: float, sample_rate: int = 24000):
+        self.seconds_per_char = seconds_per_char
+        self.sample_rate = sample_rate
+
+    def frames(self, text: str) -> int:
+        return int(self.sample_rate * self.seconds_per_char * max(len(text), 1))
+
+    async def synthesize(self, text: str, output_path: str):
+        n = self.frames(text)
+        frequency = 160 + zlib.crc32(text.encode("utf-8")) % 240
+        t = np.arange(n) / self.sample_rate
+        ramp = np.minimum(1.0, np.minimum(np.arange(n), n - 1 - np.arange(n)) / (0.01 * self.sample_rate))
+        samples = 0.3 * np.sin(2 * np.pi * frequency * t) * ramp
+        with wave.open(output_path, "w") as wav_file:
+            wav_file.setnchannels(1)
+            wav_file.setsampwidth(2)
+            wav_file.setframerate(self.sample_rate)
+            wav_file.writeframes((samples * 32767).astype("<i2").tobytes())
+
+
+def parse_scenario(name: str) -> tuple:
+    """'medium' or '200x30' -> (lines, minutes)"""
+    if name in SCENARIOS:
+        return SCENARIOS[name]
+    try:
+        lines, minutes = name.split("x")
+        return int(lines), float(minutes)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"unknown scenario {name!r} (use {', '.join(SCENARIOS)} or LINESxMINUTES)")
+
+
+def make_script(lines: int, minutes: float, seed: int) -> tuple:
+    """(NARRATIONS, seconds per character) filling `minutes` with `lines` lines."""
+    rng = random.Random(f"{seed}-{lines}-{minutes}")
+    texts = ["".join(rng.choice(KANA) for _ in range(rng.randint(15, 60))) + "。"
+             for _ in range(lines)]
+    total_seconds = minutes * 60
+    seconds_per_char = total_seconds * SPEECH_SHARE / sum(len(text) for text in texts)
+    narrations = []
+    start = 0.0
+    for text in texts:
+        narrations.append((round(start, 3), text))
+        start += len(text) * seconds_per_char / SPEECH_SHARE
+    return narrations, seconds_per_char
+
+
+def ffmpeg(*args):
+    subprocess.run(["ffmpeg", "-hide_banner", "-loglevel", "error", "-y", *args], check=True)
+
+
+def make_inputs(workdir: Path, seconds: float, size: str, fps: int):
+    """Synthetic render and ending clip; the ending cache is warmed as in a real project."""
+    video = workdir / "main.mp4"
+    ffmpeg("-f", "lavfi", "-i", f"testsrc2=size={size}:rate={fps}", "-t", f"{seconds:.3f}",
+           "-c:v", "libx264", "-preset", "ultrafast", "-pix_fmt", "yuv420p", str(video))
+    ending = workdir / "endings" / "16_9" / "ending.mp4"
+    ending.parent.mkdir(parents=True)
+    ffmpeg("-f", "lavfi", "-i", f"testsrc=size={size}:rate={fps}", "-f", "lavfi", "-i", "sine=f=440",
+           "-t", "5", "-c:v", "libx264", "-preset", "ultrafast", "-pix_fmt", "yuv420p",
+           "-c:a", "aac", "-ar", "48000", "-ac", "2", str(ending))
+    with redirect_stdout(io.StringIO()):
+        ending_cache.normalized_ending(str(ending), ending_cache.probe_video(str(video)),
+                                       str(workdir / finalize.ENDING_CACHE_DIR))
+
+
+def run_scenario(lines: int, minutes: float, seed: int) -> dict:
+    """Run every stage once in the current directory (see make_inputs) and measure it."""
+    narrations, seconds_per_char = make_script(lines, minutes, seed)
+    seconds = minutes * 60
+    profile = "bench_profile.jsonl"
+    run_id = f"bench-{os.getpid()}"
+    profiler = StageProfiler(profile, run_id)
+
+    generate_audio.NARRATIONS = narrations
+    generate_audio.VIDEO_DURATION_MS = int(seconds * 1000)
+    generate_audio.OUTPUT_PATH = "narration.wav"
+    generate_audio.CACHE_DIR = None
+    for module in (generate_audio, finalize, combine_final):
+        module.PROFILE_PATH = profile
+    os.environ["PIPELINE_RUN_ID"] = run_id
+
+    with redirect_stdout(io.StringIO()):
+        asyncio.run(generate_audio.main(ToneTTSBackend(seconds_per_char, generate_audio.SAMPLE_RATE)))
+        with profiler.stage("bgm", seconds=seconds):
+            generate_bgm.generate_ambient_bgm(seconds, "bgm.wav")
+        finalize.finalize("main.mp4", "narration.wav", "bgm.wav", add_ending=True,
+                          output_path="final_output.mp4")
+        combine_final.combine_audio_and_video("main.mp4", "narration.wav", "bgm.wav",
+                                              "combined_output.mp4")
+
+    stages = {}
+    for record in load_records(profile, run_id):
+        assert record["ok"], f"stage {record['stage']} failed"
+        stages[record["stage"]] = {
+            "wall_seconds": record["wall_seconds"],
+            "cpu_seconds": round(record["cpu_seconds"] + record["child_cpu_seconds"], 3),
+            "peak_mb": max(record["peak_rss_mb"], record["child_peak_rss_mb"]),
+        }
+    with wave.open("narration.wav") as wav_file:
+        narration_seconds = wav_file.getnframes() / wav_file.getframerate()
+    return {
+        "stages": stages,
+        "narration_seconds": narration_seconds,
+        "narration_sha256": hashlib.sha256(Path("narration.wav").read_bytes()).hexdigest(),
+        "final_seconds": round(probe_duration("final_output.mp4"), 2),
+        "combined_seconds": round(probe_duration("combined_output.mp4"), 2),
+    }
+
+
+def run_child(workdir: Path, scenario: str, seed: int) -> dict:
+    result_path = workdir / "result.json"
+    cmd = [sys.executable, __file__, "--child", scenario, "--workdir", str(workdir), "--seed", str(seed)]
+    child = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    if child.returncode != 0:
+        raise RuntimeError(f"scenario {scenario} failed:\n{child.stderr}")
+    return json.loads(result_path.read_text())
+
+
+def median_result(runs: list) -> dict:
+    """First run's outputs with the per-stage median of every metric."""
+    result = dict(runs[0])
+    result["stages"] = {
+        stage: {metric: round(statistics.median(run["stages"][stage][metric] for run in runs), 3)
+                for metric in metrics}
+        for stage, metrics in runs[0]["stages"].items()
+    }
+    return result
+
+
+def bench_scenario(name: str, seed: int, repeat: int, size: str, fps: int) -> dict:
+    lines, minutes = parse_scenario(name)
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        print(f"Preparing {name}: {lines} lines, {minutes:g} min...")
+        make_inputs(workdir, minutes * 60, size, fps)
+        runs = [run_child(workdir, name, seed) for _ in range(repeat)]
+    hashes = {run["narration_sha256"] for run in runs}
+    assert len(hashes) == 1, f"{name}: narration.wav differs between runs of the same seed"
+    result = median_result(runs)
+    result.update(lines=lines, minutes=minutes)
+    return result
+
+
+def regressions(scenario: str, result: dict, baseline: dict, tolerance: float,
+                memory_tolerance: float) -> list:
+    """Human-readable list of everything worse than the baseline."""
+    found = []
+    if result["narration_sha256"] != baseline["narration_sha256"]:
+        found.append(f"{scenario}: narration.wav changed (save a new baseline if intended)")
+    for stage, base in baseline["stages"].items():
+        current = result["stages"].get(stage)
+        if current is None:
+            found.append(f"{scenario}/{stage}: stage missing")
+            continue
+        limits = (("wall_seconds", tolerance, MIN_SECONDS), ("cpu_seconds", tolerance, MIN_SECONDS),
+                  ("peak_mb", memory_tolerance, MIN_MB))
+        for metric, relative, absolute in limits:
+            if current[metric] > base[metric] * (1 + relative) and current[metric] - base[metric] > absolute:
+                found.append(f"{scenario}/{stage}: {metric} {current[metric]:g} vs baseline "
+                             f"{base[metric]:g} (+{current[metric] / max(base[metric], 1e-9) - 1:.0%})")
+    return found
+
+
+def change(current: float, base: float) -> str:
+    if base is None:
+        return ""
+    return f"{(current - base) / base:+.0%}" if base else "  -"
+
+
+def print_results(results: dict, baseline: dict):
+    scenarios = baseline.get("scenarios", {}) if baseline else {}
+    print(f"\n{'scenario':<10}{'stage':<15}{'wall s':>9}{'Δ':>6}{'cpu s':>9}{'Δ':>6}{'peak MB':>9}{'Δ':>6}")
+    for name, result in results.items():
+        base_stages = scenarios.get(name, {}).get("stages", {})
+        for stage, m in result["stages"].items():
+            base = base_stages.get(stage, {})
+            print(f"{name:<10}{stage:<15}{m['wall_seconds']:>9.2f}{change(m['wall_seconds'], base.get('wall_seconds')):>6}"
+                  f"{m['cpu_seconds']:>9.2f}{change(m['cpu_seconds'], base.get('cpu_seconds')):>6}"
+                  f"{m['peak_mb']:>9.0f}{change(m['peak_mb'], base.get('peak_mb')):>6}")
+        total = sum(m["wall_seconds"] for m in result["stages"].values())
+        print(f"{name:<10}{'total':<15}{total:>9.2f}   narration {result['narration_seconds']:.1f}s, "
+              f"final {result['final_seconds']:.1f}s")
+
+
+def machine_info() -> dict:
+    # No host name: a baseline holds for any host of the same kind (e.g. CI runners)
+    return {"machine": platform.machine(), "python": platform.python_version(),
+            "cpus": os.cpu_count()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the audio and finalize stages against a baseline")
+    parser.add_argument("--scenario", action="append", type=str,
+                        help=f"{', '.join(SCENARIOS)} or LINESxMINUTES, repeatable "
+                             f"(default: {' '.join(DEFAULT_SCENARIOS)})")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per scenario, median kept (default: 3)")
+    parser.add_argument("--seed", type=int, default=1, help="Script seed (default: 1)")
+    parser.add_argument("--size", default="320x180", help="Synthetic render size (default: 320x180)")
+    parser.add_argument("--fps", type=int, default=10, help="Synthetic render frame rate (default: 10)")
+    parser.add_argument("--save-baseline", metavar="FILE", help="Write the results as the new baseline")
+    parser.add_argument("--compare", metavar="FILE", help="Fail if a stage regressed against this baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed time increase before failing (default: 0.25)")
+    parser.add_argument("--memory-tolerance", type=float, default=0.15,
+                        help="Allowed peak memory increase before failing (default: 0.15)")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--workdir", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        os.chdir(args.workdir)
+        result = run_scenario(*parse_scenario(args.child), args.seed)
+        Path("result.json").write_text(json.dumps(result))
+        return 0
+
+    if shutil.which("ffmpeg") is None:
+        parser.error("ffmpeg is required")
+    names = args.scenario or DEFAULT_SCENARIOS
+    for name in names:
+        try:
+            parse_scenario(name)
+        except argparse.ArgumentTypeError as e:
+            parser.error(f"argument --scenario: {e}")
+    baseline = None
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        for option in ("seed", "size", "fps"):
+            if baseline[option] != getattr(args, option):
+                parser.error(f"baseline was recorded with --{option} {baseline[option]}")
+        # Older baselines also recorded the host name; it is not compared
+        recorded = {key: baseline["machine"].get(key) for key in machine_info()}
+        if recorded != machine_info():
+            print(f"⚠️  Baseline was recorded on {recorded}, this is {machine_info()}")
+
+    results = {name: bench_scenario(name, args.seed, max(1, args.repeat), args.size, args.fps)
+               for name in names}
+    print_results(results, baseline)
+
+    for name, result in results.items():
+        expected = result["minutes"] * 60
+        assert math.isclose(result["narration_seconds"], expected, abs_tol=0.05), \
+            f"{name}: narration is {result['narration_seconds']:.2f}s, expected {expected:g}s"
+        assert result["final_seconds"] > expected, f"{name}: final video lost the ending"
+
+    if args.save_baseline:
+        saved = {"created": datetime.now().isoformat(timespec="seconds"), "seed": args.seed,
+                 "size": args.size, "fps": args.fps, "machine": machine_info(), "scenarios": {}}
+        if os.path.exists(args.save_baseline):
+            # Keep scenarios that were not part of this run
+            saved["scenarios"] = json.loads(Path(args.save_baseline).read_text(encoding="utf-8"))["scenarios"]
+        saved["scenarios"].update(results)
+        Path(args.save_baseline).write_text(json.dumps(saved, indent=2), encoding="utf-8")
+        print(f"\nBaseline saved: {args.save_baseline}")
+
+    if baseline:
+        found = []
+        for name, result in results.items():
+            if name not in baseline["scenarios"]:
+                print(f"⚠️  No baseline for scenario {name}")
+                continue
+            found += regressions(name, result, baseline["scenarios"][name],
+                                 args.tolerance, args.memory_tolerance)
+        if found:
+            print(f"\n❌ {len(found)} regression(s) against {args.compare}:")
+            for line in found:
+                print(f"  - {line}")
+            return 1
+        print(f"\n✅ No regressions against {args.compare}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
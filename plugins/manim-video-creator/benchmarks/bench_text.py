@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Text Cache Benchmark
+
+Builds a set of Japanese titles and captions the way a sectioned scene
+does (each text several times, as the timing check and every
+render_sections.py worker replay earlier sections), each measurement in a
+fresh process with its own media directory like a render worker:
+
+- Text:          manim's Text (Pango layout, SVG parse, outline closing)
+- cached, cold:  templates/text_cache.py CachedText with an empty cache
+- cached, warm:  CachedText in a new process, cache filled by the cold run
+
+The outlines, colors and characters of the warm run must be identical to
+plain Text.
+
+Usage:
+    uv run python benchmarks/bench_text.py
+    uv run python benchmarks/bench_text.py --texts 100 --repeat 4 --font "Noto Sans CJK JP"
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+TEMPLATES_DIR = Path(__file__).resolve().parent.parent / "skills" / "manim-video-creator" / "templates"
+sys.path.insert(0, str(TEMPLATES_DIR))
+
+WORDS = ["量子", "計算", "アルゴリズム", "ニューラル", "ネットワーク", "確率", "分布", "勾配",
+         "降下法", "行列", "固有値", "変換", "最適化", "データ", "モデル", "学習", "推論", "構造"]
+
+
+def make_texts(count: int, seed: int = 0) -> list:
+    """(string, font_size, color) like titles, headers and captions"""
+    rng = random.Random(seed)
+    texts = []
+    for i in range(count):
+        size, words = [(48, 2), (36, 3), (24, 6)][i % 3]
+        string = "".join(rng.choice(WORDS) for _ in range(words))
+        texts.append((f"{i + 1}. {string}", size, ["WHITE", "YELLOW", "GRAY"][i % 3]))
+    return texts
+
+
+def digest(mobjects: list) -> str:
+    """Hash of everything that is drawn (see section_scene.STATE_ATTRIBUTES)."""
+    from section_scene import STATE_ATTRIBUTES
+
+    h = hashlib.sha256()
+    for mob in mobjects:
+        h.update(str(len(mob.chars)).encode())
+        for sub in mob.get_family():
+            for attribute in STATE_ATTRIBUTES:
+                value = getattr(sub, attribute, None)
+                if hasattr(value, "tobytes"):
+                    h.update(value.tobytes())
+                elif value is not None:
+                    h.update(repr(value).encode())
+    return h.hexdigest()
+
+
+def child(args):
+    import manim
+    from manim import config
+
+    config.media_dir = args.media_dir
+    config.verbosity = "WARNING"
+    if args.mode == "text":
+        text_class = manim.Text
+    else:
+        import text_cache
+        text_class = text_cache.CachedText
+    if args.font:
+        text_class.set_default(font=args.font)
+
+    texts = make_texts(args.texts)
+    start = time.perf_counter()
+    built = []
+    for _ in range(args.repeat):
+        built = [text_class(string, font_size=size, color=getattr(manim, color))
+                 for string, size, color in texts]
+    seconds = time.perf_counter() - start
+    result = {"seconds": seconds, "digest": digest(built)}
+    if args.mode != "text":
+        cache = text_cache.text_cache()
+        result.update(hits=cache.hits, misses=cache.misses)
+    print(json.dumps(result))
+
+
+def run(mode: str, workdir: Path, media: str, args) -> dict:
+    cmd = [sys.executable, __file__, "--child", mode, "--media-dir", str(workdir / media),
+           "--texts", str(args.texts), "--repeat", str(args.repeat)]
+    if args.font:
+        cmd += ["--font", args.font]
+    out = subprocess.run(cmd, cwd=workdir, check=True, capture_output=True, text=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the persistent Text cache")
+    parser.add_argument("--texts", type=int, default=60, help="Distinct texts (default: 60)")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="Builds of each text per process (default: 3)")
+    parser.add_argument("--font", default=None, help="Font, e.g. 'Noto Sans CJK JP' (default: Pango's)")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--media-dir", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        args.mode = args.child
+        child(args)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        plain = run("text", workdir, "media_text", args)
+        cold = run("cached", workdir, "media_cold", args)
+        warm = run("cached", workdir, "media_warm", args)
+        cache_mb = sum(p.stat().st_size for p in (workdir / ".text_cache").iterdir()) / 1024**2
+
+    builds = args.texts * args.repeat
+    print(f"\n{args.texts} texts x {args.repeat} builds per process, font: {args.font or 'default'}")
+    for label, result in (("Text", plain), ("cached, cold", cold), ("cached, warm", warm)):
+        cache = f"  hits {result['hits']:4d}  misses {result['misses']:4d}" if "hits" in result else ""
+        print(f"  {label:<14} {result['seconds']:7.2f}s  {result['seconds'] / builds * 1000:7.2f} ms/text"
+              f"  {plain['seconds'] / result['seconds']:5.1f}x{cache}")
+    print(f"  cache size: {cache_mb:.1f} MB")
+    assert cold["misses"] == args.texts and warm["misses"] == 0, "unexpected cache misses"
+    assert plain["digest"] == cold["digest"] == warm["digest"], "cached text differs from Text"
+    assert warm["seconds"] < plain["seconds"], "the warm cache was not faster than Text"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Long-Form Timeline Benchmark
+
+Mixes lecture-length tracks at 48 kHz stereo (a narration segment every
+SEGMENT_INTERVAL seconds plus a looped BGM laid over the whole track with
+add_stream()) and exports them to WAV, each run in a fresh process so its
+peak RSS is its own:
+
+- memory:  templates/audio_mixer.py NarrationMixer (buffer in RAM)
+- mapped:  PCMTimeline (memory-mapped raw file, streamed export)
+
+The mapped timeline's peak memory must not grow with the duration, and
+both must write identical files.
+
+Usage:
+    uv run python benchmarks/bench_timeline.py
+    uv run python benchmarks/bench_timeline.py --minutes 10 30 60 --modes mapped
+"""
+
+import argparse
+import hashlib
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import wave
+from pathlib import Path
+
+import numpy as np
+
+TEMPLATES_DIR = Path(__file__).resolve().parent.parent / "skills" / "manim-video-creator" / "templates"
+sys.path.insert(0, str(TEMPLATES_DIR))
+
+SAMPLE_RATE = 48000
+CHANNELS = 2
+SEGMENT_INTERVAL = 8.0
+
+# Allowed growth of the mapped timeline's peak RSS from the shortest to the longest run
+FLAT_MB = 32
+
+
+def make_segments(count: int = 8, seed: int = 0) -> list:
+    """A few distinct 4-7 s speech-like stereo segments, reused along the track."""
+    rng = np.random.default_rng(seed)
+    segments = []
+    for _ in range(count):
+        t = np.arange(int(rng.uniform(4, 7) * SAMPLE_RATE)) / SAMPLE_RATE
+        voice = np.sin(2 * np.pi * rng.uniform(110, 240) * t) * np.sin(2 * np.pi * 4 * t) ** 2
+        segments.append(np.repeat((0.3 * voice).astype(np.float32)[:, None], CHANNELS, axis=1))
+    return segments
+
+
+def write_bgm(path: Path, seconds: float = 30.0):
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    tone = 0.2 * np.sin(2 * np.pi * 220 * t) * (0.6 + 0.4 * np.sin(2 * np.pi * 0.25 * t))
+    pcm = np.repeat((tone * 32767).astype("<i2")[:, None], CHANNELS, axis=1)
+    with wave.open(str(path), "wb") as wav_file:
+        wav_file.setnchannels(CHANNELS)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(SAMPLE_RATE)
+        wav_file.writeframes(pcm.tobytes())
+
+
+def file_digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def child(args):
+    from audio_encoder import decode_pcm
+    from audio_mixer import NarrationMixer, PCMTimeline
+
+    workdir = Path(args.workdir)
+    duration_ms = int(args.minutes * 60 * 1000)
+    segments = make_segments()
+    start = time.perf_counter()
+    if args.child == "mapped":
+        mixer = PCMTimeline(duration_ms, SAMPLE_RATE, CHANNELS, directory=str(workdir))
+    else:
+        mixer = NarrationMixer(duration_ms, SAMPLE_RATE, CHANNELS)
+    with mixer:
+        mixer.add_stream(decode_pcm(str(workdir / "bgm.wav"), SAMPLE_RATE, CHANNELS, loop=True),
+                         gain_db=-18)
+        for i, position in enumerate(np.arange(0, args.minutes * 60, SEGMENT_INTERVAL)):
+            mixer.add_samples(segments[i % len(segments)], int(position * 1000))
+        output = workdir / f"{args.child}.wav"
+        mixer.export(str(output))
+    seconds = time.perf_counter() - start
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(json.dumps({"seconds": seconds, "peak_mb": peak_mb, "digest": file_digest(output)}))
+    output.unlink()
+
+
+def run(mode: str, minutes: float, workdir: Path) -> dict:
+    cmd = [sys.executable, __file__, "--child", mode, "--workdir", str(workdir),
+           "--minutes", str(minutes)]
+    out = subprocess.run(cmd, check=True, capture_output=True, text=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark memory use of long mixing timelines")
+    parser.add_argument("--minutes", type=float, nargs="+", default=[10, 30, 60],
+                        help="Track lengths to mix (default: 10 30 60)")
+    parser.add_argument("--modes", nargs="+", default=["memory", "mapped"], choices=["memory", "mapped"],
+                        help="Mixers to run (default: memory mapped)")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--workdir", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        args.minutes = args.minutes[0]
+        child(args)
+        return
+
+    results = {}
+    with tempfile.TemporaryDirectory(dir=".") as tmp:
+        workdir = Path(tmp)
+        write_bgm(workdir / "bgm.wav")
+        for minutes in args.minutes:
+            for mode in args.modes:
+                results[mode, minutes] = run(mode, minutes, workdir)
+
+    buffer_mb = {minutes: minutes * 60 * SAMPLE_RATE * CHANNELS * 4 / 1024**2 for minutes in args.minutes}
+    print(f"\n{SAMPLE_RATE} Hz, {CHANNELS} channels, a segment every {SEGMENT_INTERVAL:g}s + looped BGM")
+    print(f"{'minutes':>8}  {'mode':<7} {'seconds':>8} {'peak MB':>8}  (float32 track: MB)")
+    for (mode, minutes), result in results.items():
+        print(f"{minutes:8g}  {mode:<7} {result['seconds']:8.2f} {result['peak_mb']:8.0f}"
+              f"  ({buffer_mb[minutes]:.0f})")
+
+    for minutes in args.minutes:
+        if ("memory", minutes) in results and ("mapped", minutes) in results:
+            assert results["memory", minutes]["digest"] == results["mapped", minutes]["digest"], \
+                f"{minutes:g} min: the mapped timeline wrote a different file"
+    mapped = [results["mapped", minutes]["peak_mb"] for minutes in args.minutes if ("mapped", minutes) in results]
+    if len(mapped) > 1:
+        growth = max(mapped) - min(mapped)
+        print(f"\nMapped timeline peak RSS growth: {growth:.1f} MB")
+        assert growth < FLAT_MB, f"peak RSS of the mapped timeline grew by {growth:.0f} MB"
+
+
+if __name__ == "__main__":
+    main()
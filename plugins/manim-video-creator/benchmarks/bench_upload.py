@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Batch Upload Benchmark
+
+Uploads synthetic videos to a local stand-in of the YouTube resumable
+upload endpoint (upload_server.py, throttled per connection to simulate a
+network link) and compares:
+
+- sequential:  one file at a time with 256 KiB chunks (the single-file
+               uploader's previous setting)
+- batch:       BatchUploader with several workers and large chunks
+
+It then starts a batch upload in a child process, kills it (SIGKILL)
+part-way through and runs the batch again with the same state file: the
+second run must resume every file from its persisted offset, re-send at
+most the chunks that were in flight and deliver byte-identical content
+(sha256 on the server side).
+
+Usage:
+    uv run python benchmarks/bench_upload.py
+    uv run python benchmarks/bench_upload.py --files 6 --size-mb 64 --bandwidth-mb 10 --chunk-mb 16
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import requests
+
+BENCH_DIR = Path(__file__).resolve().parent
+UPLOADER_DIR = BENCH_DIR.parent / "skills" / "youtube-uploader" / "scripts"
+sys.path.insert(0, str(UPLOADER_DIR))
+sys.path.insert(0, str(BENCH_DIR))
+
+import youtube_uploader  # noqa: E402
+from upload_server import UploadServer  # noqa: E402
+
+
+def make_files(workdir: Path, count: int, size: int) -> list:
+    entries = []
+    for i in range(count):
+        path = workdir / f"video_{i}.mp4"
+        path.write_bytes(os.urandom(size))
+        entries.append({"file": str(path), "title": f"Video {i}", "tags": ["bench"], "privacy": "private"})
+    return entries
+
+
+def file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def run_batch(server: UploadServer, entries: list, state_file: str, chunk_size: int, workers: int):
+    uploader = youtube_uploader.BatchUploader(
+        requests.Session, state_file, chunk_size, workers, server.upload_url, server.playlist_url)
+    start = time.perf_counter()
+    results = uploader.upload_all(entries)
+    failed = [path for path, result in results.items() if isinstance(result, Exception)]
+    assert not failed, f"uploads failed: {failed}"
+    return time.perf_counter() - start
+
+
+def completed_sessions(server: UploadServer) -> dict:
+    """Title -> session of every finished upload"""
+    return {session.metadata["snippet"]["title"]: session
+            for session in server.sessions.values() if session.video_id}
+
+
+def child(args):
+    """Batch upload from a separate process (killed by the parent)"""
+    entries = json.loads(Path(args.child).read_text())
+    youtube_uploader.BatchUploader(requests.Session, args.state, args.chunk_size,
+                                   args.workers, args.url).upload_all(entries)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark concurrent, resumable batch uploads")
+    parser.add_argument("--files", type=int, default=4, help="Number of videos (default: 4)")
+    parser.add_argument("--size-mb", type=float, default=24, help="Size of each video (default: 24)")
+    parser.add_argument("--bandwidth-mb", type=float, default=16,
+                        help="Simulated bandwidth per connection in MB/s (default: 16)")
+    parser.add_argument("--chunk-mb", type=float, default=8, help="Batch chunk size (default: 8)")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent uploads (default: 4)")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--state", help=argparse.SUPPRESS)
+    parser.add_argument("--url", help=argparse.SUPPRESS)
+    parser.add_argument("--chunk-size", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(args)
+        return
+
+    chunk_size = int(args.chunk_mb * 1024 * 1024)
+    size = int(args.size_mb * 1024 * 1024)
+    server = UploadServer(bandwidth=args.bandwidth_mb * 1024 * 1024).start()
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        entries = make_files(workdir, args.files, size)
+        digests = {entry["title"]: file_digest(entry["file"]) for entry in entries}
+
+        sequential = run_batch(server, entries, str(workdir / "sequential.json"), 256 * 1024, 1)
+        sequential_requests = sum(s.requests for s in completed_sessions(server).values())
+        server.sessions.clear()
+
+        batch = run_batch(server, entries, str(workdir / "batch.json"), chunk_size, args.workers)
+        batch_requests = sum(s.requests for s in completed_sessions(server).values())
+        assert {t: s.digest.hexdigest() for t, s in completed_sessions(server).items()} == digests
+        server.sessions.clear()
+
+        # Kill a batch upload part-way through, then resume it
+        state_file = str(workdir / "resume.json")
+        manifest = workdir / "manifest.json"
+        manifest.write_text(json.dumps(entries))
+        process = subprocess.Popen([sys.executable, __file__, "--child", str(manifest),
+                                    "--state", state_file, "--url", server.upload_url,
+                                    "--chunk-size", str(chunk_size), "--workers", str(args.workers)],
+                                   stdout=subprocess.DEVNULL)
+        total = size * args.files
+        while sum(s.received for s in server.sessions.values()) < total * 0.4:
+            assert process.poll() is None, "child finished before it could be interrupted"
+            time.sleep(0.02)
+        process.send_signal(signal.SIGKILL)
+        process.wait()
+        received_before = sum(s.received for s in server.sessions.values())
+
+        resumed = run_batch(server, entries, state_file, chunk_size, args.workers)
+        sessions = completed_sessions(server)
+        resent = sum(s.bytes_sent for s in server.sessions.values()) - total
+        session_count = len(server.sessions)
+        identical = {t: s.digest.hexdigest() for t, s in sessions.items()} == digests
+    server.shutdown()
+
+    mb = total / (1024**2)
+    print(f"\n{args.files} files x {args.size_mb:g} MB, {args.bandwidth_mb:g} MB/s per connection")
+    print(f"  sequential, 256 KiB chunks: {sequential:6.1f}s  {mb / sequential:6.1f} MB/s  "
+          f"{sequential_requests} requests")
+    print(f"  batch, {args.workers} workers, {args.chunk_mb:g} MB chunks: {batch:6.1f}s  "
+          f"{mb / batch:6.1f} MB/s  {batch_requests} requests  ({sequential / batch:.1f}x faster)")
+    print(f"  killed at {received_before / total:.0%}, resumed in {resumed:.1f}s, "
+          f"re-sent {resent / (1024**2):.1f} MB, content identical: {'yes' if identical else 'NO'}")
+    assert len(sessions) == session_count == args.files, \
+        "resume started new sessions instead of continuing"
+    assert identical, "uploaded content differs from the files"
+    assert resent <= args.workers * chunk_size, "resume re-sent more than the chunks in flight"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Local Stand-In for the YouTube Resumable Upload Endpoint
+
+Implements the parts of the resumable upload protocol that
+skills/youtube-uploader/scripts/youtube_uploader.py uses, so uploads can be
+exercised without credentials or quota:
+
+- POST /upload/youtube/v3/videos?uploadType=resumable  -> 200 + Location
+- PUT  <session>  Content-Range: bytes a-b/size          -> 308 + Range / 201
+- PUT  <session>  Content-Range: bytes */size            -> current offset
+- POST /youtube/v3/playlistItems                         -> 200
+
+Received bytes are hashed as they arrive (nothing is kept in memory), and
+every session records how many bytes were sent in total, so a benchmark
+can check both the uploaded content and how much was re-sent. The number
+of accepted TCP connections is counted to show connection reuse.
+
+Faults can be injected into chunk PUTs (seeded, so runs are repeatable):
+- error_rate: the whole chunk is read, then answered with 503 (not stored)
+- reset_rate: half the chunk is read, then the connection is closed
+- fail_status: every chunk PUT is answered with this status
+
+Used by bench_upload.py and bench_retry.py; can also be run on its own:
+    python benchmarks/upload_server.py --port 8765 --bandwidth-mb 20 --error-rate 0.1
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import re
+import socket
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+CONTENT_RANGE = re.compile(r"bytes (?:(\d+)-(\d+)|\*)/(\d+)")
+
+
+class UploadSession:
+    def __init__(self, size: int, metadata: dict):
+        self.size = size
+        self.metadata = metadata
+        self.received = 0
+        self.bytes_sent = 0
+        self.requests = 0
+        self.digest = hashlib.sha256()
+        self.video_id = None
+
+
+class UploadServer(ThreadingHTTPServer):
+    """Resumable upload stand-in; `bandwidth` (bytes/s per connection) throttles reads"""
+
+    daemon_threads = True
+
+    def __init__(self, address=("127.0.0.1", 0), bandwidth: float = None,
+                 error_rate: float = 0.0, reset_rate: float = 0.0,
+                 fail_status: int = None, seed: int = 0):
+        super().__init__(address, UploadHandler)
+        self.bandwidth = bandwidth
+        self.error_rate = error_rate
+        self.reset_rate = reset_rate
+        self.fail_status = fail_status
+        self.rng = random.Random(seed)
+        self.sessions = {}
+        self.lock = threading.Lock()
+        self.playlist_items = []
+        self.faults = {"errors": 0, "resets": 0}
+        self.connections = 0
+
+    def draw_fault(self):
+        """None, "reset" or an HTTP status for the next chunk PUT"""
+        if self.fail_status:
+            return self.fail_status
+        with self.lock:
+            roll = self.rng.random()
+            if roll < self.reset_rate:
+                self.faults["resets"] += 1
+                return "reset"
+            if roll < self.reset_rate + self.error_rate:
+                self.faults["errors"] += 1
+                return 503
+        return None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def upload_url(self) -> str:
+        return f"{self.base_url}/upload/youtube/v3/videos"
+
+    @property
+    def playlist_url(self) -> str:
+        return f"{self.base_url}/youtube/v3/playlistItems"
+
+    def start(self) -> "UploadServer":
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+
+class UploadHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def reply(self, status: int, body: dict = None, headers: dict = None):
+        payload = json.dumps(body).encode() if body is not None else b""
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if body is not None:
+            self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def read_body(self, length: int, session: UploadSession = None) -> bytes:
+        """Read the request body, throttled to the server bandwidth"""
+        chunks = []
+        remaining = length
+        start = time.perf_counter()
+        while remaining:
+            block = self.rfile.read(min(remaining, 256 * 1024))
+            if not block:
+                break
+            remaining -= len(block)
+            if session is not None:
+                session.bytes_sent += len(block)
+            chunks.append(block)
+            if self.server.bandwidth:
+                ahead = (length - remaining) / self.server.bandwidth - (time.perf_counter() - start)
+                if ahead > 0:
+                    time.sleep(ahead)
+        return b"".join(chunks)
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        body = self.read_body(int(self.headers.get("Content-Length", 0)))
+        if url.path == "/youtube/v3/playlistItems":
+            self.server.playlist_items.append(json.loads(body))
+            self.reply(200, {"kind": "youtube#playlistItem"})
+            return
+        if url.path != "/upload/youtube/v3/videos" or "uploadType=resumable" not in url.query:
+            self.reply(404, {"error": "not found"})
+            return
+        session_id = uuid.uuid4().hex
+        with self.server.lock:
+            self.server.sessions[session_id] = UploadSession(
+                int(self.headers["X-Upload-Content-Length"]), json.loads(body))
+        self.reply(200, headers={"Location": f"{self.server.base_url}/upload/session/{session_id}"})
+
+    def do_PUT(self):
+        session = self.server.sessions.get(self.path.rsplit("/", 1)[-1])
+        length = int(self.headers.get("Content-Length", 0))
+        if session is None:
+            self.read_body(length)
+            self.reply(404, {"error": "session not found"})
+            return
+        session.requests += 1
+        match = CONTENT_RANGE.fullmatch(self.headers.get("Content-Range", ""))
+        fault = self.server.draw_fault() if match and match.group(1) is not None else None
+        if fault == "reset":
+            self.read_body(length // 2, session)
+            self.close_connection = True
+            self.connection.shutdown(socket.SHUT_RDWR)
+            return
+        data = self.read_body(length, session)
+        if match is None:
+            self.reply(400, {"error": "bad Content-Range"})
+            return
+        if fault is not None:
+            self.reply(fault, {"error": {"code": fault, "message": "injected fault"}})
+            return
+        if match.group(1) is not None:
+            first = int(match.group(1))
+            # Only bytes that continue the received prefix are kept
+            if first <= session.received < first + len(data):
+                new = data[session.received - first:]
+                session.digest.update(new)
+                session.received += len(new)
+        self.reply_progress(session)
+
+    def reply_progress(self, session: UploadSession):
+        if session.received >= session.size:
+            if session.video_id is None:
+                session.video_id = f"vid_{uuid.uuid4().hex[:11]}"
+            self.reply(201, {"id": session.video_id, "snippet": session.metadata.get("snippet", {})})
+        elif session.received:
+            self.reply(308, headers={"Range": f"bytes=0-{session.received - 1}"})
+        else:
+            self.reply(308)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local resumable upload stand-in server")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--bandwidth-mb", type=float, default=None, help="MB/s per connection")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of chunks answered with 503")
+    parser.add_argument("--reset-rate", type=float, default=0.0, help="Fraction of chunks cut off mid-body")
+    parser.add_argument("--fail-status", type=int, default=None, help="Answer every chunk with this status")
+    args = parser.parse_args()
+    bandwidth = args.bandwidth_mb * 1024 * 1024 if args.bandwidth_mb else None
+    server = UploadServer(("127.0.0.1", args.port), bandwidth, args.error_rate, args.reset_rate,
+                          args.fail_status)
+    print(f"Upload endpoint: {server.upload_url}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
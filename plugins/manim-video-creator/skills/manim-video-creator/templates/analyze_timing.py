@@ -0,0 +1,428 @@
+"""
+Static Timing Analyzer
+
+Checks narration / animation sync without rendering. The scene file is
+parsed with the ast module (Manim is not imported), self.play() run times
+(Manim's default of 1s when not given), self.wait() durations and play
+counts are summed per section and compared with the measured narration in
+narration_timing.json. The drift of every section is reported in ms, so
+sync problems are found in well under a second instead of after a -qh render.
+
+Sections are, in order of preference:
+- @section methods of a SectionScene (section_scene.py); these are padded
+  to the next narration's start automatically (after the lead-in for the
+  first one), so only overruns are problems
+- methods called as self.xxx() from construct()
+- "# ===== Section ... =====" comment blocks inside construct()
+Section i is compared with the slot from the start of narration segment i
+to the start of segment i + 1 (the last one to its end), and its start
+time with segment i's start.
+
+Usage:
+    uv run python analyze_timing.py scene.py [SceneClass]
+    uv run python analyze_timing.py scene.py MyScene --manifest narration_timing.json --json
+
+Exits with status 1 if any section's length or start drifts by more than
+the tolerance.
+"""
+
+import argparse
+import ast
+import bisect
+import json
+import os
+import re
+import sys
+import time
+
+# Manim defaults
+DEFAULT_RUN_TIME = 1.0
+DEFAULT_WAIT = 1.0
+
+SECTION_COMMENT = re.compile(r"^\s*#\s*=+\s*(.+?)\s*=+\s*$")
+
+
+class Timing:
+    """Accumulated animation time of a block of code."""
+
+    def __init__(self):
+        self.seconds = 0.0
+        self.plays = 0
+        self.waits = 0
+        self.unresolved = []  # line numbers whose duration was guessed
+
+    def add(self, other, times: int = 1):
+        self.seconds += other.seconds * times
+        self.plays += other.plays * times
+        self.waits += other.waits * times
+        self.unresolved += other.unresolved
+
+
+def number(node, names: dict):
+    """Evaluate a numeric expression (literals, known names, + - * /); None if unknown."""
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)) \
+            and not isinstance(node.value, bool):
+        return float(node.value)
+    if isinstance(node, ast.Name):
+        return names.get(node.id)
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+        value = number(node.operand, names)
+        return None if value is None else (-value if isinstance(node.op, ast.USub) else value)
+    if isinstance(node, ast.BinOp):
+        left, right = number(node.left, names), number(node.right, names)
+        if left is None or right is None:
+            return None
+        if isinstance(node.op, ast.Add):
+            return left + right
+        if isinstance(node.op, ast.Sub):
+            return left - right
+        if isinstance(node.op, ast.Mult):
+            return left * right
+        if isinstance(node.op, ast.Div) and right:
+            return left / right
+    return None
+
+
+def numeric_assignments(nodes, names: dict = None) -> dict:
+    """NAME = <number> assignments, evaluated in order."""
+    names = dict(names or {})
+    for node in nodes:
+        if isinstance(node, ast.Assign) and len(node.targets) == 1 \
+                and isinstance(node.targets[0], ast.Name):
+            value = number(node.value, names)
+            if value is not None:
+                names[node.targets[0].id] = value
+    return names
+
+
+def nested_statements(statements):
+    """Yield statements and the statements nested in their blocks (not expressions)."""
+    for stmt in statements:
+        yield stmt
+        for field in ("body", "orelse", "finalbody", "handlers"):
+            block = getattr(stmt, field, None)
+            if block and not isinstance(stmt, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                yield from nested_statements(block)
+
+
+def keyword(call: ast.Call, name: str):
+    for kw in call.keywords:
+        if kw.arg == name:
+            return kw.value
+    return None
+
+
+def self_method(call) -> str:
+    """Name of a self.xxx(...) call, else None."""
+    if isinstance(call, ast.Call) and isinstance(call.func, ast.Attribute) \
+            and isinstance(call.func.value, ast.Name) and call.func.value.id == "self":
+        return call.func.attr
+    return None
+
+
+def is_section(node) -> bool:
+    return any(isinstance(d, ast.Name) and d.id == "section" for d in node.decorator_list)
+
+
+class SceneTimer:
+    """Sums animation time of the methods of one scene class."""
+
+    def __init__(self, methods: dict, constants: dict):
+        self.methods = methods
+        self.constants = constants
+
+    def time_statements(self, statements, stack=()) -> Timing:
+        nodes = list(nested_statements(statements))
+        names = numeric_assignments(nodes, self.constants)
+        assignments = {node.targets[0].id: node.value for node in nodes
+                       if isinstance(node, ast.Assign) and len(node.targets) == 1
+                       and isinstance(node.targets[0], ast.Name)}
+        return self.time_block(statements, names, assignments, stack)
+
+    def time_function(self, func, stack=()) -> Timing:
+        if func.name in stack:  # recursion: count once
+            return Timing()
+        return self.time_statements(func.body, stack + (func.name,))
+
+    def time_block(self, statements, names, assignments, stack) -> Timing:
+        timing = Timing()
+        for stmt in statements:
+            if isinstance(stmt, (ast.For, ast.AsyncFor)):
+                count = self.loop_count(stmt.iter, names, assignments)
+                if count is None:
+                    timing.unresolved.append(stmt.lineno)
+                    count = 1
+                timing.add(self.time_block(stmt.body, names, assignments, stack), count)
+            elif isinstance(stmt, ast.While):
+                timing.unresolved.append(stmt.lineno)
+                timing.add(self.time_block(stmt.body, names, assignments, stack))
+            elif isinstance(stmt, ast.If):
+                branches = [self.time_block(b, names, assignments, stack) for b in (stmt.body, stmt.orelse)]
+                longest = max(branches, key=lambda t: t.seconds)
+                if branches[0].seconds != branches[1].seconds:
+                    timing.unresolved.append(stmt.lineno)
+                timing.add(longest)
+            elif isinstance(stmt, (ast.With, ast.AsyncWith)):
+                timing.add(self.time_block(stmt.body, names, assignments, stack))
+            elif isinstance(stmt, ast.Try):
+                for block in (stmt.body, stmt.orelse, stmt.finalbody):
+                    timing.add(self.time_block(block, names, assignments, stack))
+            elif not isinstance(stmt, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                for node in ast.walk(stmt):
+                    if isinstance(node, ast.Call) and self_method(node):
+                        timing.add(self.time_call(node, names, stack))
+        return timing
+
+    def time_call(self, node, names, stack) -> Timing:
+        timing = Timing()
+        method = self_method(node)
+        if method == "play":
+            timing.plays = 1
+            timing.seconds = self.play_time(node, names, timing)
+        elif method == "wait":
+            timing.waits = 1
+            duration = node.args[0] if node.args else keyword(node, "duration")
+            if self_method(duration) == "remaining_time":
+                return timing  # SectionScene padding, counted separately
+            value = DEFAULT_WAIT if duration is None else number(duration, names)
+            if value is None:
+                timing.unresolved.append(node.lineno)
+                value = DEFAULT_WAIT
+            timing.seconds = value
+        elif method in self.methods:
+            timing.add(self.time_function(self.methods[method], stack))
+        return timing
+
+    def play_time(self, call, names, timing) -> float:
+        """run_time= of the play, else the longest animation run_time, else 1s."""
+        run_time = keyword(call, "run_time")
+        candidates = [run_time] if run_time is not None else [
+            keyword(arg, "run_time") for arg in call.args if isinstance(arg, ast.Call)
+        ]
+        values = []
+        for node in candidates:
+            if node is None:
+                continue
+            value = number(node, names)
+            if value is None:
+                timing.unresolved.append(call.lineno)
+            else:
+                values.append(value)
+        return max(values) if values else DEFAULT_RUN_TIME
+
+    def loop_count(self, node, names, assignments, depth=0):
+        """Iterations of a for loop over range(), a literal or a VGroup(...); None if unknown."""
+        if depth > 5:
+            return None
+        if isinstance(node, (ast.List, ast.Tuple, ast.Set)):
+            return None if any(isinstance(e, ast.Starred) for e in node.elts) else len(node.elts)
+        if isinstance(node, ast.Name) and node.id in assignments:
+            return self.loop_count(assignments[node.id], names, assignments, depth + 1)
+        if not isinstance(node, ast.Call):
+            return None
+        func = node.func
+        if isinstance(func, ast.Name) and func.id == "range":
+            bounds = [number(arg, names) for arg in node.args]
+            if None in bounds or not bounds:
+                return None
+            return len(range(*[int(b) for b in bounds]))
+        if isinstance(func, ast.Name) and func.id in ("enumerate", "reversed") and node.args:
+            return self.loop_count(node.args[0], names, assignments, depth + 1)
+        if isinstance(func, ast.Name) and func.id == "zip" and node.args:
+            counts = [self.loop_count(arg, names, assignments, depth + 1) for arg in node.args]
+            return None if None in counts else min(counts)
+        if isinstance(func, ast.Name) and func.id in ("VGroup", "Group") \
+                and not any(isinstance(arg, ast.Starred) for arg in node.args):
+            return len(node.args)
+        if isinstance(func, ast.Attribute):
+            # VGroup(...).arrange(...) and similar chains keep the children
+            return self.loop_count(func.value, names, assignments, depth + 1)
+        return None
+
+
+def find_scene(tree, scene_class: str = None):
+    """The requested class, else the first class that defines construct or @section methods."""
+    classes = [node for node in tree.body if isinstance(node, ast.ClassDef)]
+    if scene_class:
+        for node in classes:
+            if node.name == scene_class:
+                return node
+        raise SystemExit(f"Class {scene_class} not found")
+    scenes = [node for node in classes if any(
+        isinstance(item, ast.FunctionDef) and (item.name == "construct" or is_section(item))
+        for item in node.body)]
+    if not scenes:
+        raise SystemExit("No scene class found")
+    return scenes[0]
+
+
+def class_methods(tree, scene) -> dict:
+    """Methods of the scene and of its base classes defined in the same file."""
+    classes = {node.name: node for node in tree.body if isinstance(node, ast.ClassDef)}
+    methods = {}
+    chain, current = [], scene
+    while current is not None and current not in chain:
+        chain.append(current)
+        bases = [b.id for b in current.bases if isinstance(b, ast.Name)]
+        current = next((classes[b] for b in bases if b in classes), None)
+    for klass in reversed(chain):
+        for item in klass.body:
+            if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                methods[item.name] = item
+    return methods
+
+
+def split_sections(scene, methods: dict, source_lines: list):
+    """Return (mode, [(name, statements)])."""
+    sections = [(name, func.body) for name, func in methods.items() if is_section(func)]
+    if sections:
+        return "section", sections
+
+    construct = methods.get("construct")
+    if construct is None:
+        return "manual", []
+    calls = [self_method(stmt.value) if isinstance(stmt, ast.Expr) else None
+             for stmt in construct.body]
+    if calls and None not in calls and "play" not in calls and "wait" not in calls:
+        # Methods defined elsewhere (e.g. a base class in another file) count as empty
+        return "manual", [(name, methods[name].body if name in methods else [])
+                          for name in calls]
+
+    markers = []
+    for lineno in range(construct.lineno, construct.end_lineno + 1):
+        match = SECTION_COMMENT.match(source_lines[lineno - 1])
+        if match:
+            markers.append((lineno, match.group(1)))
+    if not markers:
+        return "manual", [("construct", construct.body)]
+
+    blocks = [("(before first section)", [])] + [(title, []) for _, title in markers]
+    marker_lines = [lineno for lineno, _ in markers]
+    for stmt in construct.body:
+        blocks[bisect.bisect_left(marker_lines, stmt.lineno)][1].append(stmt)
+    return "manual", [block for i, block in enumerate(blocks) if i or block[1]]
+
+
+def load_segments(manifest_path: str) -> list:
+    if not os.path.exists(manifest_path):
+        return []
+    with open(manifest_path, encoding="utf-8") as f:
+        return json.load(f)["segments"]
+
+
+def analyze(scene_file: str, scene_class: str = None,
+            manifest_path: str = "narration_timing.json", tolerance_ms: float = 50) -> dict:
+    """Per-section animation time vs narration, with drift in ms."""
+    with open(scene_file, encoding="utf-8") as f:
+        source = f.read()
+    tree = ast.parse(source, filename=scene_file)
+    scene = find_scene(tree, scene_class)
+    methods = class_methods(tree, scene)
+    constants = numeric_assignments(tree.body)
+    constants = numeric_assignments(scene.body, constants)
+    timer = SceneTimer(methods, constants)
+    mode, sections = split_sections(scene, methods, source.splitlines())
+    segments = load_segments(manifest_path)
+
+    rows = []
+    cursor = 0.0
+    for index, (name, statements) in enumerate(sections):
+        timing = timer.time_statements(statements)
+        if mode == "section" and index == 0 and segments:
+            cursor += segments[0]["start"]  # SectionScene waits for the lead-in first
+        row = {
+            "index": index + 1,
+            "section": name,
+            "start": round(cursor, 3),
+            "animation": round(timing.seconds, 3),
+            "plays": timing.plays,
+            "waits": timing.waits,
+            "unresolved_lines": sorted(set(timing.unresolved)),
+        }
+        length = timing.seconds
+        if index < len(segments):
+            segment = segments[index]
+            # A section runs from its segment's start to the next one's (the last to
+            # its end); with manual timing the first one also covers the lead-in
+            slot_start = 0.0 if mode != "section" and index == 0 else segment["start"]
+            slot_end = segment["end"] if index + 1 >= len(segments) else segments[index + 1]["start"]
+            slot = slot_end - slot_start
+            drift_ms = (timing.seconds - slot) * 1000
+            start_drift_ms = (cursor - slot_start) * 1000
+            if mode == "section":
+                length = max(timing.seconds, slot)  # padded
+                problem = drift_ms > tolerance_ms
+            else:
+                problem = abs(drift_ms) > tolerance_ms
+            if problem:
+                status = "OVERRUN" if drift_ms > 0 else "SHORT"
+            elif abs(start_drift_ms) > tolerance_ms:
+                # Starts off its narration (an earlier section drifted)
+                status = "LATE" if start_drift_ms > 0 else "EARLY"
+            else:
+                status = "OK"
+            row.update({
+                "narration_start": segment["start"],
+                "narration_slot": round(slot, 3),
+                "start_drift_ms": round(start_drift_ms),
+                "drift_ms": round(drift_ms),
+                "status": status,
+            })
+        else:
+            row["status"] = "-"
+        cursor += length
+        rows.append(row)
+
+    return {
+        "scene": scene.name,
+        "mode": mode,
+        "manifest": manifest_path if segments else None,
+        "narration_segments": len(segments),
+        "total_animation": round(cursor, 3),
+        "sections": rows,
+    }
+
+
+def print_report(report: dict, elapsed: float):
+    padded = report["mode"] == "section"
+    print(f"Scene: {report['scene']} ({'SectionScene, padded to narration' if padded else 'manual timing'})")
+    if report["manifest"] is None:
+        print("No narration_timing.json found: showing animation time only "
+              "(run narration_pipeline.py to measure the narration)")
+    print(f"{'#':>3}  {'section':<28} {'start':>8} {'anim':>8} {'narr':>8} {'drift':>10}  status")
+    for row in report["sections"]:
+        narration = f"{row['narration_slot']:7.2f}s" if "narration_slot" in row else f"{'-':>8}"
+        drift = f"{row['drift_ms']:+8d}ms" if "drift_ms" in row else f"{'-':>10}"
+        print(f"{row['index']:>3}  {row['section'][:28]:<28} {row['start']:7.2f}s "
+              f"{row['animation']:7.2f}s {narration} {drift}  {row['status']}")
+        if row["unresolved_lines"]:
+            lines = ", ".join(str(n) for n in row["unresolved_lines"])
+            print(f"{'':>5}note: duration estimated at line {lines} (non-literal run_time / loop)")
+    if report["narration_segments"] > len(report["sections"]):
+        print(f"Warning: {report['narration_segments']} narration segments but only "
+              f"{len(report['sections'])} sections")
+    print(f"Total: {report['total_animation']:.2f}s  (analyzed in {elapsed * 1000:.0f} ms)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Static narration/animation timing check")
+    parser.add_argument("scene_file", help="Scene file (e.g. scene.py)")
+    parser.add_argument("scene_class", nargs="?", help="Scene class (default: first scene in the file)")
+    parser.add_argument("--manifest", default="narration_timing.json", help="Narration timing manifest")
+    parser.add_argument("--tolerance-ms", type=float, default=50, help="Allowed drift (default: 50)")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    report = analyze(args.scene_file, args.scene_class, args.manifest, args.tolerance_ms)
+    elapsed = time.perf_counter() - start
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        print_report(report, elapsed)
+    problems = ("OVERRUN", "SHORT", "LATE", "EARLY")
+    sys.exit(1 if any(row["status"] in problems for row in report["sections"]) else 0)
+
+
+if __name__ == "__main__":
+    main()
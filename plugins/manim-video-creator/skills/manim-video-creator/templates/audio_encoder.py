@@ -0,0 +1,154 @@
+"""
+Streaming ffmpeg Audio I/O
+
+Shared helper used by generate_bgm.py, generate_audio.py,
+narration_pipeline.py and combine_final.py. Copy it next to the other
+templates in your project directory.
+
+Raw PCM is piped straight into (or out of) a single ffmpeg process, so
+audio is never written to temporary WAV/MP3 files and only one chunk is
+held in memory at a time.
+"""
+
+import subprocess
+
+import numpy as np
+
+# Encoder arguments chosen from the output file extension
+CODEC_ARGS = {
+    ".wav": ["-c:a", "pcm_s16le"],
+    ".flac": ["-c:a", "flac"],
+    ".mp3": ["-c:a", "libmp3lame", "-b:a", "192k"],
+    ".m4a": ["-c:a", "aac", "-b:a", "192k"],
+    ".aac": ["-c:a", "aac", "-b:a", "192k"],
+}
+
+# Video + audio mux: copy the video stream, encode the piped audio once to AAC
+MUX_ARGS = [
+    "-map", "0:v:0", "-map", "1:a:0",
+    "-c:v", "copy", "-c:a", "aac", "-b:a", "192k",
+    "-shortest",
+]
+
+
+def float_to_pcm16(samples: np.ndarray) -> bytes:
+    """Convert float samples in [-1, 1] to 16-bit little-endian PCM bytes."""
+    return np.clip(np.rint(samples * 32768.0), -32768, 32767).astype("<i2").tobytes()
+
+
+def codec_args_for(output_path: str) -> list:
+    for extension, args in CODEC_ARGS.items():
+        if output_path.lower().endswith(extension):
+            return args
+    raise ValueError(f"Unsupported audio format: {output_path}")
+
+
+class PCMEncoder:
+    """Pipe raw PCM into one ffmpeg encode.
+
+    With `video_path`, the audio is muxed with that video (video stream
+    copied, audio encoded to AAC) instead of written as an audio file.
+
+        with PCMEncoder("bgm.wav", 44100) as encoder:
+            for chunk in chunks:
+                encoder.write(chunk)
+    """
+
+    def __init__(self, output_path: str, sample_rate: int, channels: int = 1,
+                 video_path: str = None, codec_args: list = None):
+        self.output_path = output_path
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.video_path = video_path
+        if codec_args is None:
+            codec_args = MUX_ARGS if video_path else codec_args_for(output_path)
+        self.codec_args = codec_args
+        self.process = None
+        self.stopped = False
+
+    def command(self) -> list:
+        cmd = ["ffmpeg", "-hide_banner", "-loglevel", "error", "-y"]
+        if self.video_path:
+            cmd += ["-i", self.video_path]
+        cmd += [
+            "-f", "s16le", "-ar", str(self.sample_rate), "-ac", str(self.channels),
+            "-i", "pipe:0",
+        ]
+        return cmd + self.codec_args + [self.output_path]
+
+    def __enter__(self):
+        self.process = subprocess.Popen(self.command(), stdin=subprocess.PIPE)
+        return self
+
+    def write(self, samples: np.ndarray):
+        """Write float samples of shape (frames,) or (frames, channels)."""
+        self.write_pcm(float_to_pcm16(samples))
+
+    def write_pcm(self, data: bytes):
+        """Write interleaved 16-bit PCM bytes."""
+        if self.stopped:
+            return
+        try:
+            self.process.stdin.write(data)
+        except BrokenPipeError:
+            # ffmpeg stopped reading (e.g. -shortest reached the end of the video)
+            self.stopped = True
+
+    def close(self):
+        try:
+            self.process.stdin.close()
+        except BrokenPipeError:
+            pass
+        if self.process.wait() != 0:
+            raise RuntimeError(f"ffmpeg failed while writing {self.output_path}")
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.process.kill()
+            self.process.wait()
+        return False
+
+
+def decode_pcm(path: str, sample_rate: int, channels: int = 1,
+               chunk_frames: int = 65536, loop: bool = False):
+    """Yield float32 chunks of shape (frames, channels) decoded by ffmpeg.
+
+    With loop=True the input repeats forever; stop iterating when done.
+    Raises RuntimeError when ffmpeg fails (missing or corrupt input), so an
+    error does not pass for a short or silent stream.
+    """
+    cmd = ["ffmpeg", "-hide_banner", "-loglevel", "error"]
+    if loop:
+        cmd += ["-stream_loop", "-1"]
+    cmd += ["-i", path, "-f", "s16le", "-ar", str(sample_rate), "-ac", str(channels), "pipe:1"]
+
+    process = subprocess.Popen(cmd, stdout=subprocess.PIPE)
+    chunk_bytes = chunk_frames * channels * 2
+    try:
+        while True:
+            data = process.stdout.read(chunk_bytes)
+            if not data:
+                break
+            samples = np.frombuffer(data[: len(data) - len(data) % (2 * channels)], dtype="<i2")
+            yield samples.reshape(-1, channels).astype(np.float32) / 32768.0
+        if process.wait() != 0:
+            raise RuntimeError(f"ffmpeg failed while reading {path}")
+    finally:
+        # Only still running when the consumer stopped early (e.g. a looped BGM)
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+        process.stdout.close()
+
+
+def probe_duration(path: str) -> float:
+    """Return the media duration in seconds using ffprobe."""
+    result = subprocess.run([
+        "ffprobe", "-v", "error",
+        "-show_entries", "format=duration",
+        "-of", "csv=p=0",
+        path,
+    ], capture_output=True, text=True, check=True)
+    return float(result.stdout.strip())
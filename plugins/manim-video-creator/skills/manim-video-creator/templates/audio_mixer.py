@@ -0,0 +1,196 @@
+"""
+NumPy Narration Mixer
+
+Shared helper used by generate_audio.py and narration_pipeline.py. Copy it
+next to the other templates in your project directory (export() also
+needs audio_encoder.py).
+
+AudioSegment.overlay() copies the whole track on every call, so mixing N
+segments into a long video is O(N x video length). This mixer decodes each
+segment once into a preallocated float32 buffer and adds it in place at its
+offset, which is O(video length + total segment length).
+
+For hour-long tracks the buffer itself gets large (an hour of 48 kHz stereo
+is 1.4 GB), so PCMTimeline keeps it in a memory-mapped raw file instead:
+writes map only the frames they touch and export streams the file, so peak
+memory stays flat however long the track is. create_mixer() picks one of
+the two by size.
+"""
+
+import os
+import tempfile
+
+import numpy as np
+from pydub import AudioSegment
+
+
+def segment_to_array(segment: AudioSegment, sample_rate: int, channels: int) -> np.ndarray:
+    """Convert an AudioSegment to a float32 array of shape (frames, channels)."""
+    segment = segment.set_frame_rate(sample_rate).set_channels(channels).set_sample_width(2)
+    samples = np.frombuffer(segment.raw_data, dtype=np.int16)
+    return samples.reshape(-1, channels).astype(np.float32) / 32768.0
+
+
+def array_to_segment(samples: np.ndarray, sample_rate: int) -> AudioSegment:
+    """Convert a float32 array of shape (frames, channels) to a 16-bit AudioSegment."""
+    pcm = np.clip(np.rint(samples * 32768.0), -32768, 32767).astype(np.int16)
+    return AudioSegment(
+        pcm.tobytes(),
+        frame_rate=sample_rate,
+        sample_width=2,
+        channels=samples.shape[1],
+    )
+
+
+def soft_limit(samples: np.ndarray, threshold: float = 0.9) -> np.ndarray:
+    """Compress peaks above `threshold` smoothly so the output never exceeds 1.0.
+
+    Samples below the threshold are left untouched; the range above it is
+    mapped through tanh into the remaining headroom. Operates in place.
+    """
+    headroom = 1.0 - threshold
+    magnitude = np.abs(samples)
+    over = magnitude > threshold
+    if np.any(over):
+        compressed = threshold + headroom * np.tanh((magnitude[over] - threshold) / headroom)
+        samples[over] = np.sign(samples[over]) * compressed
+    return samples
+
+
+class NarrationMixer:
+    """Preallocated sample buffer that segments are added into by offset."""
+
+    def __init__(self, duration_ms: int, sample_rate: int = 24000, channels: int = 1):
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.frames = int(sample_rate * duration_ms / 1000)
+        self.buffer = np.zeros((self.frames, channels), dtype=np.float32)
+
+    def window(self, start: int, frames: int) -> np.ndarray:
+        """Writable view of frames [start, start + frames)."""
+        return self.buffer[start:start + frames]
+
+    def add(self, segment: AudioSegment, position_ms: int, gain_db: float = 0.0):
+        """Add a segment in place at `position_ms`; the part past the end is dropped."""
+        self.add_samples(segment_to_array(segment, self.sample_rate, self.channels),
+                         position_ms, gain_db)
+
+    def add_samples(self, samples: np.ndarray, position_ms: int, gain_db: float = 0.0):
+        """Like add() for samples already converted with segment_to_array()."""
+        self.add_frames(samples, int(self.sample_rate * position_ms / 1000), gain_db)
+
+    def add_frames(self, samples: np.ndarray, start: int, gain_db: float = 0.0):
+        """Add (frames, channels) samples in place at frame `start`."""
+        end = min(start + len(samples), self.frames)
+        if start >= end:
+            return
+        if gain_db:
+            samples = samples * (10 ** (gain_db / 20))
+        view = self.window(start, end - start)
+        view += samples[: end - start]
+
+    def add_stream(self, chunks, position_ms: int = 0, gain_db: float = 0.0):
+        """Add a stream of chunks one after another from `position_ms` up to the end.
+
+        E.g. a BGM looped with decode_pcm(..., loop=True) is laid over the
+        whole track in place, one decoded chunk at a time.
+        """
+        position = int(self.sample_rate * position_ms / 1000)
+        for chunk in chunks:
+            if position >= self.frames:
+                break
+            self.add_frames(chunk, position, gain_db)
+            position += len(chunk)
+
+    def iter_chunks(self, chunk_frames: int = 65536):
+        """Yield writable views of the track, chunk_frames at a time."""
+        for start in range(0, self.frames, chunk_frames):
+            yield self.window(start, min(chunk_frames, self.frames - start))
+
+    def render(self, limiter: str = "soft") -> AudioSegment:
+        """Return the mix as an AudioSegment.
+
+        limiter: "soft" compresses peaks above -1 dBFS, "clip" hard-clips at 0 dBFS.
+        """
+        if limiter == "soft":
+            soft_limit(self.buffer)
+        return array_to_segment(self.buffer, self.sample_rate)
+
+    def export(self, output_path: str, limiter: str = "soft", chunk_frames: int = 65536):
+        """Stream the mix to `output_path` through one ffmpeg encode.
+
+        Unlike AudioSegment.export(), no temporary WAV copy of the whole
+        track is written; the format follows the file extension.
+        """
+        from audio_encoder import PCMEncoder
+
+        with PCMEncoder(output_path, self.sample_rate, self.channels) as encoder:
+            for chunk in self.iter_chunks(chunk_frames):
+                if limiter == "soft":
+                    soft_limit(chunk)
+                encoder.write(chunk)
+        return output_path
+
+    def close(self):
+        """Release the track (nothing to do for the in-memory buffer)."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+class PCMTimeline(NarrationMixer):
+    """NarrationMixer whose track is a memory-mapped raw float32 file.
+
+    The file starts sparse (silence takes no disk space) in `directory`;
+    put it on a disk rather than a tmpfs like /tmp, or the track ends up in
+    RAM after all. Every write and every exported chunk maps only its own
+    frames and unmaps them again, so peak memory is one segment or chunk.
+    close() deletes the file.
+    """
+
+    def __init__(self, duration_ms: int, sample_rate: int = 24000, channels: int = 1,
+                 directory: str = "."):
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.frames = int(sample_rate * duration_ms / 1000)
+        handle, self.path = tempfile.mkstemp(prefix="timeline_", suffix=".f32", dir=directory)
+        with os.fdopen(handle, "wb") as f:
+            f.truncate(self.frames * channels * 4)
+
+    def window(self, start: int, frames: int) -> np.ndarray:
+        """Writable view of frames [start, start + frames), mapped from the file."""
+        return np.memmap(self.path, dtype=np.float32, mode="r+", offset=start * self.channels * 4,
+                         shape=(frames, self.channels))
+
+    def render(self, limiter: str = "soft") -> AudioSegment:
+        """Return the mix as an AudioSegment (this loads the whole track into memory)."""
+        samples = np.fromfile(self.path, dtype=np.float32).reshape(-1, self.channels)
+        if limiter == "soft":
+            soft_limit(samples)
+        return array_to_segment(samples, self.sample_rate)
+
+    def close(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def create_mixer(duration_ms: int, sample_rate: int = 24000, channels: int = 1,
+                 max_memory_mb: float = None, directory: str = ".") -> NarrationMixer:
+    """A NarrationMixer, or a PCMTimeline if its buffer would exceed max_memory_mb."""
+    size = int(sample_rate * duration_ms / 1000) * channels * 4
+    if max_memory_mb is not None and size > max_memory_mb * 1024**2:
+        return PCMTimeline(duration_ms, sample_rate, channels, directory)
+    return NarrationMixer(duration_ms, sample_rate, channels)
+
+
+def mix_segments(placements: list, duration_ms: int, sample_rate: int = 24000,
+                 channels: int = 1, limiter: str = "soft") -> AudioSegment:
+    """Mix (start_seconds, AudioSegment) placements into one track."""
+    mixer = NarrationMixer(duration_ms, sample_rate, channels)
+    for start_time, segment in placements:
+        mixer.add(segment, int(start_time * 1000))
+    return mixer.render(limiter)
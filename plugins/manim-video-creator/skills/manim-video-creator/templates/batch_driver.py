@@ -0,0 +1,504 @@
+"""
+Batch Video Driver
+
+Produces many videos unattended from a directory of job manifests. Every
+job goes through four stages, each with its own worker pool, so while one
+job renders, others synthesize narration, finalize or upload:
+
+- tts:     narration_pipeline.py (narration.wav, timing manifest, timeline)
+- render:  render_variants.py render_variant(), one task per aspect ratio
+- mix:     render_variants.py finish_variants() (shared mix + finalize.py)
+- upload:  the youtube-uploader skill in service mode (--serve)
+
+Each task runs as a child process in the job's work directory
+(WORK_DIR/<job>/, log in logs/), so a failing scene only fails its own
+job and every task sees the files the earlier stages wrote there.
+
+Task status is saved atomically to STATE_PATH whenever a task starts or
+ends. Running the same command again after a crash, a reboot or failed
+tasks skips every finished task and runs the rest: a job killed while
+rendering its third aspect ratio renders only that one again. Finished
+tasks keep a fingerprint of their inputs, so editing a manifest reruns
+the stages it affects and the ones after them (a changed scene renders,
+mixes and uploads again, a new BGM mixes and uploads again). Uploads
+resume from the uploader's own state file and never upload a video twice.
+The upload metadata is not part of the fingerprint: it is only used for
+the first upload of each final video, and editing it afterwards changes
+nothing (edit uploaded videos in YouTube Studio).
+
+Job manifest (JOBS_DIR/<job>.json, paths relative to the manifest):
+{
+  "scene": "scenes/pythagoras.py",
+  "scene_class": "PythagorasScene",
+  "narrations": ["最初のナレーション。", "..."],
+  "voice": "ja-JP-NanamiNeural",          (optional, default VOICE)
+  "rate": "+0%",                          (optional, default RATE)
+  "tts_engine": "edge-tts",               (optional, default TTS_ENGINE)
+  "aspects": ["16_9", "9_16"],            (keys of VARIANTS in render_variants.py)
+  "bgm": "bgm.wav",                       (optional, null = narration only)
+  "upload": {"title": "...", "description": "...", "tags": ["manim"],
+             "category": 27, "privacy": "private", "playlist": null,
+             "publish_at": null,
+             "variants": {"9_16": {"title": "... #Shorts"}}}
+                                          (optional, null = do not upload)
+}
+
+Usage:
+1. Place narration_pipeline.py and render_variants.py with their helpers
+   (see those files) in the same directory
+2. Write one manifest per video into JOBS_DIR
+3. Run: uv run python batch_driver.py [--tts 2 --render 1 --mix 2 --upload 1]
+4. Run the same command again to resume after a crash or retry failures
+5. uv run python batch_driver.py --status
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime
+from pathlib import Path
+
+from render_variants import QUALITY, VARIANTS
+from stage_profiler import StageProfiler
+
+# ============================================================
+# CONFIGURATION - Modify these settings
+# ============================================================
+
+# Job manifests (*.json)
+JOBS_DIR = "jobs"
+
+# Work directory per job and the persisted job state
+WORK_DIR = ".batch"
+STATE_PATH = os.path.join(WORK_DIR, "state.json")
+
+# Concurrent tasks per stage. Rendering uses a CPU core per task (and
+# ffmpeg), TTS and uploads mostly wait on the network
+TTS_WORKERS = 2
+RENDER_WORKERS = 1
+MIX_WORKERS = 2
+UPLOAD_WORKERS = 1
+
+# Defaults for fields a manifest leaves out (see narration_pipeline.py)
+VOICE = "ja-JP-NanamiNeural"
+RATE = "+0%"
+TTS_ENGINE = "edge-tts"
+ASPECTS = ["16_9"]
+BGM_PATH = None
+ADD_ENDING = True
+
+# TTS segment cache shared by all jobs
+CACHE_DIR = ".tts_cache"
+
+# Uploader in service mode, run in the project directory (credentials.json,
+# upload state); {plugin_root} is ${CLAUDE_PLUGIN_ROOT}. None = no uploads
+UPLOAD_COMMAND = [
+    "python3", "{plugin_root}/skills/youtube-uploader/scripts/youtube_uploader.py",
+    "--serve", "--state", ".youtube_upload_state.json",
+]
+
+# Stage timings for `stage_profiler.py report`, one run per job (None = do not record)
+PROFILE_PATH = "pipeline_profile.jsonl"
+
+# ============================================================
+# IMPLEMENTATION - No need to modify below
+# ============================================================
+
+STAGES = ("tts", "render", "mix", "upload")
+
+
+class TaskError(Exception):
+    """A stage task exited with an error (details in its log)."""
+
+
+class JobState:
+    """Status of every task of every job, persisted to a JSON file.
+
+    The file is replaced atomically on every update, so a killed driver
+    leaves the last complete state; tasks it shows as running were
+    interrupted and run again.
+    """
+
+    def __init__(self, path: str = STATE_PATH):
+        self.path = path
+        self.lock = threading.Lock()
+        self.jobs = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self.jobs = json.load(f)
+
+    def get(self, job_id: str, task: str) -> dict:
+        with self.lock:
+            return dict(self.jobs.get(job_id, {}).get(task, {}))
+
+    def update(self, job_id: str, task: str, **fields):
+        with self.lock:
+            self.jobs.setdefault(job_id, {})[task] = fields
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(self.jobs, f, ensure_ascii=False, indent=2)
+            os.replace(temp_path, self.path)
+
+
+def task_name(stage: str, unit: str = None) -> str:
+    return stage if unit is None else f"{stage}:{unit}"
+
+
+def fingerprint(*parts) -> str:
+    data = json.dumps(parts, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(data).hexdigest()[:16]
+
+
+def file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def load_job(path: Path, work_dir: str = WORK_DIR) -> dict:
+    """Read a job manifest, resolve its paths and check it before anything runs."""
+    with open(path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    missing = [key for key in ("scene", "scene_class", "narrations") if not manifest.get(key)]
+    if missing:
+        raise ValueError(f"{path.name}: missing {', '.join(missing)}")
+
+    def resolve(file_path):
+        return str((path.parent / file_path).resolve()) if file_path else None
+
+    job = {
+        "id": path.stem,
+        "workdir": os.path.abspath(os.path.join(work_dir, path.stem)),
+        "scene": resolve(manifest["scene"]),
+        "scene_class": manifest["scene_class"],
+        "narrations": list(manifest["narrations"]),
+        "voice": manifest.get("voice", VOICE),
+        "rate": manifest.get("rate", RATE),
+        "tts_engine": manifest.get("tts_engine", TTS_ENGINE),
+        "aspects": list(manifest.get("aspects", ASPECTS)),
+        "quality": manifest.get("quality", QUALITY),
+        "bgm": resolve(manifest["bgm"]) if "bgm" in manifest else
+               (os.path.abspath(BGM_PATH) if BGM_PATH else None),
+        "add_ending": manifest.get("add_ending", ADD_ENDING),
+        "upload": manifest.get("upload"),
+        "cache_dir": os.path.abspath(CACHE_DIR),
+        "profile_path": os.path.abspath(PROFILE_PATH) if PROFILE_PATH else None,
+    }
+    unknown = [aspect for aspect in job["aspects"] if aspect not in VARIANTS]
+    if not job["aspects"] or unknown:
+        raise ValueError(f"{path.name}: aspects must be some of {', '.join(VARIANTS)}: {unknown}")
+    for file_path in (job["scene"], job["bgm"]):
+        if file_path and not os.path.exists(file_path):
+            raise FileNotFoundError(f"{path.name}: file not found: {file_path}")
+    if job["upload"] is not None and not job["upload"].get("title"):
+        raise ValueError(f"{path.name}: upload needs a title")
+    return job
+
+
+def load_jobs(jobs_dir: str = JOBS_DIR, work_dir: str = WORK_DIR) -> tuple:
+    """(jobs, {manifest name: error}) for every manifest in jobs_dir."""
+    jobs, errors = [], {}
+    for path in sorted(Path(jobs_dir).glob("*.json")):
+        try:
+            jobs.append(load_job(path, work_dir))
+        except (ValueError, FileNotFoundError, KeyError) as e:
+            errors[path.name] = str(e)
+    return jobs, errors
+
+
+def read_results(log_path: str) -> list:
+    """RESULT {json} lines a task printed (one per task, one per video for uploads)."""
+    with open(log_path, encoding="utf-8", errors="replace") as f:
+        return [json.loads(line[len("RESULT "):]) for line in f if line.startswith("RESULT ")]
+
+
+def last_line(log_path: str) -> str:
+    with open(log_path, encoding="utf-8", errors="replace") as f:
+        lines = [line.strip() for line in f if line.strip()]
+    return lines[-1] if lines else ""
+
+
+class BatchDriver:
+    """Runs the stages of many jobs in per-stage worker pools with resumable state."""
+
+    def __init__(self, jobs_dir: str = JOBS_DIR, work_dir: str = WORK_DIR,
+                 state_path: str = STATE_PATH, workers: dict = None,
+                 upload_command: list = UPLOAD_COMMAND):
+        """
+        Args:
+            workers: Concurrent tasks per stage, e.g. {"render": 2}; stages
+                left out use TTS_WORKERS / RENDER_WORKERS / ...
+            upload_command: Uploader in service mode (None = skip uploads)
+        """
+        self.jobs_dir = jobs_dir
+        self.work_dir = work_dir
+        self.state = JobState(state_path)
+        self.workers = {"tts": TTS_WORKERS, "render": RENDER_WORKERS,
+                        "mix": MIX_WORKERS, "upload": UPLOAD_WORKERS, **(workers or {})}
+        self.upload_command = upload_command
+        self.pools = {}
+        self.busy = {stage: [] for stage in STAGES}
+
+    def units(self, job: dict, stage: str) -> list:
+        """Task units of a stage: one render per aspect ratio, one task otherwise."""
+        if stage == "render":
+            return job["aspects"]
+        if stage == "upload" and (job["upload"] is None or self.upload_command is None):
+            return []
+        return [None]
+
+    def fingerprints(self, job: dict) -> dict:
+        """Task -> fingerprint of its inputs, including those of the stages before it."""
+        prints = {"tts": fingerprint(job["narrations"], job["voice"], job["rate"], job["tts_engine"])}
+        scene = file_digest(job["scene"])
+        for aspect in job["aspects"]:
+            prints[task_name("render", aspect)] = fingerprint(
+                prints["tts"], scene, job["scene_class"], job["quality"], aspect, VARIANTS[aspect])
+        renders = [prints[task_name("render", aspect)] for aspect in job["aspects"]]
+        bgm = file_digest(job["bgm"]) if job["bgm"] else None
+        prints["mix"] = fingerprint(renders, bgm, job["add_ending"])
+        # Not the upload metadata: the uploader returns the existing video for an
+        # unchanged file, so a new title would be marked done without taking effect
+        prints["upload"] = fingerprint(prints["mix"])
+        return prints
+
+    def task_command(self, job: dict, stage: str) -> tuple:
+        """(command, working directory) of a task; the task reads task_input() on stdin."""
+        if stage == "upload":
+            plugin_root = os.environ.get("CLAUDE_PLUGIN_ROOT", ".")
+            command = [arg.format(plugin_root=plugin_root) for arg in self.upload_command]
+            if job["profile_path"]:
+                command += ["--profile", job["profile_path"]]
+            return command, os.getcwd()
+        return [sys.executable, os.path.abspath(__file__), "--task", stage], job["workdir"]
+
+    def task_input(self, job: dict, stage: str, unit: str = None) -> str:
+        if stage == "upload":
+            # One service-mode job: a list of manifest entries, one per variant
+            outputs = self.state.get(job["id"], "mix")["result"]["outputs"]
+            overrides = job["upload"].get("variants", {})
+            metadata = {key: value for key, value in job["upload"].items() if key != "variants"}
+            entries = [{**metadata, **overrides.get(variant, {}), "file": path}
+                       for variant, path in outputs.items()]
+            return json.dumps(entries, ensure_ascii=False) + "\n"
+        payload = {"job": job, "unit": unit}
+        if stage == "mix":
+            payload["renders"] = [
+                {"variant": aspect,
+                 "movie": self.state.get(job["id"], task_name("render", aspect))["result"]["movie"]}
+                for aspect in job["aspects"]
+            ]
+        return json.dumps(payload, ensure_ascii=False)
+
+    def execute(self, job: dict, stage: str, unit: str, log_path: str) -> dict:
+        """Run one task in a child process, logging to log_path; return its result."""
+        command, cwd = self.task_command(job, stage)
+        # The job ID is the profiler's run ID, so every stage of a video is reported together
+        env = {**os.environ, "PIPELINE_RUN_ID": job["id"], "PYTHONIOENCODING": "utf-8"}
+        with open(log_path, "w", encoding="utf-8") as log:
+            process = subprocess.run(command, cwd=cwd, input=self.task_input(job, stage, unit),
+                                     stdout=log, stderr=subprocess.STDOUT, text=True, env=env)
+
+        results = read_results(log_path)
+        errors = [result["error"] for result in results if "error" in result]
+        if process.returncode or errors or not results:
+            raise TaskError(errors[0] if errors else last_line(log_path) or f"exit code {process.returncode}")
+        if stage == "upload":
+            return {"videos": {result["file"]: result["video_id"] for result in results}}
+        return results[-1]
+
+    def run_task(self, job: dict, stage: str, unit: str, task_print: str):
+        task = task_name(stage, unit)
+        log_path = os.path.join(job["workdir"], "logs", task.replace(":", "_") + ".log")
+        started = datetime.now().isoformat(timespec="seconds")
+        self.state.update(job["id"], task, status="running", started=started)
+        start = time.perf_counter()
+        try:
+            result = self.execute(job, stage, unit, log_path)
+        except Exception as e:
+            seconds = round(time.perf_counter() - start, 3)
+            self.state.update(job["id"], task, status="failed", started=started,
+                              seconds=seconds, error=str(e), log=log_path)
+            print(f"[{job['id']}] {task} failed after {seconds:.1f}s: {e}")
+            raise
+        finally:
+            self.busy[stage].append(time.perf_counter() - start)
+
+        seconds = round(time.perf_counter() - start, 3)
+        self.state.update(job["id"], task, status="done", started=started, seconds=seconds,
+                          fingerprint=task_print, result=result)
+        print(f"[{job['id']}] {task} done ({seconds:.1f}s)")
+
+    def run_job(self, job: dict) -> bool:
+        """Run the unfinished tasks of a job stage by stage; False if a task failed."""
+        os.makedirs(os.path.join(job["workdir"], "logs"), exist_ok=True)
+        # finalize.py looks for the project's endings/ in the working directory
+        endings = os.path.abspath("endings")
+        if os.path.isdir(endings) and not os.path.exists(os.path.join(job["workdir"], "endings")):
+            os.symlink(endings, os.path.join(job["workdir"], "endings"))
+
+        prints = self.fingerprints(job)
+        for stage in STAGES:
+            pending = []
+            for unit in self.units(job, stage):
+                task = task_name(stage, unit)
+                saved = self.state.get(job["id"], task)
+                if saved.get("status") != "done" or saved.get("fingerprint") != prints[task]:
+                    pending.append(unit)
+            futures = [self.pools[stage].submit(self.run_task, job, stage, unit,
+                                                prints[task_name(stage, unit)])
+                       for unit in pending]
+            # Let the other units of the stage finish (and be saved) even if one fails
+            wait(futures)
+            if any(future.exception() for future in futures):
+                return False
+        return True
+
+    def run(self) -> dict:
+        """Run every job in JOBS_DIR; return job ID -> True (finished) / False (failed)."""
+        start = time.perf_counter()
+        jobs, errors = load_jobs(self.jobs_dir, self.work_dir)
+        for name, error in errors.items():
+            print(f"Skipping {name}: {error}")
+        print(f"Running {len(jobs)} jobs with "
+              + ", ".join(f"{self.workers[stage]} {stage}" for stage in STAGES) + " workers")
+
+        self.pools = {stage: ThreadPoolExecutor(self.workers[stage], thread_name_prefix=stage)
+                      for stage in STAGES}
+        try:
+            # One coordinating thread per job; the pools bound the real work
+            with ThreadPoolExecutor(max(len(jobs), 1), thread_name_prefix="job") as coordinators:
+                futures = {job["id"]: coordinators.submit(self.run_job, job) for job in jobs}
+                outcome = {job_id: future.result() for job_id, future in futures.items()}
+        finally:
+            for pool in self.pools.values():
+                pool.shutdown()
+        outcome.update({Path(name).stem: False for name in errors})
+
+        failed = [job_id for job_id, finished in outcome.items() if not finished]
+        print(f"\nBatch finished in {time.perf_counter() - start:.1f}s: "
+              f"{len(outcome) - len(failed)}/{len(outcome)} jobs done"
+              + (f", {len(failed)} failed (run again to retry)" if failed else ""))
+        for stage in STAGES:
+            if self.busy[stage]:
+                print(f"  {stage:<7} {len(self.busy[stage]):4d} tasks  {sum(self.busy[stage]):8.1f}s busy")
+        return outcome
+
+
+def print_status(state_path: str = STATE_PATH):
+    """Print the saved status of every job's stages."""
+    state = JobState(state_path)
+    print(f"{'job':<24} " + " ".join(f"{stage:<10}" for stage in STAGES))
+    for job_id, tasks in state.jobs.items():
+        cells, errors = [], []
+        for stage in STAGES:
+            entries = [entry for task, entry in tasks.items() if task.split(":")[0] == stage]
+            done = sum(entry["status"] == "done" for entry in entries)
+            if any(entry["status"] == "failed" for entry in entries):
+                cells.append("failed")
+            elif any(entry["status"] == "running" for entry in entries):
+                cells.append("interrupted")
+            elif len(entries) > 1:
+                cells.append(f"{done}/{len(entries)} done")
+            else:
+                cells.append("done" if done else "-")
+            errors += [f"{task}: {entry['error']}" for task, entry in tasks.items()
+                       if task.split(":")[0] == stage and entry["status"] == "failed"]
+        print(f"{job_id:<24} " + " ".join(f"{cell:<10}" for cell in cells))
+        for error in errors:
+            print(f"{'':<24}   {error}")
+
+
+# Task bodies, run in the child process (cwd = the job's work directory).
+# The templates are configured through their module constants.
+
+
+def tts_task(job: dict, payload: dict) -> dict:
+    import narration_pipeline as pipeline
+
+    pipeline.NARRATIONS = job["narrations"]
+    pipeline.VOICE = job["voice"]
+    pipeline.RATE = job["rate"]
+    pipeline.TTS_ENGINE = job["tts_engine"]
+    pipeline.CACHE_DIR = job["cache_dir"]
+    pipeline.PROFILE_PATH = job["profile_path"]
+    manifest = asyncio.run(pipeline.main())
+    return {"duration": manifest["total_duration"]}
+
+
+def render_task(job: dict, payload: dict) -> dict:
+    from render_variants import render_variant
+
+    aspect = payload["unit"]
+    spec = VARIANTS[aspect]
+    with StageProfiler(job["profile_path"]).stage("render", variant=aspect):
+        render = render_variant(job["scene"], job["scene_class"], aspect,
+                                spec["resolution"], spec["layout"], job["quality"])
+    return {"movie": os.path.abspath(render["movie"]), "seconds": render["seconds"]}
+
+
+def mix_task(job: dict, payload: dict) -> dict:
+    import finalize
+    import render_variants
+
+    render_variants.BGM_PATH = job["bgm"]
+    render_variants.ADD_ENDING = job["add_ending"]
+    finalize.PROFILE_PATH = job["profile_path"]
+    outputs = render_variants.finish_variants(payload["renders"])
+    return {"outputs": {variant: os.path.abspath(path) for variant, path in outputs.items()}}
+
+
+TASKS = {"tts": tts_task, "render": render_task, "mix": mix_task}
+
+
+def run_child_task(stage: str):
+    """Run one task: payload (task_input()) on stdin, RESULT line on stdout."""
+    payload = json.load(sys.stdin)
+    result = TASKS[stage](payload["job"], payload)
+    print("RESULT " + json.dumps(result, ensure_ascii=False), flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Produce videos from a directory of job manifests")
+    parser.add_argument("--jobs", default=JOBS_DIR, help=f"Job manifest directory (default: {JOBS_DIR})")
+    parser.add_argument("--tts", type=int, default=TTS_WORKERS,
+                        help=f"Concurrent TTS tasks (default: {TTS_WORKERS})")
+    parser.add_argument("--render", type=int, default=RENDER_WORKERS,
+                        help=f"Concurrent renders (default: {RENDER_WORKERS})")
+    parser.add_argument("--mix", type=int, default=MIX_WORKERS,
+                        help=f"Concurrent mix / finalize tasks (default: {MIX_WORKERS})")
+    parser.add_argument("--upload", type=int, default=UPLOAD_WORKERS,
+                        help=f"Concurrent uploads (default: {UPLOAD_WORKERS})")
+    parser.add_argument("--no-upload", action="store_true", help="Stop after the mix stage")
+    parser.add_argument("--status", action="store_true", help="Show the saved job state and exit")
+    parser.add_argument("--task", choices=sorted(TASKS), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.task:
+        run_child_task(args.task)
+        return 0
+    if args.status:
+        print_status()
+        return 0
+
+    driver = BatchDriver(
+        args.jobs,
+        workers={"tts": args.tts, "render": args.render, "mix": args.mix, "upload": args.upload},
+        upload_command=None if args.no_upload else UPLOAD_COMMAND,
+    )
+    outcome = driver.run()
+    return 0 if all(outcome.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,353 @@
+"""
+Frame-Sampling Layout Checker
+
+Finds text and objects that are cut off at the frame edge or overlap each
+other, without rendering the video. The scene is run with animations
+skipped (nothing is drawn or encoded) and the layout is sampled at the last
+frame of every play(): the bounding box of each visible mobject is compared
+with the frame for 16:9 (YouTube), 9:16 (Shorts) and 1:1 (Instagram), one
+process per aspect ratio. It takes seconds even for long scenes, so it can
+run after every edit.
+
+Reported problems:
+- OFFSCREEN  an element extends past the frame edge
+- OVERLAP    two texts overlap, or a text partly overlaps a shape
+             (a label fully inside a shape is fine)
+- MARGIN     an element lies within SAFE_MARGIN of the edge (warning only)
+
+Groups (VGroup / Group) are checked element by element. Backgrounds that
+cover most of the frame are ignored. Layout adapters for 9:16 and 1:1
+(see render_variants.py) are applied when the scene file defines them.
+
+With --frames DIR, the last frame of each play that shows a new problem is
+drawn at preview resolution and saved as a PNG with the offending elements
+outlined in red and the safe area in gray.
+
+Usage:
+    uv run python check_layout.py scene.py [SceneClass]
+    uv run python check_layout.py scene.py MyScene --aspect 9_16 --frames layout_frames --json
+
+Exits with status 1 if any OFFSCREEN or OVERLAP problem is found.
+"""
+
+import argparse
+import ast
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from analyze_timing import find_scene
+
+# ============================================================
+# CONFIGURATION - Modify these settings
+# ============================================================
+
+# Aspect ratios to check, named like the endings/ subdirectories
+ASPECTS = {"16_9": (16, 9), "9_16": (9, 16), "1_1": (1, 1)}
+
+# Layout adapter per aspect ratio (functions in the scene file, as in
+# render_variants.py); aspects without one are checked as written
+LAYOUTS = {"16_9": None, "9_16": "vertical_layout", "1_1": "square_layout"}
+
+# Distance from the frame edge that counts as outside the safe area (Manim units)
+SAFE_MARGIN = 0.25
+
+# Overlap that counts as a problem (fraction of the smaller element's box)
+OVERLAP_RATIO = 0.1
+
+# Elements covering this fraction of the frame are treated as backgrounds
+BACKGROUND_COVERAGE = 0.8
+
+# Longer side of the sampled PNG frames (pixels)
+PREVIEW_SIZE = 640
+
+# ============================================================
+# IMPLEMENTATION - No need to modify below
+# ============================================================
+
+EDGE_TOLERANCE = 0.01
+
+
+def box_area(box) -> float:
+    return max(0.0, box[2] - box[0]) * max(0.0, box[3] - box[1])
+
+
+def intersection(a, b):
+    box = (max(a[0], b[0]), max(a[1], b[1]), min(a[2], b[2]), min(a[3], b[3]))
+    return box if box[0] < box[2] and box[1] < box[3] else None
+
+
+def contains(outer, inner) -> bool:
+    return (outer[0] <= inner[0] + EDGE_TOLERANCE and outer[1] <= inner[1] + EDGE_TOLERANCE
+            and outer[2] >= inner[2] - EDGE_TOLERANCE and outer[3] >= inner[3] - EDGE_TOLERANCE)
+
+
+def edge_overflow(box, frame) -> dict:
+    """How far the box extends past each frame edge (positive = outside)."""
+    return {
+        "left": frame[0] - box[0],
+        "bottom": frame[1] - box[1],
+        "right": box[2] - frame[2],
+        "top": box[3] - frame[3],
+    }
+
+
+def frame_issues(items: list, frame) -> list:
+    """Problems of one sampled frame; items are (label, box, is_text)."""
+    frame_area = box_area(frame)
+    checked = []
+    for label, box, is_text in items:
+        inside = intersection(box, frame)
+        if inside and box_area(inside) >= BACKGROUND_COVERAGE * frame_area:
+            continue
+        checked.append((label, box, is_text))
+
+    issues = []
+    for label, box, _ in checked:
+        overflow = edge_overflow(box, frame)
+        worst = max(overflow.values())
+        if worst > -SAFE_MARGIN:
+            sides = [side for side, value in overflow.items() if value > -SAFE_MARGIN]
+            issues.append({
+                "kind": "OFFSCREEN" if worst > EDGE_TOLERANCE else "MARGIN",
+                "objects": [label],
+                "detail": ", ".join(f"{side} {overflow[side]:+.2f}" for side in sides),
+                "boxes": [box],
+            })
+
+    for i, (label_a, box_a, text_a) in enumerate(checked):
+        for label_b, box_b, text_b in checked[i + 1:]:
+            if not (text_a or text_b):
+                continue
+            overlap = intersection(box_a, box_b)
+            smaller = min(box_area(box_a), box_area(box_b))
+            if overlap is None or smaller <= 0:
+                continue
+            ratio = box_area(overlap) / smaller
+            if ratio < OVERLAP_RATIO:
+                continue
+            # A label inside a shape (or a shape inside a text box) is intended
+            if not (text_a and text_b) and (contains(box_a, box_b) or contains(box_b, box_a)):
+                continue
+            issues.append({
+                "kind": "OVERLAP",
+                "objects": [label_a, label_b],
+                "detail": f"{ratio:.0%} of the smaller box",
+                "boxes": [box_a, box_b],
+            })
+    return issues
+
+
+def check_aspect(scene_file: str, scene_class: str, aspect: str, frames_dir: str = None) -> dict:
+    """Run the scene with animations skipped at one aspect ratio and sample every play()."""
+    from manim import (DecimalNumber, Group, MarkupText, Mobject, Paragraph,
+                       SingleStringMathTex, Text, VGroup, VMobject, Wait, config)
+
+    from render_sections import load_scene_class
+
+    width, height = ASPECTS[aspect]
+    scale = PREVIEW_SIZE / max(width, height)
+    config.pixel_width = round(width * scale)
+    config.pixel_height = round(height * scale)
+    config.frame_width = config.frame_height * width / height
+    config.input_file = scene_file
+    config.media_dir = tempfile.mkdtemp(prefix="layout_")
+    config.disable_caching = True
+    config.write_to_movie = False
+    config.save_last_frame = False
+    config.progress_bar = "none"
+    config.verbosity = "WARNING"
+
+    text_types = (Text, MarkupText, Paragraph, SingleStringMathTex, DecimalNumber)
+
+    def visible(mob) -> bool:
+        if not len(mob.points):
+            return False
+        if isinstance(mob, VMobject):
+            return (mob.fill_rgbas[:, 3].max(initial=0) > 0
+                    or (mob.get_stroke_width() > 0 and mob.stroke_rgbas[:, 3].max(initial=0) > 0))
+        return True
+
+    def bounding_box(mob):
+        points = [sub.points for sub in mob.get_family() if visible(sub)]
+        if not points:
+            return None
+        xs = [p[:, 0] for p in points]
+        ys = [p[:, 1] for p in points]
+        return (min(x.min() for x in xs), min(y.min() for y in ys),
+                max(x.max() for x in xs), max(y.max() for y in ys))
+
+    def layout_elements(mobjects):
+        for mob in mobjects:
+            if type(mob) in (VGroup, Group):
+                yield from layout_elements(mob.submobjects)
+            else:
+                yield mob
+
+    def describe(mob, names: dict) -> str:
+        text = getattr(mob, "text", None) or getattr(mob, "tex_string", None)
+        label = type(mob).__name__
+        if isinstance(text, str) and text:
+            label += f'("{text[:24]}")'
+        name = names.get(id(mob))
+        return f"self.{name} {label}" if name else label
+
+    samples = []
+    issues = {}
+    base = load_scene_class(scene_file, scene_class)
+    adapter = getattr(sys.modules[base.__module__], LAYOUTS.get(aspect) or "", None)
+
+    class SampledScene(base):
+        def setup(self):
+            super().setup()
+            if adapter is not None:
+                adapter(self)
+
+        def play(self, *args, **kwargs):
+            super().play(*args, **kwargs)
+            self.sample_time = getattr(self, "sample_time", 0.0) + self.duration
+            if all(isinstance(animation, Wait) for animation in args):
+                return
+            self.sample_layout()
+
+        def sample_layout(self):
+            camera = self.camera
+            center_x, center_y = camera.frame_center[0], camera.frame_center[1]
+            frame = (center_x - camera.frame_width / 2, center_y - camera.frame_height / 2,
+                     center_x + camera.frame_width / 2, center_y + camera.frame_height / 2)
+            names = {id(value): name for name, value in vars(self).items() if isinstance(value, Mobject)}
+            items = []
+            for mob in layout_elements(self.mobjects):
+                box = bounding_box(mob)
+                if box is not None:
+                    items.append((describe(mob, names), box, isinstance(mob, text_types)))
+
+            play = len(samples) + 1
+            samples.append(round(self.sample_time, 3))
+            new = []
+            for issue in frame_issues(items, frame):
+                key = (issue["kind"], tuple(issue["objects"]))
+                if key in issues:
+                    issues[key]["plays"] += 1
+                    continue
+                issues[key] = {
+                    "kind": issue["kind"], "objects": issue["objects"], "detail": issue["detail"],
+                    "play": play, "time": round(self.sample_time, 3), "plays": 1,
+                }
+                new.append((key, issue))
+            if frames_dir and any(issue["kind"] != "MARGIN" for _, issue in new):
+                path = self.save_frame(play, frame, [issue for _, issue in new])
+                for key, _ in new:
+                    issues[key]["frame"] = path
+
+        def save_frame(self, play: int, frame, new_issues: list) -> str:
+            from PIL import Image, ImageDraw
+
+            self.renderer.update_frame(self)
+            image = Image.fromarray(self.renderer.get_frame()).convert("RGB")
+            draw = ImageDraw.Draw(image)
+            px = image.width / (frame[2] - frame[0])
+            py = image.height / (frame[3] - frame[1])
+
+            def pixels(box):
+                return ((box[0] - frame[0]) * px, (frame[3] - box[3]) * py,
+                        (box[2] - frame[0]) * px, (frame[3] - box[1]) * py)
+
+            safe = (frame[0] + SAFE_MARGIN, frame[1] + SAFE_MARGIN,
+                    frame[2] - SAFE_MARGIN, frame[3] - SAFE_MARGIN)
+            draw.rectangle(pixels(safe), outline=(128, 128, 128))
+            for issue in new_issues:
+                for box in issue["boxes"]:
+                    draw.rectangle(pixels(box), outline=(255, 0, 0), width=2)
+            os.makedirs(frames_dir, exist_ok=True)
+            path = os.path.join(frames_dir, f"{aspect}_play{play:04d}.png")
+            image.save(path)
+            return path
+
+    kwargs = {"skip_animations": True}
+    if hasattr(base, "section_names"):
+        # SectionScene: run every section skipped, without the timing pre-pass
+        kwargs["section"] = len(base.section_names())
+    scene = SampledScene(**kwargs)
+    timing_error = None
+    try:
+        scene.render()
+    except RuntimeError as error:
+        # SectionScene overruns are reported by analyze_timing.py; the layout is still sampled
+        if not getattr(scene, "overruns", None):
+            raise
+        timing_error = str(error)
+
+    return {
+        "aspect": aspect,
+        "frame": [round(config.frame_width, 3), round(config.frame_height, 3)],
+        "plays": len(samples),
+        "issues": sorted(issues.values(), key=lambda issue: issue["play"]),
+        "timing_error": timing_error,
+    }
+
+
+def check_layout(scene_file: str, scene_class: str = None, aspects: list = None,
+                 frames_dir: str = None) -> dict:
+    """Check every aspect ratio in its own process; return the report."""
+    with open(scene_file, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=scene_file)
+    scene_class = find_scene(tree, scene_class).name
+    aspects = aspects or list(ASPECTS)
+
+    # spawn: each worker sets its own Manim config before importing the scene
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=min(len(aspects), os.cpu_count() or 1),
+                             mp_context=context) as pool:
+        futures = [pool.submit(check_aspect, scene_file, scene_class, aspect, frames_dir)
+                   for aspect in aspects]
+        results = [future.result() for future in futures]
+    return {"scene": scene_class, "aspects": results}
+
+
+def print_report(report: dict, elapsed: float):
+    print(f"Scene: {report['scene']}")
+    for result in report["aspects"]:
+        problems = [issue for issue in result["issues"] if issue["kind"] != "MARGIN"]
+        width, height = result["frame"]
+        status = f"{len(problems)} problems" if problems else "OK"
+        print(f"\n{result['aspect'].replace('_', ':'):>5}  frame {width:.2f} x {height:.2f}, "
+              f"{result['plays']} plays sampled: {status}")
+        for issue in result["issues"]:
+            repeat = f" (x{issue['plays']})" if issue["plays"] > 1 else ""
+            print(f"  {issue['kind']:<9} play {issue['play']:>4} @ {issue['time']:7.2f}s{repeat}  "
+                  f"{' / '.join(issue['objects'])}  [{issue['detail']}]")
+            if "frame" in issue:
+                print(f"  {'':<9} frame: {issue['frame']}")
+        if result["timing_error"]:
+            print("  note: the scene overruns its narration (see analyze_timing.py)")
+    print(f"\nChecked in {elapsed:.1f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check safe-area overflow and overlaps without rendering")
+    parser.add_argument("scene_file", help="Scene file (e.g. scene.py)")
+    parser.add_argument("scene_class", nargs="?", help="Scene class (default: first scene in the file)")
+    parser.add_argument("--aspect", action="append", choices=list(ASPECTS),
+                        help="Aspect ratio to check (repeatable, default: all)")
+    parser.add_argument("--frames", metavar="DIR", help="Save the sampled frame of each new problem as PNG")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    report = check_layout(args.scene_file, args.scene_class, args.aspect, args.frames)
+    elapsed = time.perf_counter() - start
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        print_report(report, elapsed)
+    sys.exit(1 if any(issue["kind"] != "MARGIN" for result in report["aspects"]
+                      for issue in result["issues"]) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Final Audio Mix and Video Mux Template
+
+Mixes the narration with (looped) BGM and muxes the result with the
+rendered video. Both tracks are decoded, mixed and piped chunk by chunk
+into a single ffmpeg process that copies the video stream and encodes the
+audio once to AAC, so there is no intermediate combined_audio.mp3, no extra
+lossy generation and peak memory does not depend on video length.
+
+With the narration timeline written by generate_audio.py /
+narration_pipeline.py, the BGM is set relative to the measured narration
+loudness and ducked under the narration (louder in the pauses); the gain
+curve is computed once from the timeline by loudness.py.
+
+Usage:
+1. Place audio_encoder.py, loudness.py and stage_profiler.py in the same directory
+2. Set VIDEO_PATH / NARRATION_PATH / BGM_PATH below
+3. Run: uv run python combine_final.py
+"""
+
+import numpy as np
+
+from audio_encoder import PCMEncoder, decode_pcm, probe_duration
+from loudness import ENVELOPE_RATE, bgm_envelope
+from stage_profiler import StageProfiler
+
+# ============================================================
+# CONFIGURATION - Modify these settings
+# ============================================================
+
+VIDEO_PATH = "media/videos/scene/1080p60/MyScene.mp4"
+NARRATION_PATH = "narration.wav"
+
+# Set to None for narration only
+BGM_PATH = "bgm.wav"
+
+# BGM volume relative to narration (-18dB recommended). With a narration
+# timeline this is the BGM loudness below the narration's (LU), otherwise a gain
+BGM_VOLUME_DB = -18
+
+# BGM fades (ms)
+BGM_FADE_IN_MS = 3000
+BGM_FADE_OUT_MS = 4000
+
+# Ducking: the BGM rises by BGM_DUCKING_DB in the pauses of the narration
+# timeline, ramping up/down over the release/attack times (0 = flat level)
+TIMELINE_PATH = "narration_timeline.json"
+BGM_DUCKING_DB = 6
+BGM_DUCK_ATTACK_MS = 300
+BGM_DUCK_RELEASE_MS = 800
+
+# Output audio format
+SAMPLE_RATE = 48000
+CHANNELS = 2
+
+OUTPUT_PATH = "final_output.mp4"
+
+# Stage timings for `stage_profiler.py report` (None = do not record)
+PROFILE_PATH = "pipeline_profile.jsonl"
+
+# ============================================================
+# IMPLEMENTATION - No need to modify below
+# ============================================================
+
+CHUNK_FRAMES = 65536
+
+
+def gain_envelope(duration: float, bgm_path: str) -> np.ndarray:
+    """BGM gain (volume, ducking, fades) at ENVELOPE_RATE over `duration` seconds."""
+    return bgm_envelope(duration, bgm_path, BGM_VOLUME_DB, BGM_FADE_IN_MS / 1000,
+                        BGM_FADE_OUT_MS / 1000, TIMELINE_PATH, BGM_DUCKING_DB,
+                        BGM_DUCK_ATTACK_MS / 1000, BGM_DUCK_RELEASE_MS / 1000)
+
+
+def bgm_gain(start: int, frames: int, envelope: np.ndarray) -> np.ndarray:
+    """BGM gain for frames [start, start + frames), interpolated from the envelope."""
+    times = np.arange(start, start + frames) / SAMPLE_RATE
+    envelope_times = np.arange(len(envelope)) / ENVELOPE_RATE
+    return np.interp(times, envelope_times, envelope).astype(np.float32)[:, None]
+
+
+def iter_mixed_chunks(narration_path: str, bgm_path: str = None):
+    """Yield narration + BGM chunks; BGM loops to the narration length."""
+    narration = decode_pcm(narration_path, SAMPLE_RATE, CHANNELS, CHUNK_FRAMES)
+    if bgm_path is None:
+        yield from narration
+        return
+
+    envelope = gain_envelope(probe_duration(narration_path), bgm_path)
+    bgm = decode_pcm(bgm_path, SAMPLE_RATE, CHANNELS, CHUNK_FRAMES, loop=True)
+    pending = np.zeros((0, CHANNELS), dtype=np.float32)
+    position = 0
+    try:
+        for chunk in narration:
+            # Pull enough looped BGM to cover this narration chunk
+            while len(pending) < len(chunk):
+                pending = np.concatenate([pending, next(bgm)])
+            background, pending = pending[: len(chunk)], pending[len(chunk):]
+
+            yield chunk + background * bgm_gain(position, len(chunk), envelope)
+            position += len(chunk)
+    finally:
+        bgm.close()
+
+
+def combine_audio_and_video(video_path: str = VIDEO_PATH,
+                            narration_path: str = NARRATION_PATH,
+                            bgm_path: str = BGM_PATH,
+                            output_path: str = OUTPUT_PATH) -> str:
+    """Mix narration and BGM and mux them with the video in one ffmpeg pass."""
+    print("Mixing audio and muxing with video...")
+
+    with StageProfiler(PROFILE_PATH).stage("combine", output=output_path):
+        with PCMEncoder(output_path, SAMPLE_RATE, CHANNELS, video_path=video_path) as encoder:
+            for chunk in iter_mixed_chunks(narration_path, bgm_path):
+                encoder.write(chunk)
+
+    print(f"Done: {output_path}")
+    return output_path
+
+
+if __name__ == "__main__":
+    combine_audio_and_video()
@@ -0,0 +1,172 @@
+"""
+Pre-Normalized Ending Clip Cache
+
+Shared helper used by finalize.py. Copy it next to the other templates in
+your project directory.
+
+`ffmpeg -f concat ... -c copy` only works when the ending clip has the same
+codec, resolution, frame rate and pixel format as the main render. This
+cache transcodes an ending to the main render's profile the first time it
+is needed and stores it under ENDING_CACHE_DIR, keyed by (ending file hash,
+width, height, fps, codec, pixel format, timescale). Later runs reuse the
+stored clip, so joining the ending is always a stream copy.
+
+Safe to call from several threads (render_variants.py finalizes variants in
+parallel): the same entry is transcoded once while other threads wait for it.
+"""
+
+import hashlib
+import json
+import os
+import subprocess
+import threading
+
+ENDING_CACHE_DIR = ".ending_cache"
+
+# Encoder used to reproduce each source codec
+VIDEO_ENCODERS = {
+    "h264": ["-c:v", "libx264", "-preset", "medium", "-crf", "18"],
+    "hevc": ["-c:v", "libx265", "-preset", "medium", "-crf", "20", "-tag:v", "hvc1"],
+    "vp9": ["-c:v", "libvpx-vp9", "-crf", "30", "-b:v", "0"],
+    "prores": ["-c:v", "prores_ks"],
+}
+
+# Audio layout produced by combine_final.py / finalize.py
+AUDIO_ARGS = ["-c:a", "aac", "-b:a", "192k", "-ar", "48000", "-ac", "2"]
+
+# Lookups of normalized_ending() in this process (reported by stage_profiler.py)
+CACHE_STATS = {"hits": 0, "misses": 0}
+
+# Guards CACHE_STATS and ENTRY_LOCKS; each cache entry is filled under its own lock
+STATS_LOCK = threading.Lock()
+ENTRY_LOCKS = {}
+
+
+def probe_video(video_path: str) -> dict:
+    """Return codec, size, fps, pixel format and timescale of the first video stream."""
+    result = subprocess.run([
+        "ffprobe", "-v", "error",
+        "-select_streams", "v:0",
+        "-show_entries", "stream=codec_name,width,height,r_frame_rate,pix_fmt,time_base",
+        "-of", "default=noprint_wrappers=1",
+        video_path,
+    ], capture_output=True, text=True, check=True)
+    fields = dict(line.split("=", 1) for line in result.stdout.split())
+    num, den = fields["r_frame_rate"].split("/")
+    return {
+        "codec": fields["codec_name"],
+        "width": int(fields["width"]),
+        "height": int(fields["height"]),
+        "fps": int(num) / int(den),
+        "pix_fmt": fields["pix_fmt"],
+        "timescale": int(fields["time_base"].split("/")[1]),
+    }
+
+
+def has_audio(path: str) -> bool:
+    result = subprocess.run([
+        "ffprobe", "-v", "error",
+        "-select_streams", "a:0",
+        "-show_entries", "stream=codec_name",
+        "-of", "csv=p=0",
+        path,
+    ], capture_output=True, text=True)
+    return bool(result.stdout.strip())
+
+
+def profiles_match(main: dict, ending: dict) -> bool:
+    """True if the two video streams can be joined without re-encoding.
+
+    The track timescale must match too: the concat demuxer copies timestamps
+    as they are, so a different timescale breaks them at the join.
+    """
+    keys = ("codec", "width", "height", "pix_fmt")
+    return (all(main[k] == ending[k] for k in keys)
+            and abs(main["fps"] - ending["fps"]) < 0.01
+            and main.get("timescale") == ending.get("timescale"))
+
+
+def file_hash(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def cache_key(ending_path: str, profile: dict) -> str:
+    identity = {
+        "ending": file_hash(ending_path),
+        "codec": profile["codec"],
+        "width": profile["width"],
+        "height": profile["height"],
+        "fps": round(profile["fps"], 3),
+        "pix_fmt": profile["pix_fmt"],
+        "timescale": profile.get("timescale"),
+    }
+    return hashlib.sha256(json.dumps(identity, sort_keys=True).encode()).hexdigest()[:32]
+
+
+def transcode_ending(ending_path: str, profile: dict, output_path: str):
+    """Re-encode the ending to match `profile` (letterboxed if the aspect differs)."""
+    if profile["codec"] not in VIDEO_ENCODERS:
+        raise ValueError(f"Unsupported codec for ending normalization: {profile['codec']}")
+
+    width, height = profile["width"], profile["height"]
+    video_filter = (
+        f"scale={width}:{height}:force_original_aspect_ratio=decrease,"
+        f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2,"
+        f"fps={profile['fps']:g},setsar=1,format={profile['pix_fmt']}"
+    )
+    cmd = ["ffmpeg", "-hide_banner", "-loglevel", "error", "-y", "-i", ending_path]
+    if has_audio(ending_path):
+        audio_map = ["-map", "0:a:0"]
+    else:
+        # Add a silent track so every cached ending has the same stream layout
+        cmd += ["-f", "lavfi", "-i", "anullsrc=r=48000:cl=stereo"]
+        audio_map = ["-map", "1:a:0", "-shortest"]
+    cmd += ["-map", "0:v:0", *audio_map, "-vf", video_filter, *VIDEO_ENCODERS[profile["codec"]]]
+    if profile.get("timescale"):
+        cmd += ["-video_track_timescale", str(profile["timescale"])]
+    subprocess.run(cmd + AUDIO_ARGS + [output_path], check=True)
+
+
+def count_lookup(result: str, stats: dict = None):
+    with STATS_LOCK:
+        CACHE_STATS[result] += 1
+        if stats is not None:
+            stats[result] += 1
+
+
+def normalized_ending(ending_path: str, profile: dict,
+                      cache_dir: str = ENDING_CACHE_DIR, stats: dict = None) -> str:
+    """Return an ending clip matching `profile`, transcoding it once if needed.
+
+    If the ending already matches, it is returned unchanged. The lookup is
+    counted in CACHE_STATS and, if given, in `stats` (this call only).
+    """
+    if profiles_match(profile, probe_video(ending_path)):
+        return ending_path
+
+    os.makedirs(cache_dir, exist_ok=True)
+    cached_path = os.path.join(cache_dir, f"{cache_key(ending_path, profile)}.mp4")
+    with STATS_LOCK:
+        entry_lock = ENTRY_LOCKS.setdefault(cached_path, threading.Lock())
+    with entry_lock:
+        if os.path.exists(cached_path):
+            count_lookup("hits", stats)
+            print(f"キャッシュ済みのエンディング動画を使用: {cached_path}")
+            return cached_path
+
+        count_lookup("misses", stats)
+
+        print(f"エンディング動画をメイン動画の形式に変換中 "
+              f"({profile['width']}x{profile['height']} {profile['fps']:g}fps {profile['codec']})...")
+        temp_path = f"{cached_path}.{os.getpid()}.tmp.mp4"
+        try:
+            transcode_ending(ending_path, profile, temp_path)
+            os.replace(temp_path, cached_path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        return cached_path
@@ -0,0 +1,261 @@
+"""
+One-Pass Finalize Template
+
+Produces the deliverable in a single ffmpeg invocation: narration + BGM
+(-18dB, ducked under the narration, fades) are mixed with amix, muxed with
+the rendered video and, if an ending video is found, concatenated with it,
+all in one filtergraph. The BGM gain curve is computed from the narration
+timeline by loudness.py (as in combine_final.py) and passed to ffmpeg as a
+100 Hz control input that multiplies the BGM.
+This replaces combine_final.py + concat_ending.py, which read and wrote the
+full video twice.
+
+Usage:
+1. Place audio_encoder.py, ending_cache.py, loudness.py and stage_profiler.py
+   in the same directory
+2. Set VIDEO_PATH / NARRATION_PATH / BGM_PATH below
+3. Run: uv run python finalize.py [video.mp4]
+
+The video stream is always copied. When the ending's codec, resolution,
+frame rate or pixel format differ from the main render, ending_cache.py
+transcodes the ending once to the main render's profile and keeps it in
+ENDING_CACHE_DIR; the concat demuxer then joins both without re-encoding.
+With ENDING_CACHE_DIR = None, mismatched endings go through the concat
+filter and the whole video is encoded once instead.
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+
+from audio_encoder import probe_duration
+from ending_cache import has_audio, normalized_ending, probe_video, profiles_match
+from loudness import ENVELOPE_RATE, bgm_envelope
+from stage_profiler import StageProfiler
+
+# ============================================================
+# CONFIGURATION - Modify these settings
+# ============================================================
+
+VIDEO_PATH = "media/videos/scene/1080p60/MyScene.mp4"
+NARRATION_PATH = "narration.wav"
+
+# Set to None for narration only
+BGM_PATH = "bgm.wav"
+
+# BGM volume relative to narration (-18dB recommended)
+BGM_VOLUME_DB = -18
+
+# BGM fades (ms)
+BGM_FADE_IN_MS = 3000
+BGM_FADE_OUT_MS = 4000
+
+# BGM level and ducking from the narration timeline (see combine_final.py)
+TIMELINE_PATH = "narration_timeline.json"
+BGM_DUCKING_DB = 6
+BGM_DUCK_ATTACK_MS = 300
+BGM_DUCK_RELEASE_MS = 800
+
+# Append ./endings/{aspect}/ending.mp4 or ${CLAUDE_PLUGIN_ROOT}/endings/{aspect}/ending.mp4
+ADD_ENDING = True
+
+# Endings converted to the main render's profile are kept here and reused
+# (None = re-encode the whole video when the ending does not match)
+ENDING_CACHE_DIR = ".ending_cache"
+
+# Output audio format
+SAMPLE_RATE = 48000
+
+# Video encoding used when a mismatched ending is joined without the cache
+VIDEO_CODEC_ARGS = ["-c:v", "libx264", "-preset", "medium", "-crf", "18", "-pix_fmt", "yuv420p"]
+AUDIO_CODEC_ARGS = ["-c:a", "aac", "-b:a", "192k"]
+
+OUTPUT_PATH = "final_output.mp4"
+
+# Stage timings for `stage_profiler.py report` (None = do not record)
+PROFILE_PATH = "pipeline_profile.jsonl"
+
+# ============================================================
+# IMPLEMENTATION - No need to modify below
+# ============================================================
+
+
+def get_aspect_ratio_dir(width: int, height: int) -> str:
+    """アスペクト比に基づいてディレクトリ名を返す"""
+    if width > height:
+        return "16_9"
+    elif width < height:
+        return "9_16"
+    else:
+        return "1_1"
+
+
+def find_ending_video(aspect_dir: str, plugin_root: str = None):
+    """エンディング動画を検索（プロジェクト優先、プラグインフォールバック）"""
+    project_ending = os.path.join(".", "endings", aspect_dir, "ending.mp4")
+    if os.path.exists(project_ending):
+        print(f"プロジェクトのエンディング動画を使用: {project_ending}")
+        return project_ending
+
+    if plugin_root is None:
+        plugin_root = os.environ.get("CLAUDE_PLUGIN_ROOT", ".")
+
+    plugin_ending = os.path.join(plugin_root, "endings", aspect_dir, "ending.mp4")
+    if os.path.exists(plugin_ending):
+        print(f"プラグインのエンディング動画を使用: {plugin_ending}")
+        return plugin_ending
+
+    print("警告: エンディング動画が見つかりませんでした")
+    print(f"  - プロジェクト: {project_ending}")
+    print(f"  - プラグイン: {plugin_ending}")
+    return None
+
+
+def write_bgm_gain(duration: float, bgm_path: str) -> str:
+    """Write the BGM gain curve (volume, ducking, fades) as raw float32 and return its path."""
+    envelope = bgm_envelope(duration, bgm_path, BGM_VOLUME_DB, BGM_FADE_IN_MS / 1000,
+                            BGM_FADE_OUT_MS / 1000, TIMELINE_PATH, BGM_DUCKING_DB,
+                            BGM_DUCK_ATTACK_MS / 1000, BGM_DUCK_RELEASE_MS / 1000)
+    handle, gain_path = tempfile.mkstemp(suffix=".f32", prefix="bgm_gain_")
+    with os.fdopen(handle, "wb") as f:
+        f.write(envelope.astype("<f4").tobytes())
+    return gain_path
+
+
+def gain_input_args(gain_path: str) -> list:
+    """ffmpeg input arguments for a gain curve written by write_bgm_gain()."""
+    return ["-f", "f32le", "-ar", str(ENVELOPE_RATE), "-ac", "1", "-i", gain_path]
+
+
+def build_audio_filter(duration: float, has_bgm: bool) -> list:
+    """Filter chains producing [main_a]: narration + BGM, `duration` seconds long.
+
+    Inputs: 1 = narration, 2 = looped BGM, 3 = its gain curve (gain_input_args).
+    """
+    audio_format = f"aresample={SAMPLE_RATE},aformat=sample_fmts=fltp:channel_layouts=stereo"
+    chains = [f"[1:a]{audio_format},apad,atrim=0:{duration:.3f}[narr]"]
+    if not has_bgm:
+        chains.append("[narr]anull[main_a]")
+        return chains
+
+    chains.append(f"[2:a]{audio_format},atrim=0:{duration:.3f}[bgm_raw]")
+    # pan copies the mono curve to both sides (an upmix would scale it by -3 dB)
+    chains.append(f"[3:a]aresample={SAMPLE_RATE},pan=stereo|c0=c0|c1=c0,aformat=sample_fmts=fltp,"
+                  f"apad,atrim=0:{duration:.3f}[bgm_gain]")
+    chains.append("[bgm_raw][bgm_gain]amultiply[bgm]")
+    chains.append("[narr][bgm]amix=inputs=2:duration=first:normalize=0[main_a]")
+    return chains
+
+
+def ending_audio_chain(index: int, ending_path: str) -> str:
+    """Filter chain producing [end_a] from the ending (silence if it has no audio)."""
+    if has_audio(ending_path):
+        return f"[{index}:a]aresample={SAMPLE_RATE},aformat=channel_layouts=stereo[end_a]"
+    ending_duration = probe_duration(ending_path)
+    return f"anullsrc=r={SAMPLE_RATE}:cl=stereo,atrim=0:{ending_duration:.3f}[end_a]"
+
+
+def write_concat_list(paths: list) -> str:
+    """Write an ffmpeg concat demuxer list and return its path."""
+    handle, list_path = tempfile.mkstemp(suffix=".txt", prefix="concat_")
+    with os.fdopen(handle, "w") as f:
+        for path in paths:
+            f.write(f"file '{os.path.abspath(path)}'\n")
+    return list_path
+
+
+def build_command(video_path: str, narration_path: str, bgm_path: str,
+                  ending_path: str, output_path: str, concat_list: str = None,
+                  main: dict = None, gain_path: str = None) -> list:
+    """Build the single ffmpeg command for the whole finalize step.
+
+    With `concat_list` (main video + matching ending), input 0 is the concat
+    demuxer and the video stream is copied; audio is still built by filters.
+    `main` is the probed profile of the video, reused if already known.
+    `gain_path` is the BGM gain curve from write_bgm_gain(), required with a BGM.
+    """
+    duration = probe_duration(video_path)
+    cmd = ["ffmpeg", "-hide_banner", "-loglevel", "error", "-y"]
+    if concat_list:
+        cmd += ["-f", "concat", "-safe", "0", "-i", concat_list]
+    else:
+        cmd += ["-i", video_path]
+    cmd += ["-i", narration_path]
+    if bgm_path:
+        cmd += ["-stream_loop", "-1", "-i", bgm_path] + gain_input_args(gain_path)
+
+    chains = build_audio_filter(duration, bgm_path is not None)
+    output_args = AUDIO_CODEC_ARGS + ["-movflags", "+faststart", output_path]
+
+    if ending_path is None:
+        cmd += ["-filter_complex", ";".join(chains),
+                "-map", "0:v:0", "-map", "[main_a]", "-c:v", "copy"]
+        return cmd + output_args
+
+    ending_input = 4 if bgm_path else 2
+    cmd += ["-i", ending_path]
+    chains.append(ending_audio_chain(ending_input, ending_path))
+
+    if concat_list:
+        chains.append("[main_a][end_a]concat=n=2:v=0:a=1[out_a]")
+        cmd += ["-filter_complex", ";".join(chains),
+                "-map", "0:v:0", "-map", "[out_a]", "-c:v", "copy"]
+        return cmd + output_args
+
+    if main is None:
+        main = probe_video(video_path)
+    chains.append(
+        f"[{ending_input}:v]scale={main['width']}:{main['height']}:force_original_aspect_ratio=decrease,"
+        f"pad={main['width']}:{main['height']}:(ow-iw)/2:(oh-ih)/2,"
+        f"fps={main['fps']:g},setsar=1,format=yuv420p[end_v]"
+    )
+    chains.append("[0:v]format=yuv420p,setsar=1[main_v]")
+    chains.append("[main_v][main_a][end_v][end_a]concat=n=2:v=1:a=1[out_v][out_a]")
+
+    cmd += ["-filter_complex", ";".join(chains), "-map", "[out_v]", "-map", "[out_a]"]
+    return cmd + VIDEO_CODEC_ARGS + output_args
+
+
+def finalize(video_path: str = VIDEO_PATH, narration_path: str = NARRATION_PATH,
+             bgm_path: str = BGM_PATH, add_ending: bool = ADD_ENDING,
+             output_path: str = OUTPUT_PATH, plugin_root: str = None) -> str:
+    """Mix audio, mux with the video and append the ending in one ffmpeg run."""
+    with StageProfiler(PROFILE_PATH).stage("finalize", output=output_path) as stage:
+        main = None
+        ending_path = None
+        concat_list = None
+        if add_ending:
+            main = probe_video(video_path)
+            ending_path = find_ending_video(get_aspect_ratio_dir(main["width"], main["height"]),
+                                            plugin_root)
+            if ending_path is None:
+                print("エンディング動画なしで続行します")
+            elif ENDING_CACHE_DIR:
+                # Per-call counts: other variants may be finalizing in other threads
+                lookups = {"hits": 0, "misses": 0}
+                ending_path = normalized_ending(ending_path, main, ENDING_CACHE_DIR, lookups)
+                stage.cache("ending", lookups["hits"], lookups["misses"])
+                concat_list = write_concat_list([video_path, ending_path])
+            elif profiles_match(main, probe_video(ending_path)):
+                concat_list = write_concat_list([video_path, ending_path])
+            else:
+                print("エンディング動画の形式が異なるため、映像を再エンコードします")
+        stage.details["reencode"] = ending_path is not None and concat_list is None
+
+        gain_path = write_bgm_gain(probe_duration(video_path), bgm_path) if bgm_path else None
+        cmd = build_command(video_path, narration_path, bgm_path, ending_path,
+                            output_path, concat_list, main, gain_path)
+        print("Finalizing (single ffmpeg pass)...")
+        try:
+            subprocess.run(cmd, check=True)
+        finally:
+            for temp_path in (concat_list, gain_path):
+                if temp_path:
+                    os.remove(temp_path)
+    print(f"完成: {output_path}")
+    return output_path
+
+
+if __name__ == "__main__":
+    finalize(sys.argv[1] if len(sys.argv) > 1 else VIDEO_PATH)
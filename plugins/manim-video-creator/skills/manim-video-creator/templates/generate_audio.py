@@ -4,15 +4,22 @@ TTS Audio Generation Template for Manim Videos
 Usage:
 1. Update NARRATIONS list with (start_time, text) tuples
 2. Adjust VIDEO_DURATION_MS to match your video length
-3. Run: uv run python generate_audio.py
-4. Combine with video: ffmpeg -i video.mp4 -i narration.mp3 -c:v copy -c:a aac -map 0:v:0 -map 1:a:0 -shortest output.mp4 -y
+3. Place tts_engine.py, tts_cache.py, audio_mixer.py, audio_encoder.py,
+   loudness.py and stage_profiler.py in the same directory
+4. Run: uv run python generate_audio.py
+5. Combine with video and BGM: uv run python combine_final.py
 """
 
 import asyncio
-import edge_tts
 from pydub import AudioSegment
 import os
 
+from audio_mixer import create_mixer
+from loudness import NarrationLeveler
+from stage_profiler import StageProfiler
+from tts_cache import SegmentCache
+from tts_engine import EdgeTTSBackend, create_backend, synthesize_all, worker_count
+
 # ============================================================
 # CONFIGURATION - Modify these settings
 # ============================================================
@@ -25,9 +32,61 @@ VOICE = "ja-JP-NanamiNeural"
 # Speech rate: "-20%" (slower), "+0%" (normal), "+20%" (faster)
 RATE = "+0%"
 
+# TTS engine (see tts_engine.py):
+#   "edge-tts"     Microsoft Edge voices, online (VOICE / RATE)
+#   "open_jtalk"   Open JTalk, local, one subprocess per segment
+#   "pyopenjtalk"  Open JTalk in worker processes (uv add pyopenjtalk)
+#   "command"      any local command-line engine given by LOCAL_TTS_COMMAND
+# Local engines work offline and ignore VOICE; RATE sets their speed.
+TTS_ENGINE = "edge-tts"
+
+# Command for "command" (or to replace the Open JTalk paths of "open_jtalk"):
+# "{output}", "{speed}" and "{text}" are filled in, otherwise the text goes to stdin
+LOCAL_TTS_COMMAND = None
+
+# Parallel synthesis: max concurrent TTS requests, per-request timeout (s),
+# and number of retries (exponential backoff starting at TTS_BACKOFF seconds)
+TTS_WORKERS = 8
+TTS_TIMEOUT = 30.0
+TTS_RETRIES = 3
+TTS_BACKOFF = 1.0
+
+# Concurrent syntheses for local engines (None = one per CPU core)
+LOCAL_TTS_WORKERS = None
+
+# Segment cache shared with measure_audio.py (set CACHE_DIR = None to disable)
+CACHE_DIR = ".tts_cache"
+CACHE_MAX_MB = 500
+
 # Total video duration in milliseconds
 VIDEO_DURATION_MS = 120 * 1000
 
+# Output sample rate (edge-tts produces 24 kHz mono; other engines are resampled)
+SAMPLE_RATE = 24000
+
+# Tracks whose mix buffer would exceed this (MB; 24 kHz mono is ~5.5 MB per
+# minute) are mixed in a memory-mapped file in the project directory instead
+# of RAM, so hour-long lectures mix in constant memory (None = always in RAM)
+MIXER_MEMORY_MB = 128
+
+# Loudness normalization: every segment is brought to NARRATION_LUFS
+# (integrated loudness, EBU R128; -16 for YouTube, -23 for broadcast) with
+# at most +-NARRATION_MAX_GAIN_DB of gain. None = keep the engine's levels.
+# Each segment is measured once; results are cached in .loudness_cache.json
+NARRATION_LUFS = -16.0
+NARRATION_MAX_GAIN_DB = 12.0
+
+# Segment intervals and loudness, read by combine_final.py / finalize.py
+# to set the BGM level and duck it under the narration
+TIMELINE_PATH = "narration_timeline.json"
+
+# Output file. WAV keeps the narration lossless until the single AAC encode
+# in combine_final.py; use .mp3 / .m4a for a standalone file.
+OUTPUT_PATH = "narration.wav"
+
+# Stage timings for `stage_profiler.py report` (None = do not record)
+PROFILE_PATH = "pipeline_profile.jsonl"
+
 # Narrations with start times (seconds) - synced to animation
 # Format: (start_time_seconds, "narration text")
 NARRATIONS = [
@@ -44,49 +103,73 @@ NARRATIONS = [
 
 async def generate_audio_segment(text: str, output_path: str):
     """Generate audio file from text using edge-tts."""
-    communicate = edge_tts.Communicate(text, VOICE, rate=RATE)
-    await communicate.save(output_path)
+    await EdgeTTSBackend(VOICE, RATE).synthesize(text, output_path)
+
 
+async def main(backend=None):
+    owns_backend = backend is None
+    if owns_backend:
+        backend = create_backend(TTS_ENGINE, VOICE, RATE, LOCAL_TTS_COMMAND, LOCAL_TTS_WORKERS)
+    workers = worker_count(backend, TTS_WORKERS, LOCAL_TTS_WORKERS)
 
-async def main():
     # Create output directory
     audio_dir = "audio_segments"
     os.makedirs(audio_dir, exist_ok=True)
 
-    # Create silent audio track
-    final_audio = AudioSegment.silent(duration=VIDEO_DURATION_MS)
-
-    print("Generating audio segments...")
-
-    for i, (start_time, text) in enumerate(NARRATIONS):
-        segment_path = f"{audio_dir}/segment_{i:02d}.mp3"
-        print(f"  [{i+1}/{len(NARRATIONS)}] {start_time:.1f}s: {text[:30]}...")
-
-        # Generate audio
-        await generate_audio_segment(text, segment_path)
-
-        # Load segment
-        segment = AudioSegment.from_mp3(segment_path)
-
-        # Overlay at specified position
-        start_ms = int(start_time * 1000)
-        final_audio = final_audio.overlay(segment, position=start_ms)
-
-    # Export final audio
-    print("\nExporting final audio track...")
-    output_path = "narration.mp3"
-    final_audio.export(output_path, format="mp3")
-    print(f"Audio file created: {output_path}")
-
-    # Cleanup temporary files
-    for i in range(len(NARRATIONS)):
-        segment_path = f"{audio_dir}/segment_{i:02d}.mp3"
+    print(f"Generating audio segments ({backend.name}, {workers} parallel workers)...")
+    profiler = StageProfiler(PROFILE_PATH)
+
+    # Synthesize all narrations concurrently
+    segment_paths = [
+        f"{audio_dir}/segment_{i:02d}.{backend.extension}"
+        for i in range(len(NARRATIONS))
+    ]
+    jobs = [(text, path) for (_, text), path in zip(NARRATIONS, segment_paths)]
+    cache = SegmentCache(CACHE_DIR, CACHE_MAX_MB * 1024**2) if CACHE_DIR else None
+    with profiler.stage("tts", backend=backend.name, segments=len(jobs),
+                        workers=workers) as stage:
+        try:
+            audio_paths = await synthesize_all(
+                jobs, backend,
+                workers=workers, timeout=TTS_TIMEOUT,
+                retries=TTS_RETRIES, backoff=TTS_BACKOFF, cache=cache,
+            )
+        finally:
+            if owns_backend:
+                backend.close()
+        if cache:
+            stage.cache("tts", cache.hits, cache.misses)
+
+    # Silent sample buffer for the whole track (memory-mapped if it is long)
+    mixer = create_mixer(VIDEO_DURATION_MS, SAMPLE_RATE, max_memory_mb=MIXER_MEMORY_MB)
+    leveler = NarrationLeveler(NARRATION_LUFS, NARRATION_MAX_GAIN_DB)
+    with mixer, profiler.stage("narration_mix", segments=len(jobs), output=OUTPUT_PATH,
+                               mixer=type(mixer).__name__) as stage:
+        # Mix in timeline order
+        timeline = sorted(zip(NARRATIONS, audio_paths), key=lambda item: item[0][0])
+        for (start_time, text), segment_path in timeline:
+            # Load segment
+            segment = AudioSegment.from_file(segment_path)
+
+            # Add in place at specified position, at the target loudness
+            gain_db = leveler.add(mixer, segment, segment_path, start_time)
+            print(f"  {start_time:.1f}s ({gain_db:+.1f} dB): {text[:30]}...")
+
+        # Export final audio (peaks from overlapping segments are soft-limited)
+        print("\nExporting final audio track...")
+        output_path = mixer.export(OUTPUT_PATH)
+        loudness = leveler.finish(mixer, TIMELINE_PATH)
+        stage.cache("loudness", leveler.cache.hits, leveler.cache.misses)
+    print(f"Audio file created: {output_path} ({loudness['lufs']} LUFS, peak {loudness['peak']:.2f})")
+
+    # Cleanup temporary files (cached segments are kept for the next run)
+    for segment_path in segment_paths:
         if os.path.exists(segment_path):
             os.remove(segment_path)
     os.rmdir(audio_dir)
 
     print("\nNext step: Combine with video using:")
-    print("  ffmpeg -i video.mp4 -i narration.mp3 -c:v copy -c:a aac -map 0:v:0 -map 1:a:0 -shortest output.mp4 -y")
+    print("  uv run python combine_final.py")
 
     return output_path
 
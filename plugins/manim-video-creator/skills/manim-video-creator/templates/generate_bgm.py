@@ -0,0 +1,157 @@
+"""
+Ambient BGM Generation Template (copyright-free)
+
+Generates a slow ambient chord progression with a bass drone and fades.
+All synthesis is done with vectorized NumPy operations, and the track is
+rendered in fixed-size chunks that are piped straight into one ffmpeg
+encode, so memory use does not grow with duration and no temporary WAV
+file is written.
+
+Usage:
+1. Place audio_encoder.py in the same directory
+2. Adjust DURATION_SECONDS to be a little longer than your video
+3. Run: uv run python generate_bgm.py
+4. Mix with narration: uv run python combine_final.py (BGM volume: -18dB)
+"""
+
+import numpy as np
+
+from audio_encoder import PCMEncoder
+
+# ============================================================
+# CONFIGURATION - Modify these settings
+# ============================================================
+
+# Track length in seconds (video length + a few seconds)
+DURATION_SECONDS = 130
+
+SAMPLE_RATE = 44100
+
+# C major progression: C E G / D F A / E G B / C E G
+CHORD_PROGRESSIONS = [
+    [130.81, 164.81, 196.00],
+    [146.83, 174.61, 220.00],
+    [164.81, 196.00, 246.94],
+    [130.81, 164.81, 196.00],
+]
+CHORD_DURATION_MS = 8000
+CHORD_AMPLITUDE = 0.12
+
+# ADSR envelope per chord (ms, ms, level, ms)
+ATTACK_MS = 2000
+DECAY_MS = 1000
+SUSTAIN_LEVEL = 0.7
+RELEASE_MS = 2000
+
+# Bass drone (C2) and its fifth
+DRONE_FREQ = 65.41
+DRONE_AMPLITUDE = 0.08
+DRONE_FIFTH_AMPLITUDE = 0.04
+
+# Track fades (seconds)
+FADE_IN_SECONDS = 3
+FADE_OUT_SECONDS = 5
+
+# Samples rendered per chunk (bounds memory for long tracks)
+CHUNK_SECONDS = 10
+
+# Output file. WAV keeps the BGM lossless until the single AAC encode in
+# combine_final.py; use .mp3 / .m4a for a standalone file.
+OUTPUT_PATH = "bgm.wav"
+
+# ============================================================
+# IMPLEMENTATION - No need to modify below
+# ============================================================
+
+
+def generate_ambient_chord(frequencies, t: np.ndarray, amplitude: float = 0.15) -> np.ndarray:
+    """Chord with slow phase modulation; `t` is time since the chord started."""
+    phase_mod = 0.002 * np.sin(2 * np.pi * 0.1 * t)
+    value = np.zeros_like(t)
+    for freq in frequencies:
+        value += amplitude * np.sin(2 * np.pi * freq * t * (1 + phase_mod))
+    return value / len(frequencies)
+
+
+def adsr_envelope(i: np.ndarray, n_samples: int, attack_ms: float, decay_ms: float,
+                  sustain_level: float, release_ms: float,
+                  sample_rate: int = 44100) -> np.ndarray:
+    """ADSR gain for sample indices `i` within a note of `n_samples` samples."""
+    attack = int(sample_rate * attack_ms / 1000)
+    decay = int(sample_rate * decay_ms / 1000)
+    release = int(sample_rate * release_ms / 1000)
+    release_start = n_samples - release
+
+    return np.select(
+        [i < attack, i < attack + decay, i > release_start],
+        [
+            i / attack,
+            1.0 - (1.0 - sustain_level) * (i - attack) / decay,
+            sustain_level * (1.0 - (i - release_start) / release),
+        ],
+        default=sustain_level,
+    )
+
+
+def render_chunk(start: int, end: int, total_samples: int,
+                 sample_rate: int = SAMPLE_RATE) -> np.ndarray:
+    """Render samples [start, end) of the track as float64 in [-1, 1]."""
+    n = np.arange(start, end, dtype=np.int64)
+    chord_samples = int(sample_rate * CHORD_DURATION_MS / 1000)
+
+    # Chords: each chord restarts its own clock and envelope
+    chord_index = n // chord_samples
+    local = n % chord_samples
+    samples = np.empty(len(n))
+    for index in np.unique(chord_index):
+        mask = chord_index == index
+        chord = CHORD_PROGRESSIONS[index % len(CHORD_PROGRESSIONS)]
+        samples[mask] = generate_ambient_chord(chord, local[mask] / sample_rate, CHORD_AMPLITUDE)
+    samples *= adsr_envelope(local, chord_samples, ATTACK_MS, DECAY_MS,
+                             SUSTAIN_LEVEL, RELEASE_MS, sample_rate)
+
+    # Bass drone
+    t = n / sample_rate
+    samples += DRONE_AMPLITUDE * np.sin(2 * np.pi * DRONE_FREQ * t)
+    samples += DRONE_FIFTH_AMPLITUDE * np.sin(2 * np.pi * DRONE_FREQ * 1.5 * t)
+
+    # Fade in / fade out
+    fade_in = int(sample_rate * FADE_IN_SECONDS)
+    fade_out = int(sample_rate * FADE_OUT_SECONDS)
+    gain = np.ones(len(n))
+    head = n < fade_in
+    gain[head] = n[head] / fade_in
+    tail = n >= total_samples - fade_out
+    gain[tail] *= (total_samples - n[tail]) / fade_out
+    return samples * gain
+
+
+def iter_chunks(duration_seconds: float, sample_rate: int = SAMPLE_RATE,
+                chunk_seconds: float = CHUNK_SECONDS):
+    """Yield the track as consecutive float64 chunks."""
+    total_samples = int(sample_rate * duration_seconds)
+    chunk = int(sample_rate * chunk_seconds)
+    for start in range(0, total_samples, chunk):
+        yield render_chunk(start, min(start + chunk, total_samples), total_samples, sample_rate)
+
+
+def to_pcm16(samples: np.ndarray) -> bytes:
+    """Convert float samples to 16-bit little-endian PCM bytes."""
+    return (np.clip(samples, -1.0, 1.0) * 32767).astype("<i2").tobytes()
+
+
+def generate_ambient_bgm(duration_seconds: float = DURATION_SECONDS,
+                         output_path: str = OUTPUT_PATH):
+    """Generate ambient BGM and encode it to `output_path` in one pass."""
+    print(f"Generating ambient BGM ({duration_seconds}s)...")
+
+    with PCMEncoder(output_path, SAMPLE_RATE) as encoder:
+        for samples in iter_chunks(duration_seconds):
+            encoder.write_pcm(to_pcm16(samples))
+
+    print(f"BGM created: {output_path}")
+    return output_path
+
+
+if __name__ == "__main__":
+    generate_ambient_bgm()
@@ -0,0 +1,385 @@
+"""
+Loudness Measurement, Narration Timeline and BGM Ducking
+
+Shared helper used by generate_audio.py, narration_pipeline.py,
+combine_final.py and finalize.py. Copy it next to the other templates in
+your project directory (measuring files also needs audio_encoder.py).
+
+- Integrated loudness per ITU-R BS.1770 / EBU R128 (K-weighting, 400 ms
+  gating blocks, -70 LUFS absolute and -10 LU relative gates), computed
+  with NumPy: the K-weighting filter is applied in the frequency domain
+  with overlap-add, so a whole track is measured chunk by chunk without
+  an ffmpeg loudnorm pass. Gating ignores the pauses between narrations.
+  Mono counts as one channel, which is also its loudness in the stereo
+  deliverable (ffmpeg upmixes mono to both sides at -3 dB).
+- LoudnessCache: measurements keyed by a hash of the file content, so
+  every segment (and the BGM) is measured once across runs.
+- NarrationLeveler: brings every narration segment to a target loudness
+  as it is mixed and writes the narration timeline
+  (narration_timeline.json): segment intervals, the voiced part of each,
+  their loudness and the applied gain.
+- bgm_envelope(): the BGM gain over time (level, ducking under narration,
+  fades) computed from the timeline in one vectorized pass.
+"""
+
+import hashlib
+import json
+import os
+
+import numpy as np
+
+LOUDNESS_CACHE_PATH = ".loudness_cache.json"
+
+# Measurements in the cache are only reused by the same meter version
+METER_VERSION = 1
+
+# 100 ms sub-blocks; a gating block is 4 of them (400 ms, 75% overlap)
+BLOCK_SECONDS = 0.1
+ABSOLUTE_GATE_LUFS = -70.0
+RELATIVE_GATE_LU = -10.0
+
+# 100 ms blocks this far below a clip's loudness count as silence
+SILENCE_LU = -25.0
+
+# Sample rate of the BGM gain envelope
+ENVELOPE_RATE = 100
+
+
+def _biquad_response(b: tuple, a: tuple, omega: np.ndarray) -> np.ndarray:
+    z1 = np.exp(-1j * omega)
+    z2 = z1 * z1
+    return (b[0] + b[1] * z1 + b[2] * z2) / (a[0] + a[1] * z1 + a[2] * z2)
+
+
+def k_weighting(sample_rate: int, n_fft: int) -> np.ndarray:
+    """Frequency response of the BS.1770 K-weighting filter at the rfft bins of n_fft.
+
+    Both stages are designed for the given sample rate (bilinear transform
+    as in libebur128), so 24 kHz narration is measured like 48 kHz.
+    """
+    omega = 2 * np.pi * np.fft.rfftfreq(n_fft)
+
+    # Stage 1: high shelf (+4 dB above ~1.7 kHz, models the head)
+    k = np.tan(np.pi * 1681.974450955533 / sample_rate)
+    q = 0.7071752369554196
+    vh = 10 ** (3.999843853973347 / 20)
+    vb = vh ** 0.4996667741545416
+    a0 = 1 + k / q + k * k
+    shelf = _biquad_response(
+        ((vh + vb * k / q + k * k) / a0, 2 * (k * k - vh) / a0, (vh - vb * k / q + k * k) / a0),
+        (1.0, 2 * (k * k - 1) / a0, (1 - k / q + k * k) / a0),
+        omega)
+
+    # Stage 2: high pass (RLB weighting, ~38 Hz)
+    k = np.tan(np.pi * 38.13547087602444 / sample_rate)
+    q = 0.5003270373238773
+    a0 = 1 + k / q + k * k
+    highpass = _biquad_response(
+        (1.0, -2.0, 1.0),
+        (1.0, 2 * (k * k - 1) / a0, (1 - k / q + k * k) / a0),
+        omega)
+    return shelf * highpass
+
+
+class LoudnessMeter:
+    """Streaming BS.1770 integrated loudness; feed (frames, channels) float chunks."""
+
+    def __init__(self, sample_rate: int, chunk_seconds: float = 1.0, tail_seconds: float = 0.25):
+        self.sample_rate = sample_rate
+        self.block = int(round(sample_rate * BLOCK_SECONDS))
+        self.chunk = self.block * max(1, int(round(chunk_seconds / BLOCK_SECONDS)))
+        # The filter's impulse response has died out after the tail
+        self.tail = int(sample_rate * tail_seconds)
+        self.responses = {}
+        self.pending = []
+        self.pending_frames = 0
+        self.carry = None
+        self.energies = []
+        self.peak = 0.0
+
+    def add(self, samples: np.ndarray):
+        if samples.ndim == 1:
+            samples = samples[:, None]
+        if len(samples):
+            self.peak = max(self.peak, float(np.max(np.abs(samples))))
+        self.pending.append(samples)
+        self.pending_frames += len(samples)
+        if self.pending_frames >= self.chunk:
+            data = np.concatenate(self.pending)
+            usable = len(data) - len(data) % self.chunk
+            for start in range(0, usable, self.chunk):
+                self._process(data[start:start + self.chunk])
+            self.pending = [data[usable:]]
+            self.pending_frames = len(data) - usable
+
+    def _process(self, x: np.ndarray):
+        n_fft = 1 << int(len(x) + self.tail - 1).bit_length()
+        if n_fft not in self.responses:
+            self.responses[n_fft] = k_weighting(self.sample_rate, n_fft)[:, None]
+        y = np.fft.irfft(np.fft.rfft(x, n_fft, axis=0) * self.responses[n_fft], n_fft, axis=0)
+        # Overlap-add: the previous chunk's filter tail continues into this one
+        if self.carry is not None:
+            overlap = min(len(self.carry), len(y))
+            y[:overlap] += self.carry[:overlap]
+        self.carry = y[len(x):len(x) + self.tail]
+        blocks = len(x) // self.block
+        if blocks:
+            power = (y[:blocks * self.block] ** 2).reshape(blocks, self.block, -1).mean(axis=1)
+            # Channel weights are 1.0 for L, R and mono
+            self.energies.append(power.sum(axis=1))
+
+    def finish(self) -> dict:
+        """{"lufs": integrated loudness or None (silence), "peak": sample peak,
+        "onset"/"offset": seconds from the start to the first/after the last
+        voiced 100 ms block}"""
+        if self.pending_frames:
+            data = np.concatenate(self.pending)
+            # An incomplete last 100 ms sub-block does not count
+            data = data[: len(data) - len(data) % self.block] if len(data) >= self.block else data
+            if len(data) >= self.block:
+                self._process(data)
+            self.pending, self.pending_frames = [], 0
+        energies = np.concatenate(self.energies) if self.energies else np.zeros(0)
+        lufs = integrated_loudness(energies)
+        onset = offset = 0.0
+        if lufs is not None:
+            with np.errstate(divide="ignore"):
+                levels = -0.691 + 10 * np.log10(energies)
+            voiced = np.flatnonzero(levels > max(ABSOLUTE_GATE_LUFS, lufs + SILENCE_LU))
+            onset = round(voiced[0] * BLOCK_SECONDS, 2)
+            offset = round((voiced[-1] + 1) * BLOCK_SECONDS, 2)
+        return {"lufs": lufs, "peak": round(self.peak, 5), "onset": onset, "offset": offset}
+
+
+def integrated_loudness(energies: np.ndarray):
+    """Gated loudness (LUFS) from 100 ms sub-block mean squares; None if all is gated out.
+
+    A clip shorter than one 400 ms gating block is measured as a whole
+    (BS.1770 has no value for it), so short replies still get normalized.
+    """
+    if len(energies) == 0:
+        return None
+    if len(energies) >= 4:
+        blocks = np.convolve(energies, np.full(4, 0.25), mode="valid")
+    else:
+        blocks = np.array([energies.mean()])
+    with np.errstate(divide="ignore"):
+        levels = -0.691 + 10 * np.log10(blocks)
+    above = blocks[levels > ABSOLUTE_GATE_LUFS]
+    if len(above) == 0:
+        return None
+    relative_gate = -0.691 + 10 * np.log10(above.mean()) + RELATIVE_GATE_LU
+    kept = blocks[(levels > ABSOLUTE_GATE_LUFS) & (levels > relative_gate)]
+    return round(float(-0.691 + 10 * np.log10(kept.mean())), 2)
+
+
+def measure_samples(samples: np.ndarray, sample_rate: int) -> dict:
+    meter = LoudnessMeter(sample_rate)
+    meter.add(samples)
+    return meter.finish()
+
+
+def file_hash(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class LoudnessCache:
+    """Loudness measurements keyed by file content, stored in one JSON file."""
+
+    def __init__(self, path: str = LOUDNESS_CACHE_PATH):
+        self.path = path
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+        self.dirty = False
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self.entries = json.load(f)
+
+    @staticmethod
+    def key(path: str) -> str:
+        return f"{METER_VERSION}:{file_hash(path)}"
+
+    def lookup(self, key: str):
+        if key in self.entries:
+            self.hits += 1
+            return self.entries[key]
+        self.misses += 1
+        return None
+
+    def remember(self, key: str, measurement: dict) -> dict:
+        self.entries[key] = measurement
+        self.dirty = True
+        return measurement
+
+    def segment(self, path: str, samples: np.ndarray, sample_rate: int) -> dict:
+        """Loudness of an already decoded segment file (measured only on a miss)."""
+        key = self.key(path)
+        return self.lookup(key) or self.remember(key, measure_samples(samples, sample_rate))
+
+    def file(self, path: str, sample_rate: int = 48000, channels: int = 2) -> dict:
+        """Loudness of an audio file, decoded and measured in chunks only on a miss."""
+        from audio_encoder import decode_pcm
+
+        key = self.key(path)
+        cached = self.lookup(key)
+        if cached:
+            return cached
+        meter = LoudnessMeter(sample_rate)
+        for chunk in decode_pcm(path, sample_rate, channels):
+            meter.add(chunk)
+        return self.remember(key, meter.finish())
+
+    def save(self):
+        if not self.path or not self.dirty:
+            return
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f)
+        os.replace(temp_path, self.path)
+        self.dirty = False
+
+    def summary(self) -> str:
+        lookups = self.hits + self.misses
+        rate = self.hits / lookups * 100 if lookups else 0.0
+        return f"Loudness cache: {self.hits} hits, {self.misses} misses ({rate:.0f}% hit rate)"
+
+
+def normalization_gain(lufs, target_lufs: float, max_gain_db: float) -> float:
+    """Gain in dB that brings `lufs` to the target, limited to +-max_gain_db (0 for silence)."""
+    if lufs is None or target_lufs is None:
+        return 0.0
+    return float(np.clip(target_lufs - lufs, -max_gain_db, max_gain_db))
+
+
+class NarrationLeveler:
+    """Adds segments to a NarrationMixer at a common loudness and records the timeline.
+
+    Every segment is measured once (LoudnessCache) from the samples that
+    are mixed anyway and gets the gain that brings it to target_lufs
+    (None = measure only). The segment intervals, trimmed to their voiced
+    part, go to the narration timeline for BGM ducking.
+    """
+
+    def __init__(self, target_lufs: float = None, max_gain_db: float = 12.0,
+                 cache_path: str = LOUDNESS_CACHE_PATH):
+        self.target_lufs = target_lufs
+        self.max_gain_db = max_gain_db
+        self.cache = LoudnessCache(cache_path)
+        self.segments = []
+
+    def add(self, mixer, segment, segment_path: str, start: float) -> float:
+        """Mix `segment` (decoded from segment_path) at `start` seconds; return the gain in dB."""
+        from audio_mixer import segment_to_array
+
+        samples = segment_to_array(segment, mixer.sample_rate, mixer.channels)
+        measurement = self.cache.segment(segment_path, samples, mixer.sample_rate)
+        gain_db = normalization_gain(measurement["lufs"], self.target_lufs, self.max_gain_db)
+        mixer.add_samples(samples, int(start * 1000), gain_db)
+        self.segments.append({
+            "start": round(start, 3),
+            "end": round(start + len(samples) / mixer.sample_rate, 3),
+            "voice_start": round(start + measurement["onset"], 3),
+            "voice_end": round(start + measurement["offset"], 3),
+            "lufs": measurement["lufs"],
+            "gain_db": round(gain_db, 2),
+        })
+        return gain_db
+
+    def finish(self, mixer, timeline_path: str) -> dict:
+        """Measure the mix (call after export(), which limits it in place) and write the timeline."""
+        meter = LoudnessMeter(mixer.sample_rate)
+        for chunk in mixer.iter_chunks(meter.chunk):
+            meter.add(chunk)
+        self.cache.save()
+        measurement = meter.finish()
+        timeline = {
+            "duration": round(mixer.frames / mixer.sample_rate, 3),
+            "target_lufs": self.target_lufs,
+            "lufs": measurement["lufs"],
+            "peak": measurement["peak"],
+            "segments": sorted(self.segments, key=lambda entry: entry["start"]),
+        }
+        if timeline_path:
+            with open(timeline_path, "w", encoding="utf-8") as f:
+                json.dump(timeline, f, ensure_ascii=False, indent=2)
+        return timeline
+
+
+def load_timeline(path: str):
+    """The narration timeline, or None if there is none."""
+    if not path or not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def narration_presence(times: np.ndarray, intervals: list, attack: float, release: float) -> np.ndarray:
+    """0..1 per time: 1 while narration plays, ramping up over `attack`
+    seconds before each interval and down over `release` seconds after it.
+
+    Vectorized over all times at once: searchsorted finds the interval that
+    started last and the one that starts next for every time.
+    """
+    if not intervals:
+        return np.zeros(len(times))
+    intervals = sorted(intervals)
+    starts = np.array([start for start, _ in intervals])
+    # Latest end among the intervals started so far (intervals may overlap)
+    ends = np.maximum.accumulate(np.array([end for _, end in intervals]))
+    started = np.searchsorted(starts, times, side="right")
+    last_end = np.where(started > 0, ends[np.maximum(started - 1, 0)], -np.inf)
+    next_start = np.where(started < len(starts), starts[np.minimum(started, len(starts) - 1)], np.inf)
+
+    presence = (times <= last_end).astype(float)
+    if attack > 0:
+        presence = np.maximum(presence, 1 - (next_start - times) / attack)
+    if release > 0:
+        presence = np.maximum(presence, 1 - (times - last_end) / release)
+    return np.clip(presence, 0.0, 1.0)
+
+
+def bgm_level_db(volume_db: float, timeline: dict, bgm_path: str,
+                 cache_path: str = LOUDNESS_CACHE_PATH) -> float:
+    """Gain (dB) that puts the BGM `volume_db` LU below the narration's loudness.
+
+    Without a measured narration or for a silent BGM, volume_db is applied
+    as a plain gain.
+    """
+    if not timeline or timeline.get("lufs") is None:
+        return float(volume_db)
+    cache = LoudnessCache(cache_path)
+    bgm = cache.file(bgm_path)
+    cache.save()
+    if bgm["lufs"] is None:
+        return float(volume_db)
+    return timeline["lufs"] + volume_db - bgm["lufs"]
+
+
+def bgm_envelope(duration: float, bgm_path: str, volume_db: float, fade_in: float,
+                 fade_out: float, timeline_path: str = None, ducking_db: float = 0.0,
+                 attack: float = 0.3, release: float = 0.8, rate: int = ENVELOPE_RATE,
+                 cache_path: str = LOUDNESS_CACHE_PATH) -> np.ndarray:
+    """Linear BGM gain at `rate` samples per second over `duration` seconds.
+
+    The BGM sits volume_db below the narration while it speaks and rises
+    by ducking_db in the pauses of the narration timeline; the fades are
+    applied on top. Without a timeline this is a flat volume_db with fades.
+    """
+    timeline = load_timeline(timeline_path)
+    times = np.arange(int(np.ceil(duration * rate)) + 1) / rate
+    level_db = np.full(len(times), bgm_level_db(volume_db, timeline, bgm_path, cache_path))
+    if timeline and ducking_db:
+        intervals = [(s["voice_start"], s["voice_end"]) for s in timeline["segments"]
+                     if s["lufs"] is not None]
+        level_db += ducking_db * (1 - narration_presence(times, intervals, attack, release))
+    gain = 10 ** (level_db / 20)
+    if fade_in:
+        gain *= np.clip(times / fade_in, 0.0, 1.0)
+    if fade_out:
+        gain *= np.clip((duration - times) / fade_out, 0.0, 1.0)
+    return gain.astype(np.float32)
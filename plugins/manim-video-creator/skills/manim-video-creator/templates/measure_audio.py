@@ -6,14 +6,20 @@ before creating the Manim animation. This helps sync animations with narration.
 
 Usage:
 1. Update NARRATIONS list with your narration texts
-2. Run: uv run python measure_audio.py
-3. Use the measured durations to set wait() times in your Manim script
+2. Place tts_engine.py, tts_cache.py and stage_profiler.py in the same directory
+3. Run: uv run python measure_audio.py
+4. Use the measured durations to set wait() times in your Manim script
+
+Measured segments are kept in the TTS cache, so generate_audio.py reuses
+them instead of synthesizing the same text again.
 """
 
 import asyncio
-import edge_tts
 from pydub import AudioSegment
-import os
+
+from stage_profiler import StageProfiler
+from tts_cache import SegmentCache
+from tts_engine import create_backend, synthesize_all, worker_count
 
 # ============================================================
 # CONFIGURATION - Modify these settings
@@ -27,6 +33,25 @@ VOICE = "ja-JP-NanamiNeural"
 # Speech rate: "-20%" (slower), "+0%" (normal), "+20%" (faster)
 RATE = "+0%"
 
+# TTS engine settings (see generate_audio.py)
+TTS_ENGINE = "edge-tts"
+LOCAL_TTS_COMMAND = None
+
+# Parallel synthesis settings (see generate_audio.py)
+TTS_WORKERS = 8
+TTS_TIMEOUT = 30.0
+TTS_RETRIES = 3
+TTS_BACKOFF = 1.0
+LOCAL_TTS_WORKERS = None
+
+# Segment cache shared with generate_audio.py (must match its CACHE_DIR;
+# set CACHE_DIR = None to disable)
+CACHE_DIR = ".tts_cache"
+CACHE_MAX_MB = 500
+
+# Stage timings for `stage_profiler.py report` (None = do not record)
+PROFILE_PATH = "pipeline_profile.jsonl"
+
 # Narration texts to measure
 NARRATIONS = [
     "最初のナレーションテキスト。",
@@ -40,31 +65,46 @@ NARRATIONS = [
 # ============================================================
 
 
-async def measure_duration(text: str, index: int) -> float:
-    """Measure the duration of a text when spoken."""
-    temp_path = f"temp_{index}.mp3"
-    communicate = edge_tts.Communicate(text, VOICE, rate=RATE)
-    await communicate.save(temp_path)
+def measure_duration(audio_path: str) -> float:
+    """Measure the duration of a synthesized segment in seconds."""
+    audio = AudioSegment.from_file(audio_path)
+    return len(audio) / 1000.0  # Convert ms to seconds
 
-    audio = AudioSegment.from_mp3(temp_path)
-    duration = len(audio) / 1000.0  # Convert ms to seconds
 
-    os.remove(temp_path)
-    return duration
+async def main(backend=None):
+    owns_backend = backend is None
+    if owns_backend:
+        backend = create_backend(TTS_ENGINE, VOICE, RATE, LOCAL_TTS_COMMAND, LOCAL_TTS_WORKERS)
+    workers = worker_count(backend, TTS_WORKERS, LOCAL_TTS_WORKERS)
 
-
-async def main():
-    print(f"Measuring narration durations (Voice: {VOICE}, Rate: {RATE})")
+    print(f"Measuring narration durations ({backend.name}, Voice: {VOICE}, Rate: {RATE})")
     print("=" * 60)
 
-    total = 0
-    results = []
-
-    for i, text in enumerate(NARRATIONS):
-        duration = await measure_duration(text, i)
-        total += duration
-        results.append((i + 1, duration, text))
-        print(f"{i+1:2d}. [{duration:5.2f}s] {text}")
+    cache = SegmentCache(CACHE_DIR, CACHE_MAX_MB * 1024**2) if CACHE_DIR else None
+    jobs = [(text, f"temp_{i}.{backend.extension}") for i, text in enumerate(NARRATIONS)]
+    profiler = StageProfiler(PROFILE_PATH)
+    with profiler.stage("measure", backend=backend.name, segments=len(jobs)) as stage:
+        try:
+            audio_paths = await synthesize_all(
+                jobs, backend,
+                workers=workers, timeout=TTS_TIMEOUT,
+                retries=TTS_RETRIES, backoff=TTS_BACKOFF, cache=cache,
+            )
+        finally:
+            if owns_backend:
+                backend.close()
+        print("=" * 60)
+
+        total = 0
+        results = []
+
+        for i, (text, audio_path) in enumerate(zip(NARRATIONS, audio_paths)):
+            duration = measure_duration(audio_path)
+            total += duration
+            results.append((i + 1, duration, text))
+            print(f"{i+1:2d}. [{duration:5.2f}s] {text}")
+        if cache:
+            stage.cache("tts", cache.hits, cache.misses)
 
     print("=" * 60)
     print(f"Total duration: {total:.2f}s ({total/60:.1f} min)")
@@ -0,0 +1,224 @@
+"""
+Single-Pass Narration Pipeline
+
+Replaces the measure_audio.py -> copy/paste -> generate_audio.py workflow.
+In one run it synthesizes each narration once, measures it, computes the
+cumulative start offsets, writes a JSON timing manifest for the Manim scene
+and mixes the narration track (narration.wav) at a common loudness, with the
+narration timeline for BGM ducking (narration_timeline.json).
+
+Usage:
+1. Update NARRATIONS list with your narration texts (in order)
+2. Place tts_engine.py, tts_cache.py, audio_mixer.py, audio_encoder.py,
+   loudness.py and stage_profiler.py in the same directory
+3. Run: uv run python narration_pipeline.py
+4. Use narration_timing.json to set the timing of your Manim scene
+
+Manifest format (narration_timing.json):
+{
+  "voice": "ja-JP-NanamiNeural",
+  "rate": "+0%",
+  "total_duration": 14.31,
+  "segments": [
+    {"index": 0, "text": "...", "start": 0.0, "duration": 5.57, "end": 5.57},
+    ...
+  ]
+}
+"""
+
+import asyncio
+import json
+from pydub import AudioSegment
+
+from audio_mixer import NarrationMixer, create_mixer
+from loudness import NarrationLeveler
+from stage_profiler import StageProfiler
+from tts_cache import SegmentCache
+from tts_engine import create_backend, synthesize_all, worker_count
+
+# ============================================================
+# CONFIGURATION - Modify these settings
+# ============================================================
+
+# Voice options:
+# Japanese: "ja-JP-NanamiNeural" (female), "ja-JP-KeitaNeural" (male)
+# English: "en-US-JennyNeural" (female), "en-US-GuyNeural" (male)
+VOICE = "ja-JP-NanamiNeural"
+
+# Speech rate: "-20%" (slower), "+0%" (normal), "+20%" (faster)
+RATE = "+0%"
+
+# TTS engine settings (see generate_audio.py)
+TTS_ENGINE = "edge-tts"
+LOCAL_TTS_COMMAND = None
+
+# Silence before the first narration and between narrations (seconds)
+LEAD_IN_SECONDS = 0.0
+GAP_SECONDS = 0.0
+
+# Total video duration in milliseconds (None = end of the last narration)
+VIDEO_DURATION_MS = None
+
+# Output sample rate (edge-tts produces 24 kHz mono)
+SAMPLE_RATE = 24000
+
+# Mix in a memory-mapped file above this buffer size (see generate_audio.py)
+MIXER_MEMORY_MB = 128
+
+# Loudness normalization and BGM ducking timeline (see generate_audio.py)
+NARRATION_LUFS = -16.0
+NARRATION_MAX_GAIN_DB = 12.0
+TIMELINE_PATH = "narration_timeline.json"
+
+# Parallel synthesis settings (see generate_audio.py)
+TTS_WORKERS = 8
+TTS_TIMEOUT = 30.0
+TTS_RETRIES = 3
+TTS_BACKOFF = 1.0
+LOCAL_TTS_WORKERS = None
+
+# Segment cache shared with measure_audio.py / generate_audio.py
+CACHE_DIR = ".tts_cache"
+CACHE_MAX_MB = 500
+
+# Output files
+MANIFEST_PATH = "narration_timing.json"
+# WAV keeps the narration lossless until the single AAC encode in
+# combine_final.py; use .mp3 / .m4a for a standalone file.
+OUTPUT_PATH = "narration.wav"
+
+# Stage timings for `stage_profiler.py report` (None = do not record)
+PROFILE_PATH = "pipeline_profile.jsonl"
+
+# Narration texts in playback order
+NARRATIONS = [
+    "最初のナレーションテキスト。",
+    "2番目のナレーションテキスト。",
+    "3番目のナレーションテキスト。",
+    # Add more narrations here...
+]
+
+# ============================================================
+# IMPLEMENTATION - No need to modify below
+# ============================================================
+
+
+def measure_duration(path: str) -> float:
+    """Duration of a synthesized segment in seconds (the decoded audio is not kept)."""
+    return len(AudioSegment.from_file(path)) / 1000.0
+
+
+def build_timeline(texts: list, durations: list) -> list:
+    """Compute cumulative start offsets from the measured durations (seconds)."""
+    timeline = []
+    cursor = LEAD_IN_SECONDS
+    for i, (text, duration) in enumerate(zip(texts, durations)):
+        timeline.append({
+            "index": i,
+            "text": text,
+            "start": round(cursor, 3),
+            "duration": round(duration, 3),
+            "end": round(cursor + duration, 3),
+        })
+        cursor += duration + GAP_SECONDS
+    return timeline
+
+
+def write_manifest(timeline: list, path: str, backend) -> dict:
+    """Write the timing manifest as JSON and return it."""
+    manifest = {
+        "voice": VOICE,
+        "rate": RATE,
+        "backend": backend.name,
+        "total_duration": timeline[-1]["end"] if timeline else 0.0,
+        "segments": timeline,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return manifest
+
+
+def load_manifest(path: str = MANIFEST_PATH) -> dict:
+    """Load a timing manifest written by this script."""
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def mix_narration(timeline: list, paths: list, duration_ms: int,
+                  leveler: NarrationLeveler = None) -> NarrationMixer:
+    """Place each segment file on a silent track at its start offset.
+
+    Segments are decoded one at a time and dropped once mixed, and long
+    tracks are memory-mapped (see MIXER_MEMORY_MB), so memory does not grow
+    with the narration length. Close the returned mixer when done, e.g.
+    with a `with` block. With a leveler, every segment is brought to the
+    leveler's target loudness.
+    """
+    mixer = create_mixer(duration_ms, SAMPLE_RATE, max_memory_mb=MIXER_MEMORY_MB)
+    try:
+        for entry, path in zip(timeline, paths):
+            segment = AudioSegment.from_file(path)
+            if leveler:
+                leveler.add(mixer, segment, path, entry["start"])
+            else:
+                mixer.add(segment, int(entry["start"] * 1000))
+    except BaseException:
+        mixer.close()
+        raise
+    return mixer
+
+
+async def main(backend=None):
+    owns_backend = backend is None
+    if owns_backend:
+        backend = create_backend(TTS_ENGINE, VOICE, RATE, LOCAL_TTS_COMMAND, LOCAL_TTS_WORKERS)
+    workers = worker_count(backend, TTS_WORKERS, LOCAL_TTS_WORKERS)
+
+    print(f"Synthesizing {len(NARRATIONS)} narrations ({backend.name}, Voice: {VOICE}, Rate: {RATE})")
+    cache = SegmentCache(CACHE_DIR, CACHE_MAX_MB * 1024**2)
+    jobs = [(text, f"temp_{i}.{backend.extension}") for i, text in enumerate(NARRATIONS)]
+    profiler = StageProfiler(PROFILE_PATH)
+    with profiler.stage("tts", backend=backend.name, segments=len(jobs),
+                        workers=workers) as stage:
+        try:
+            audio_paths = await synthesize_all(
+                jobs, backend,
+                workers=workers, timeout=TTS_TIMEOUT,
+                retries=TTS_RETRIES, backoff=TTS_BACKOFF, cache=cache,
+            )
+        finally:
+            if owns_backend:
+                backend.close()
+        stage.cache("tts", cache.hits, cache.misses)
+
+    # Only the durations are kept: segments are decoded again one at a time
+    # while mixing, so the decoded narration is never held in memory at once
+    timeline = build_timeline(NARRATIONS, [measure_duration(path) for path in audio_paths])
+
+    print("=" * 60)
+    for entry in timeline:
+        print(f"{entry['index']+1:2d}. [{entry['start']:7.2f}s +{entry['duration']:5.2f}s] {entry['text']}")
+    print("=" * 60)
+
+    manifest = write_manifest(timeline, MANIFEST_PATH, backend)
+    total = manifest["total_duration"]
+    print(f"Total duration: {total:.2f}s ({total/60:.1f} min)")
+    print(f"Timing manifest: {MANIFEST_PATH}")
+
+    duration_ms = VIDEO_DURATION_MS or int(total * 1000) + 1
+    print("\nExporting final audio track...")
+    leveler = NarrationLeveler(NARRATION_LUFS, NARRATION_MAX_GAIN_DB)
+    with profiler.stage("narration_mix", segments=len(jobs), output=OUTPUT_PATH) as stage:
+        with mix_narration(timeline, audio_paths, duration_ms, leveler) as mixer:
+            stage.details["mixer"] = type(mixer).__name__
+            mixer.export(OUTPUT_PATH)
+            loudness = leveler.finish(mixer, TIMELINE_PATH)
+        stage.cache("loudness", leveler.cache.hits, leveler.cache.misses)
+    print(f"Audio file created: {OUTPUT_PATH} ({loudness['lufs']} LUFS, peak {loudness['peak']:.2f})")
+    print(f"Narration timeline: {TIMELINE_PATH}")
+
+    return manifest
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
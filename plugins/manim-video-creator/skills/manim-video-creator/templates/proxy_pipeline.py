@@ -0,0 +1,176 @@
+"""
+Proxy Render Pipeline with Promotion to Final Quality
+
+Replaces switching between `manim -ql` and `manim -qh` by hand:
+
+1. proxy    Render the scene at low resolution and frame rate (sections in
+            parallel, cached) and mux it with the cached narration.wav for
+            a quick sync check -> proxy_preview.mp4
+2. approve  Mark the current proxy as approved after watching it
+3. promote  Render the approved scene at final quality. Only sections that
+            changed since the last promotion are rendered again; the rest
+            come from the section cache. Refuses to run if the scene changed
+            after the proxy was approved.
+
+The wall time of every stage is appended to render_times.jsonl.
+
+Usage:
+1. Place section_scene.py, render_sections.py, section_cache.py,
+   tts_cache.py, stage_profiler.py and audio_encoder.py in the same directory; derive your scene from SectionScene
+2. Set SCENE_FILE / SCENE_CLASS below
+3. Run: uv run python proxy_pipeline.py proxy
+        uv run python proxy_pipeline.py approve
+        uv run python proxy_pipeline.py promote
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import time
+from datetime import datetime
+
+from audio_encoder import probe_duration
+from render_sections import plan_keys, render_sections
+
+# ============================================================
+# CONFIGURATION - Modify these settings
+# ============================================================
+
+SCENE_FILE = "scene.py"
+SCENE_CLASS = "MyScene"
+
+# Proxy: 854x480 15fps (-ql); final: 1920x1080 60fps (-qh) or "fourk_quality" (-qk)
+PROXY_QUALITY = "low_quality"
+FINAL_QUALITY = "high_quality"
+
+# Narration track from narration_pipeline.py / generate_audio.py
+NARRATION_PATH = "narration.wav"
+
+PROXY_VIDEO_PATH = ".proxy/MyScene.mp4"
+PROXY_PREVIEW_PATH = "proxy_preview.mp4"
+
+# Same path as `manim -qh scene.py MyScene`, so finalize.py works unchanged
+FINAL_PATH = "media/videos/scene/1080p60/MyScene.mp4"
+
+# Proxy/approval state and stage timings
+STATE_PATH = ".proxy_state.json"
+TIMES_PATH = "render_times.jsonl"
+
+# ============================================================
+# IMPLEMENTATION - No need to modify below
+# ============================================================
+
+
+def load_state(path: str = STATE_PATH) -> dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_state(state: dict, path: str = STATE_PATH):
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False, indent=2)
+    os.replace(temp_path, path)
+
+
+def record_time(stage: str, seconds: float, **details) -> dict:
+    """Append one stage timing to TIMES_PATH."""
+    entry = {"time": datetime.now().isoformat(timespec="seconds"), "stage": stage,
+             "seconds": round(seconds, 3), **details}
+    with open(TIMES_PATH, "a", encoding="utf-8") as f:
+        f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    return entry
+
+
+def changed_sections(keys: dict, previous: dict) -> list:
+    """Section names whose cache key differs from `previous`."""
+    return [name for name, key in keys.items() if previous.get(name) != key]
+
+
+def mux_preview(video_path: str, narration_path: str, output_path: str):
+    """Copy the video stream and add the narration, padded/trimmed to the video length."""
+    duration = probe_duration(video_path)
+    subprocess.run([
+        "ffmpeg", "-hide_banner", "-loglevel", "error", "-y",
+        "-i", video_path, "-i", narration_path,
+        "-map", "0:v:0", "-map", "1:a:0",
+        "-af", f"apad,atrim=0:{duration:.3f}",
+        "-c:v", "copy", "-c:a", "aac", "-b:a", "128k",
+        "-movflags", "+faststart", output_path,
+    ], check=True)
+
+
+def proxy() -> dict:
+    """Render the low-quality proxy and mux it with the narration."""
+    state = load_state()
+    result = render_sections(SCENE_FILE, SCENE_CLASS, PROXY_QUALITY, PROXY_VIDEO_PATH)
+    record_time("proxy_render", result["seconds"],
+                rendered=len(result["rendered"]), sections=len(result["sections"]))
+
+    start = time.perf_counter()
+    mux_preview(PROXY_VIDEO_PATH, NARRATION_PATH, PROXY_PREVIEW_PATH)
+    record_time("proxy_mux", time.perf_counter() - start)
+
+    keys = dict(zip(result["sections"], result["keys"]))
+    state["proxy"] = {"keys": keys, "time": datetime.now().isoformat(timespec="seconds")}
+    save_state(state)
+
+    approved = state.get("approved", {}).get("keys", {})
+    changed = changed_sections(keys, approved)
+    print(f"Proxy preview: {PROXY_PREVIEW_PATH}")
+    print(f"Changed since the last approved proxy: {', '.join(changed) if changed else 'none'}")
+    print("Check the sync, then run: uv run python proxy_pipeline.py approve")
+    return state["proxy"]
+
+
+def approve() -> dict:
+    """Mark the last rendered proxy as approved."""
+    state = load_state()
+    if "proxy" not in state:
+        raise SystemExit("No proxy rendered yet: run `proxy_pipeline.py proxy` first")
+    state["approved"] = state["proxy"]
+    save_state(state)
+    print(f"Approved proxy from {state['approved']['time']} "
+          f"({len(state['approved']['keys'])} sections)")
+    return state["approved"]
+
+
+def promote() -> dict:
+    """Render the approved scene at final quality, reusing unchanged sections."""
+    state = load_state()
+    if "approved" not in state:
+        raise SystemExit("No approved proxy: run `proxy_pipeline.py proxy` and `approve` first")
+
+    start = time.perf_counter()
+    current = plan_keys(SCENE_FILE, SCENE_CLASS, PROXY_QUALITY)
+    record_time("promote_check", time.perf_counter() - start)
+    unapproved = changed_sections(current, state["approved"]["keys"])
+    if unapproved or len(current) != len(state["approved"]["keys"]):
+        raise SystemExit(f"Scene changed after the proxy was approved ({', '.join(unapproved) or 'sections removed'}): "
+                         "run `proxy_pipeline.py proxy` and `approve` again")
+
+    changed = changed_sections(current, state.get("promoted", {}).get("keys", {}))
+    print(f"Promoting {len(changed)} changed of {len(current)} sections to {FINAL_QUALITY}")
+    result = render_sections(SCENE_FILE, SCENE_CLASS, FINAL_QUALITY, FINAL_PATH)
+    record_time("final_render", result["seconds"],
+                rendered=len(result["rendered"]), sections=len(result["sections"]))
+
+    state["promoted"] = state["approved"]
+    save_state(state)
+    print(f"Final video: {FINAL_PATH}")
+    print("Next: uv run python finalize.py")
+    return state["promoted"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Proxy render, approval and promotion to final quality")
+    parser.add_argument("stage", choices=["proxy", "approve", "promote"])
+    args = parser.parse_args()
+    {"proxy": proxy, "approve": approve, "promote": promote}[args.stage]()
+
+
+if __name__ == "__main__":
+    main()
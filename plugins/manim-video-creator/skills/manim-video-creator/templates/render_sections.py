@@ -0,0 +1,242 @@
+"""
+Parallel Section Render Template
+
+Renders each @section of a SectionScene (see section_scene.py) in its own
+process and stitches the section movies with a stream-copy concat, so a
+long video uses every CPU core instead of one. The result is
+frame-identical to `manim -qh scene.py MyScene`.
+
+Rendered sections are kept in a cache (section_cache.py), so after an edit
+only the sections whose code, starting state or narration slot changed
+are rendered again; the rest are reused. Every worker replays the sections
+before its own, so text-heavy scenes should build their Text through
+text_cache.py, which shares built text between the workers and runs.
+
+Usage:
+1. Place section_scene.py, section_cache.py, tts_cache.py and stage_profiler.py
+   next to scene.py
+   and derive your scene from SectionScene
+2. Set SCENE_FILE / SCENE_CLASS / QUALITY below
+3. Run: uv run python render_sections.py
+"""
+
+import importlib.util
+import inspect
+import multiprocessing
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from section_cache import SectionCache, split_scene_source
+from stage_profiler import StageProfiler
+
+# ============================================================
+# CONFIGURATION - Modify these settings
+# ============================================================
+
+SCENE_FILE = "scene.py"
+SCENE_CLASS = "MyScene"
+
+# Manim quality: "low_quality" (-ql), "medium_quality" (-qm),
+# "high_quality" (-qh), "fourk_quality" (-qk)
+QUALITY = "high_quality"
+
+# Render processes (None = number of CPU cores)
+WORKERS = None
+
+# Media directory for each section's render
+SECTIONS_DIR = ".sections"
+
+# Rendered section cache
+SECTION_CACHE_DIR = ".section_cache"
+SECTION_CACHE_MAX_MB = 5000
+
+# Same path as `manim -qh scene.py MyScene`, so finalize.py works unchanged
+OUTPUT_PATH = "media/videos/scene/1080p60/MyScene.mp4"
+
+# Stage timings for `stage_profiler.py report` (None = do not record)
+PROFILE_PATH = "pipeline_profile.jsonl"
+
+# ============================================================
+# IMPLEMENTATION - No need to modify below
+# ============================================================
+
+
+def load_scene_class(scene_file: str, scene_class: str):
+    path = Path(scene_file).resolve()
+    # Let scene.py import section_scene.py from its own directory
+    if str(path.parent) not in sys.path:
+        sys.path.insert(0, str(path.parent))
+    spec = importlib.util.spec_from_file_location(path.stem, path)
+    module = importlib.util.module_from_spec(spec)
+    # Registered so layout adapters and pickling can find the module by name
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return getattr(module, scene_class)
+
+
+def configure(scene_file: str, quality: str, media_dir: str):
+    from manim import config
+
+    config.input_file = scene_file
+    config.quality = quality
+    config.media_dir = media_dir
+    config.disable_caching = True
+    config.write_to_movie = True
+    config.save_last_frame = False
+    config.progress_bar = "none"
+    config.verbosity = "WARNING"
+
+
+def plan_sections(scene_file: str, scene_class: str, quality: str) -> dict:
+    """Run every section with animations skipped (nothing is encoded).
+
+    Returns the Manim version, the state each section starts from and its
+    lead-in and narration slot. Raises if any section overruns its slot, so
+    bad timing fails before anything is encoded.
+    """
+    import manim
+
+    configure(scene_file, quality, os.path.join(SECTIONS_DIR, "plan"))
+    cls = load_scene_class(scene_file, scene_class)
+    names = cls.section_names()
+    scene = cls(section=len(names))
+    scene.render()
+    return {
+        "manim": manim.__version__,
+        "states": scene.section_states,
+        "slots": [[scene.lead_in(index), scene.narration_slot(index)]
+                      for index in range(len(names))],
+    }
+
+
+def render_section(scene_file: str, scene_class: str, index: int,
+                   quality: str, media_dir: str):
+    """Render one section in this process; return its movie path (None if it has no animations)."""
+    configure(scene_file, quality, media_dir)
+    scene = load_scene_class(scene_file, scene_class)(section=index)
+    scene.render()
+    movie = Path(scene.renderer.file_writer.movie_file_path)
+    return str(movie) if movie.exists() else None
+
+
+def stitch(movies: list, output_path: str):
+    """Join section movies without re-encoding (empty files are skipped)."""
+    handle, list_path = tempfile.mkstemp(suffix=".txt", prefix="sections_")
+    with os.fdopen(handle, "w") as f:
+        for movie in movies:
+            if os.path.getsize(movie):
+                f.write(f"file '{os.path.abspath(movie)}'\n")
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    try:
+        subprocess.run([
+            "ffmpeg", "-hide_banner", "-loglevel", "error", "-y",
+            "-f", "concat", "-safe", "0", "-i", list_path,
+            "-c", "copy", "-movflags", "+faststart", output_path,
+        ], check=True)
+    finally:
+        os.remove(list_path)
+
+
+def section_keys(cls, scene_file: str, plan: dict, quality: str) -> list:
+    """Cache key of every section (see section_cache.py)."""
+    shared, sources = split_scene_source(scene_file, cls.__name__)
+    settings = {"quality": quality, "manim": plan["manim"]}
+    keys = []
+    for index, name in enumerate(cls.section_names()):
+        # Sections inherited from another file are keyed by their own source
+        source = sources.get(name) or inspect.getsource(getattr(cls, name))
+        keys.append(SectionCache.key(source, shared, plan["states"][index],
+                                     plan["slots"][index], settings))
+    return keys
+
+
+def plan_keys(scene_file: str, scene_class: str, quality: str) -> dict:
+    """Section name -> cache key of the scene as it is now, without rendering."""
+    cls = load_scene_class(scene_file, scene_class)
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+        plan = pool.submit(plan_sections, scene_file, scene_class, quality).result()
+    return dict(zip(cls.section_names(), section_keys(cls, scene_file, plan, quality)))
+
+
+def prune_text_cache():
+    """Keep the text cache (text_cache.py, if the scene uses it) within its size limit."""
+    try:
+        import text_cache
+    except ImportError:
+        return
+    if os.path.isdir(text_cache.TEXT_CACHE_DIR):
+        text_cache.TextCache().prune()
+
+
+def render_sections(scene_file: str = SCENE_FILE, scene_class: str = SCENE_CLASS,
+                    quality: str = QUALITY, output_path: str = OUTPUT_PATH,
+                    workers: int = WORKERS) -> dict:
+    """Render changed sections in a process pool and stitch all of them into output_path.
+
+    Returns a summary: output_path, section names, cache keys, the indices
+    that were rendered (cache misses) and the wall time in seconds.
+    """
+    cls = load_scene_class(scene_file, scene_class)
+    names = cls.section_names()
+    workers = workers or os.cpu_count()
+    cache = SectionCache(SECTION_CACHE_DIR, SECTION_CACHE_MAX_MB * 1024**2)
+    start = time.perf_counter()
+
+    profiler = StageProfiler(PROFILE_PATH)
+    with profiler.stage("render", scene=scene_class, quality=quality, workers=workers) as stage:
+        # spawn: every worker starts with a fresh manim config
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            plan = pool.submit(plan_sections, scene_file, scene_class, quality).result()
+            keys = section_keys(cls, scene_file, plan, quality)
+            movies = [cache.get(key, "mp4") for key in keys]
+            dirty = [index for index, movie in enumerate(movies) if movie is None]
+            print(f"Rendering {len(dirty)} of {len(names)} sections of {scene_class} "
+                  f"with {workers} workers...")
+
+            # Later sections also replay the ones before them, so start them first
+            futures = {
+                index: pool.submit(render_section, scene_file, scene_class, index, quality,
+                                   os.path.join(SECTIONS_DIR, f"{index:03d}"))
+                for index in reversed(dirty)
+            }
+            for index, name in enumerate(names):
+                if index not in futures:
+                    print(f"  [{index + 1}/{len(names)}] {name} (cached)")
+                    continue
+                movie = futures[index].result()
+                print(f"  [{index + 1}/{len(names)}] {name}" + ("" if movie else " (no animations)"))
+                if movie is None:
+                    # Cache an empty marker so the section is not rendered again
+                    movie = os.path.join(SECTIONS_DIR, f"{index:03d}", "empty.mp4")
+                    os.makedirs(os.path.dirname(movie), exist_ok=True)
+                    open(movie, "wb").close()
+                movies[index] = cache.put(keys[index], "mp4", movie)
+
+        if not any(os.path.getsize(movie) for movie in movies):
+            raise RuntimeError(f"{scene_class} has no animations to render")
+        stitch(movies, output_path)
+        cache.prune(protect=movies)
+        prune_text_cache()
+        stage.details.update(sections=len(names), rendered=len(dirty))
+        stage.cache("sections", cache.hits, cache.misses)
+    elapsed = time.perf_counter() - start
+    print(f"Done in {elapsed:.1f}s: {output_path}")
+    print(cache.summary())
+    return {
+        "output_path": output_path,
+        "sections": names,
+        "keys": keys,
+        "rendered": dirty,
+        "seconds": round(elapsed, 3),
+    }
+
+
+if __name__ == "__main__":
+    render_sections()
@@ -0,0 +1,199 @@
+"""
+Multi-Aspect Batch Render Template
+
+Renders one scene as YouTube 16:9, Shorts 9:16 and Instagram 1:1 in
+parallel (one process per variant) and finalizes all of them with the
+ending from the matching endings/ subdirectory.
+
+Each variant can name a layout adapter: a function in the scene file that
+is called with the scene before construct() and sets the sizes and
+positions the scene reads, e.g.
+
+    def vertical_layout(scene):
+        scene.title_size = 36
+        scene.axes_size = (4, 4)
+
+The Manim frame keeps its height (8 units) and its width follows the
+aspect ratio, so to_edge() and config.frame_width adapt on their own.
+
+Narration and BGM are mixed once (all variants have the same timing) and
+the mix is shared by the three finalize passes, which run concurrently.
+
+Usage:
+1. Place finalize.py, audio_encoder.py, ending_cache.py, loudness.py and
+   render_sections.py (with section_cache.py, tts_cache.py, stage_profiler.py)
+   in the same directory
+2. Set SCENE_FILE / SCENE_CLASS / VARIANTS below
+3. Run: uv run python render_variants.py
+"""
+
+import multiprocessing
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from audio_encoder import probe_duration
+from finalize import SAMPLE_RATE, build_audio_filter, finalize, gain_input_args, write_bgm_gain
+from render_sections import load_scene_class
+
+# ============================================================
+# CONFIGURATION - Modify these settings
+# ============================================================
+
+SCENE_FILE = "scene.py"
+SCENE_CLASS = "MyScene"
+
+# "low_quality" (-ql), "medium_quality" (-qm), "high_quality" (-qh)
+# (sets the frame rate; the resolution comes from VARIANTS)
+QUALITY = "high_quality"
+
+# Variant name (= endings/ subdirectory) -> resolution and layout adapter
+# (name of a function in SCENE_FILE, None = use the scene as written)
+VARIANTS = {
+    "16_9": {"resolution": (1920, 1080), "layout": None},
+    "9_16": {"resolution": (1080, 1920), "layout": "vertical_layout"},
+    "1_1": {"resolution": (1080, 1080), "layout": "square_layout"},
+}
+
+# Render processes (None = one per variant, up to the number of CPU cores)
+WORKERS = None
+
+# Media directory per variant
+VARIANTS_DIR = ".variants"
+
+NARRATION_PATH = "narration.wav"
+
+# Set to None for narration only
+BGM_PATH = "bgm.wav"
+
+# Narration + BGM mix shared by all variants
+MIX_PATH = os.path.join(VARIANTS_DIR, "mix.wav")
+
+ADD_ENDING = True
+
+# {variant} is replaced by the variant name
+OUTPUT_PATTERN = "final_{variant}.mp4"
+
+# ============================================================
+# IMPLEMENTATION - No need to modify below
+# ============================================================
+
+
+def render_variant(scene_file: str, scene_class: str, variant: str,
+                   resolution: tuple, layout: str, quality: str) -> dict:
+    """Render one variant in this process; return its movie path and render time."""
+    from manim import config
+
+    start = time.perf_counter()
+    width, height = resolution
+    config.input_file = scene_file
+    config.quality = quality
+    config.pixel_width = width
+    config.pixel_height = height
+    config.frame_width = config.frame_height * width / height
+    config.media_dir = os.path.join(VARIANTS_DIR, variant)
+    config.output_file = f"{scene_class}_{variant}"
+    config.disable_caching = True
+    config.write_to_movie = True
+    config.save_last_frame = False
+    config.progress_bar = "none"
+    config.verbosity = "WARNING"
+
+    base = load_scene_class(scene_file, scene_class)
+    adapter = None
+    if layout:
+        adapter = getattr(sys.modules[base.__module__], layout, None)
+        if adapter is None:
+            raise RuntimeError(f"Layout adapter {layout}() for {variant} not found in {scene_file}")
+
+    class VariantScene(base):
+        def setup(self):
+            super().setup()
+            self.variant = variant
+            if adapter is not None:
+                adapter(self)
+
+    scene = VariantScene()
+    scene.render()
+    return {
+        "variant": variant,
+        "movie": str(scene.renderer.file_writer.movie_file_path),
+        "seconds": round(time.perf_counter() - start, 3),
+    }
+
+
+def mix_audio(narration_path: str, bgm_path: str, duration: float, output_path: str):
+    """Mix narration + BGM once to `duration` seconds (same chains as finalize.py)."""
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    # finalize's chains read the narration as input 1 and the BGM as input 2
+    # (input 0 is the video there), so input 0 is an unused placeholder
+    cmd = ["ffmpeg", "-hide_banner", "-loglevel", "error", "-y",
+           "-f", "lavfi", "-i", f"anullsrc=r={SAMPLE_RATE}:cl=stereo", "-i", narration_path]
+    gain_path = None
+    if bgm_path:
+        gain_path = write_bgm_gain(duration, bgm_path)
+        cmd += ["-stream_loop", "-1", "-i", bgm_path] + gain_input_args(gain_path)
+    chains = build_audio_filter(duration, bgm_path is not None)
+    cmd += ["-filter_complex", ";".join(chains), "-map", "[main_a]",
+            "-c:a", "pcm_s16le", output_path]
+    try:
+        subprocess.run(cmd, check=True)
+    finally:
+        if gain_path:
+            os.remove(gain_path)
+
+
+def render_variants(scene_file: str = SCENE_FILE, scene_class: str = SCENE_CLASS,
+                    variants: dict = VARIANTS, quality: str = QUALITY,
+                    workers: int = WORKERS) -> dict:
+    """Render every variant concurrently and finalize each one; return variant -> output path."""
+    start = time.perf_counter()
+    load_scene_class(scene_file, scene_class)  # fail fast on a bad file or class name
+    workers = workers or min(len(variants), os.cpu_count() or 1)
+    print(f"Rendering {len(variants)} variants of {scene_class} with {workers} workers...")
+
+    # spawn: each worker sets its own Manim config before importing the scene
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        futures = [pool.submit(render_variant, scene_file, scene_class, variant,
+                               spec["resolution"], spec["layout"], quality)
+                   for variant, spec in variants.items()]
+        renders = [future.result() for future in futures]
+    for render in renders:
+        print(f"  {render['variant']:>5}: {render['movie']} ({render['seconds']:.1f}s)")
+
+    outputs = finish_variants(renders)
+    print(f"Done in {time.perf_counter() - start:.1f}s")
+    for variant, path in outputs.items():
+        print(f"  {variant:>5}: {path}")
+    return outputs
+
+
+def finish_variants(renders: list) -> dict:
+    """Mix the audio for rendered variants and finalize each one; return variant -> output path.
+
+    `renders` are render_variant() results (only "variant" and "movie" are used).
+    """
+    durations = {render["variant"]: probe_duration(render["movie"]) for render in renders}
+    if max(durations.values()) - min(durations.values()) > 0.05:
+        # Layouts changed the timing: mix per variant instead of sharing one mix
+        print(f"Warning: variant durations differ ({durations}); mixing audio per variant")
+        audio = {render["variant"]: (NARRATION_PATH, BGM_PATH) for render in renders}
+    else:
+        mix_audio(NARRATION_PATH, BGM_PATH, max(durations.values()), MIX_PATH)
+        audio = {render["variant"]: (MIX_PATH, None) for render in renders}
+
+    # finalize is one ffmpeg process per variant, so threads are enough
+    with ThreadPoolExecutor(max_workers=len(renders)) as pool:
+        futures = {
+            render["variant"]: pool.submit(finalize, render["movie"], *audio[render["variant"]],
+                                           ADD_ENDING, OUTPUT_PATTERN.format(variant=render["variant"]))
+            for render in renders
+        }
+        return {variant: future.result() for variant, future in futures.items()}
+
+
+if __name__ == "__main__":
+    render_variants()
@@ -8,6 +8,9 @@ Key principles:
 1. Each narration has a measured duration
 2. Animation time + wait time = narration duration
 3. Keep elements within the safe area to avoid cut-off
+
+With narration_timing.json, section_scene_template.py has the same scene
+with narration-driven timing (no hand-computed waits).
 """
 
 from manim import *
@@ -17,6 +20,10 @@ from manim import *
 # Linux: config.font = "Noto Sans CJK JP"
 # Windows: config.font = "Yu Gothic"
 
+# Reuse built Text objects across renders and render_sections.py workers
+# (copy text_cache.py next to this file)
+# from text_cache import CachedText as Text, CachedMarkupText as MarkupText
+
 
 class NarratedScene(Scene):
     """
@@ -64,8 +71,8 @@ class NarratedScene(Scene):
         axes.shift(UP * 0.3)  # Move up to leave room below
 
         self.play(Create(axes), run_time=1.5)
-        # Wait: 4.03 - 1 - 1.5 = 1.53s
-        self.wait(1.53)
+        # Wait: 4.03 - 1 - 1 - 1.5 = 0.53s
+        self.wait(0.53)
 
         # ===== Section 3: Additional Content =====
         # Narration 3: [4.70s] "More content"
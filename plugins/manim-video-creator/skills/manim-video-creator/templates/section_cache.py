@@ -0,0 +1,72 @@
+"""
+Incremental Section Render Cache
+
+Shared helper used by render_sections.py. Copy it next to the other
+templates in your project directory.
+
+Each rendered section movie is stored once under SECTION_CACHE_DIR, keyed
+by a hash of:
+- the section method's source (comments and formatting are ignored),
+- the rest of the scene file (imports, constants, helper methods),
+- the state on screen when the section starts (so a change in an earlier
+  section that alters what a later one shows invalidates it, while a
+  changed wait() does not),
+- the section's lead-in and narration slot from narration_timing.json,
+- the render settings (quality, Manim version).
+
+Fixing one wait time therefore re-renders one section instead of the whole
+video. The cache is size-bounded with LRU eviction like the TTS cache.
+"""
+
+import ast
+import hashlib
+import json
+
+from tts_cache import SegmentCache
+
+
+class SectionCache(SegmentCache):
+    """On-disk cache of rendered section movies."""
+
+    label = "Section cache"
+
+    def __init__(self, cache_dir: str = ".section_cache", max_bytes: int = 5 * 1024**3):
+        super().__init__(cache_dir, max_bytes)
+
+    @staticmethod
+    def key(section_source: str, shared_source: str, start_state: str,
+            narration_slot, settings: dict) -> str:
+        """Return the content hash for one section render."""
+        identity = {
+            "section": section_source,
+            "shared": shared_source,
+            "state": start_state,
+            "narration": narration_slot,
+            "settings": settings,
+        }
+        payload = json.dumps(identity, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def is_section(node) -> bool:
+    return isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and any(
+        isinstance(d, ast.Name) and d.id == "section" for d in node.decorator_list
+    )
+
+
+def split_scene_source(scene_file: str, scene_class: str):
+    """Return (shared source, {section name: section source}) for a scene class.
+
+    Sources are normalized through the AST, so editing comments or
+    formatting does not invalidate cached sections.
+    """
+    with open(scene_file, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=scene_file)
+
+    sections = {}
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef) and node.name == scene_class:
+            sections = {item.name: ast.unparse(item) for item in node.body if is_section(item)}
+            node.body = [item for item in node.body if not is_section(item)] or [ast.Pass()]
+    return ast.unparse(tree), sections
+
@@ -0,0 +1,210 @@
+"""
+Section-Aware Scene Base Class with Narration-Driven Timing
+
+Shared helper used by render_sections.py. Copy it next to scene.py.
+
+A SectionScene is a sequence of @section methods, one per narration
+segment, run in definition order. Rendered normally it behaves like any
+other Scene:
+
+    uv run manim -qh scene.py MyScene --disable_caching
+
+Timing comes from narration_timing.json (written by narration_pipeline.py):
+section i plays from the start of narration segment i to the start of
+segment i + 1 (the last one to its end), so the gaps between narrations
+belong to the section before them, and section 0 is preceded by the
+lead-in silence. A section only declares its animations; when it finishes
+early it is padded with a wait up to the end of its slot, so there are no
+hand-computed self.wait() values to update after a TTS change. Before anything is rendered, all sections are
+run once with animations skipped and every section whose animations
+overrun its narration is reported, so a bad timing fails in seconds instead
+of after a full render. Sections after the last narration segment (e.g. an
+ending) are not padded.
+
+With `section=i`, every section before i is executed with animations
+skipped (mobjects jump to their final state, nothing is encoded), section i
+is rendered and the rest are not run (an index past the last section runs
+everything skipped). render_sections.py uses this to render sections in
+parallel and stitch them with a stream-copy concat. Because
+Manim already encodes every play()/wait() into its own partial movie and
+joins them with a stream copy, the stitched video is frame-identical to a
+serial render.
+
+    from section_scene import SectionScene, section
+
+    class MyScene(SectionScene):
+        @section
+        def intro(self):
+            self.title = Text("Title")
+            self.play(Write(self.title), run_time=1.5)
+            # padded to narration 1 automatically
+
+        @section
+        def explanation(self):
+            self.play(FadeOut(self.title))
+            ...
+
+Sections must be deterministic: share state through attributes on self,
+use the scene's seeded random state, and avoid dt-integrating updaters
+that span a section boundary (a skipped section advances them in one step).
+"""
+
+import hashlib
+import json
+import os
+
+import numpy as np
+from manim import Mobject, Scene
+
+# Mobject attributes that determine how it is drawn
+STATE_ATTRIBUTES = (
+    "points", "fill_rgbas", "stroke_rgbas", "background_stroke_rgbas",
+    "stroke_width", "background_stroke_width", "sheen_factor", "sheen_direction",
+    "z_index", "pixel_array",
+)
+
+
+def section(method):
+    """Mark a Scene method as one independently renderable section."""
+    method.is_section = True
+    return method
+
+
+def load_narration(manifest_path: str) -> list:
+    """Segments of a narration_timing.json manifest ([] if it does not exist)."""
+    if not manifest_path or not os.path.exists(manifest_path):
+        return []
+    with open(manifest_path, encoding="utf-8") as f:
+        return json.load(f)["segments"]
+
+
+class SectionScene(Scene):
+    """Scene built from @section methods that can be rendered one at a time."""
+
+    # Narration manifest that sets each section's duration (None = no padding)
+    narration_manifest = "narration_timing.json"
+
+    # Allowed overrun before a section counts as too long (seconds)
+    timing_tolerance = 0.05
+
+    def __init__(self, *args, section: int = None, **kwargs):
+        # None = render every section (normal manim run)
+        self.section = section
+        # state_fingerprint() at the start of each section that was run
+        self.section_states = []
+        self.narration = load_narration(self.narration_manifest)
+        self.current_section = 0
+        self.section_time = 0.0
+        self.timeline_time = 0.0
+        self.overruns = []
+        # Same random state in every worker as in a serial render
+        kwargs.setdefault("random_seed", 0)
+        super().__init__(*args, **kwargs)
+
+    @classmethod
+    def section_names(cls) -> list:
+        """@section method names in definition order (base classes first)."""
+        names = []
+        for klass in reversed(cls.__mro__):
+            for name, value in vars(klass).items():
+                if getattr(value, "is_section", False) and name not in names:
+                    names.append(name)
+        return names
+
+    def play(self, *args, **kwargs):
+        super().play(*args, **kwargs)
+        # self.duration is the run time of the play()/wait() just compiled
+        self.section_time += self.duration
+        self.timeline_time += self.duration
+
+    def narration_slot(self, index: int):
+        """Seconds from the start of segment `index` to the next segment's start.
+
+        The last segment's slot ends at its end. None if there is no segment.
+        """
+        if index >= len(self.narration):
+            return None
+        segment = self.narration[index]
+        if index + 1 < len(self.narration):
+            return self.narration[index + 1]["start"] - segment["start"]
+        return segment["end"] - segment["start"]
+
+    def lead_in(self, index: int) -> float:
+        """Silence before section `index`'s narration (only section 0 has one)."""
+        if index == 0 and self.narration:
+            return self.narration[0]["start"]
+        return 0.0
+
+    def remaining_time(self) -> float:
+        """Seconds left in the current section's slot (0 without narration)."""
+        slot = self.narration_slot(self.current_section)
+        return max(0.0, slot - self.section_time) if slot is not None else 0.0
+
+    def construct(self):
+        if self.section is None:
+            self.check_timing()
+        for index, name in enumerate(self.section_names()):
+            if self.section is not None and index > self.section:
+                break
+            skip = self.section is not None and index < self.section
+            self.section_states.append(self.state_fingerprint())
+            self.next_section(name, skip_animations=skip)
+            self.current_section = index
+            if self.lead_in(index) > 0:
+                self.wait(self.lead_in(index))
+            self.section_time = 0.0
+            getattr(self, name)()
+            self.fit_to_narration(index, name)
+
+        if self.overruns:
+            raise RuntimeError("Animations overrun their narration:\n  " + "\n  ".join(self.overruns))
+
+    def fit_to_narration(self, index: int, name: str):
+        """Pad the section to the end of its narration slot, or record an overrun."""
+        slot = self.narration_slot(index)
+        if slot is None:
+            return
+        overrun = self.section_time - slot
+        if overrun > self.timing_tolerance:
+            self.overruns.append(f"[{index + 1}] {name}: animations {self.section_time:.2f}s "
+                                 f"> narration {slot:.2f}s (+{overrun:.2f}s)")
+        elif overrun < 0:
+            self.wait(-overrun)
+
+    def check_timing(self):
+        """Run every section with animations skipped and fail on any overrun.
+
+        Nothing is encoded, so this takes seconds even for long scenes.
+        """
+        probe = type(self)(section=len(self.section_names()))
+        probe.setup()
+        probe.construct()
+
+    def state_fingerprint(self) -> str:
+        """Hash of what the next section starts from.
+
+        Covers the mobjects on screen, mobjects kept as attributes on self,
+        the camera frame and background, and the scene time if any updater
+        is running.
+        """
+        digest = hashlib.sha256(repr(self.camera.background_color).encode())
+        tracked = [("screen", mob) for mob in self.mobjects]
+        tracked += [(name, value) for name, value in sorted(vars(self).items())
+                    if isinstance(value, Mobject)]
+        frame = getattr(self.camera, "frame", None)
+        if frame is not None:
+            tracked.append(("frame", frame))
+
+        for label, mob in tracked:
+            digest.update(label.encode())
+            for sub in mob.get_family():
+                digest.update(type(sub).__name__.encode())
+                for attribute in STATE_ATTRIBUTES:
+                    value = getattr(sub, attribute, None)
+                    if isinstance(value, np.ndarray):
+                        digest.update(value.tobytes())
+                    elif value is not None:
+                        digest.update(repr(value).encode())
+                if sub.updaters:
+                    digest.update(repr(self.timeline_time).encode())
+        return digest.hexdigest()
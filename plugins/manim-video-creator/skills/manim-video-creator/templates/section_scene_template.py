@@ -0,0 +1,100 @@
+"""
+Manim Scene Template with Narration-Driven Timing
+
+The NarratedScene of scene_template.py split into @section methods, one
+per narration segment. Each section is padded to its slot in
+narration_timing.json (written by narration_pipeline.py), so no wait times
+are computed by hand, and render_sections.py can render the sections in
+parallel on all CPU cores.
+
+Copy section_scene.py next to this file. The layout adapters at the end
+are used by render_variants.py for the 9:16 and 1:1 variants.
+"""
+
+from manim import *
+
+from section_scene import SectionScene, section
+
+# Japanese font setting (macOS)
+# config.font = "Hiragino Sans"
+# Linux: config.font = "Noto Sans CJK JP"
+# Windows: config.font = "Yu Gothic"
+
+# Reuse built Text objects across renders and render_sections.py workers
+# (copy text_cache.py next to this file)
+# from text_cache import CachedText as Text, CachedMarkupText as MarkupText
+
+
+class NarratedSectionScene(SectionScene):
+    """
+    NarratedScene with narration-driven timing.
+
+    Section i plays over segment i of narration_timing.json
+    (written by narration_pipeline.py).
+    """
+
+    # Layout for 16:9; the adapters below change it for 9:16 and 1:1
+    title_size = 48
+    axes_size = (7, 5)
+
+    @section
+    def title(self):
+        # Narration 1: "Introduction text"
+        self.title_text = Text("Title Here", font_size=self.title_size)
+        self.subtitle = Text("Subtitle Here", font_size=28, color=GRAY)
+        self.subtitle.next_to(self.title_text, DOWN, buff=0.3)
+
+        self.play(Write(self.title_text), run_time=1.5)
+        self.play(FadeIn(self.subtitle), run_time=1)
+        # Padded to the next narration's start automatically
+
+    @section
+    def main_content(self):
+        # Narration 2: "Explanation text"
+        self.play(FadeOut(self.title_text), FadeOut(self.subtitle), run_time=1)
+
+        header = Text("Section Title", font_size=36, color=YELLOW)
+        header.to_edge(UP)
+        self.play(Write(header), run_time=1)
+
+        self.axes = Axes(
+            x_range=[-4, 4, 1],
+            y_range=[-3, 3, 1],
+            x_length=self.axes_size[0],
+            y_length=self.axes_size[1],
+            axis_config={"color": GRAY, "include_numbers": False},
+        )
+        self.axes.shift(UP * 0.3)
+
+        self.play(Create(self.axes), run_time=1.5)
+
+    @section
+    def additional_content(self):
+        # Narration 3: "More content"
+        explanation = Text("Explanation text here", font_size=24)
+        explanation.next_to(self.axes, DOWN, buff=0.3)
+
+        self.play(Write(explanation), run_time=1)
+
+    @section
+    def ending(self):
+        # No narration segment: not padded
+        self.play(*[FadeOut(mob) for mob in self.mobjects], run_time=0.8)
+
+        thanks = Text("Thank you!", font_size=44)
+        self.play(Write(thanks), run_time=1)
+        self.wait(2)
+        self.play(FadeOut(thanks), run_time=0.5)
+
+
+# Layout adapters for render_variants.py: called with the scene before
+# construct() when rendering the Shorts (9:16) and Instagram (1:1) variants.
+# The frame is 4.5 x 8 units at 9:16 and 8 x 8 at 1:1 (14.2 x 8 at 16:9).
+def vertical_layout(scene):
+    scene.title_size = 36
+    scene.axes_size = (4, 4)
+
+
+def square_layout(scene):
+    scene.title_size = 42
+    scene.axes_size = (6, 5)
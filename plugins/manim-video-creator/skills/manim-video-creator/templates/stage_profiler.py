@@ -0,0 +1,314 @@
+"""
+Pipeline Stage Profiler
+
+Shared helper used by generate_audio.py, measure_audio.py, finalize.py,
+combine_final.py, render_sections.py, batch_driver.py and the YouTube
+uploader. Copy it next to the other templates in your project directory.
+
+Every stage appends one JSON line to the profile file with:
+- wall time, CPU time of this process and of its finished child
+  processes (ffmpeg, manim), so external tools are not invisible
+- peak RSS of this process during the stage (Linux; elsewhere the
+  high-water mark of the whole process) and of the largest finished child
+- bytes read / written by this process and its finished children,
+  including pipes (rchar / wchar), and the part that hit the disk
+  (Linux only, null elsewhere)
+- cache hits and misses, plus free-form details
+
+Records carry a run ID so the stages of one video can be reported
+together. The ID comes from PIPELINE_RUN_ID, else from RUN_FILE in the
+current directory (created on first use, replaced by `new-run`).
+
+Usage:
+    from stage_profiler import StageProfiler
+
+    profiler = StageProfiler("pipeline_profile.jsonl")
+    with profiler.stage("tts", voice=VOICE) as stage:
+        ...
+        stage.cache("tts", cache.hits, cache.misses)
+
+    uv run python stage_profiler.py new-run
+    uv run python stage_profiler.py run render -- uv run manim -qh scene.py MyScene
+    uv run python stage_profiler.py report
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+PROFILE_PATH = "pipeline_profile.jsonl"
+RUN_FILE = ".pipeline_run"
+
+# ru_maxrss is in KiB on Linux and in bytes on macOS
+MAXRSS_UNIT = 1 if sys.platform == "darwin" else 1024
+
+
+def current_run_id(run_file: str = RUN_FILE) -> str:
+    """Run ID shared by every stage of one video (see module docstring)."""
+    if os.environ.get("PIPELINE_RUN_ID"):
+        return os.environ["PIPELINE_RUN_ID"]
+    if os.path.exists(run_file):
+        with open(run_file, encoding="utf-8") as f:
+            run_id = f.read().strip()
+        if run_id:
+            return run_id
+    return new_run_id(run_file)
+
+
+def new_run_id(run_file: str = RUN_FILE) -> str:
+    """Start a new run: later stages are reported separately from earlier ones."""
+    run_id = datetime.now().strftime("%Y%m%d-%H%M%S")
+    with open(run_file, "w", encoding="utf-8") as f:
+        f.write(run_id + "\n")
+    return run_id
+
+
+def read_io() -> dict:
+    """Cumulative I/O of this process and its finished children (Linux), else {}."""
+    try:
+        with open("/proc/self/io", encoding="ascii") as f:
+            return {name: int(value) for name, value in
+                    (line.split(": ") for line in f.read().splitlines())}
+    except OSError:
+        return {}
+
+
+def reset_peak_rss() -> bool:
+    """Reset this process's RSS high-water mark (Linux); False if unsupported."""
+    try:
+        with open("/proc/self/clear_refs", "w", encoding="ascii") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def peak_rss() -> int:
+    """RSS high-water mark of this process in bytes."""
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            return int(re.search(r"VmHWM:\s+(\d+)", f.read()).group(1)) * 1024
+    except (OSError, AttributeError):
+        if resource is None:
+            return 0
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * MAXRSS_UNIT
+
+
+def child_usage() -> tuple:
+    """(CPU seconds, largest peak RSS in bytes) of all finished child processes."""
+    if resource is None:
+        return 0.0, 0
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime, usage.ru_maxrss * MAXRSS_UNIT
+
+
+class Stage:
+    """Measurements of one running stage; add cache counts and details to it."""
+
+    def __init__(self, name: str, details: dict):
+        self.name = name
+        self.details = details
+        self.caches = {}
+        # Set to False to record a stage that ended without an exception as failed
+        self.ok = True
+
+    def cache(self, name: str, hits: int, misses: int):
+        """Record hits and misses of a cache used by this stage."""
+        counts = self.caches.setdefault(name, {"hits": 0, "misses": 0})
+        counts["hits"] += hits
+        counts["misses"] += misses
+
+
+class StageProfiler:
+    """Appends one JSON line per stage to `path` (None = measure, do not write)."""
+
+    def __init__(self, path: str = PROFILE_PATH, run_id: str = None):
+        self.path = path
+        self.run_id = run_id or (current_run_id() if path else None)
+        self.lock = threading.Lock()
+        self.active = 0
+
+    @contextmanager
+    def stage(self, name: str, **details):
+        stage = Stage(name, details)
+        with self.lock:
+            # Concurrent stages share the process, so only the first one
+            # resets the RSS high-water mark
+            if self.active == 0:
+                reset_peak_rss()
+            self.active += 1
+        started = datetime.now().isoformat(timespec="seconds")
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        child_cpu_start, _ = child_usage()
+        io_start = read_io()
+        ok = False
+        try:
+            yield stage
+            ok = stage.ok
+        finally:
+            with self.lock:
+                self.active -= 1
+            self.write(self.measure(stage, started, ok, wall_start, cpu_start,
+                                    child_cpu_start, io_start))
+
+    def measure(self, stage: Stage, started: str, ok: bool, wall_start: float,
+                cpu_start: float, child_cpu_start: float, io_start: dict) -> dict:
+        child_cpu, child_peak = child_usage()
+        io_end = read_io()
+
+        def io_delta(field):
+            if field not in io_start or field not in io_end:
+                return None
+            return io_end[field] - io_start[field]
+
+        return {
+            "run": self.run_id,
+            "stage": stage.name,
+            "started": started,
+            "ok": ok,
+            "wall_seconds": round(time.perf_counter() - wall_start, 3),
+            "cpu_seconds": round(time.process_time() - cpu_start, 3),
+            "child_cpu_seconds": round(child_cpu - child_cpu_start, 3),
+            "peak_rss_mb": round(peak_rss() / 1024**2, 1),
+            "child_peak_rss_mb": round(child_peak / 1024**2, 1),
+            "bytes_read": io_delta("rchar"),
+            "bytes_written": io_delta("wchar"),
+            "disk_bytes_read": io_delta("read_bytes"),
+            "disk_bytes_written": io_delta("write_bytes"),
+            "caches": stage.caches,
+            "details": stage.details,
+            "pid": os.getpid(),
+        }
+
+    def write(self, record: dict):
+        if not self.path:
+            return
+        with self.lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def load_records(path: str = PROFILE_PATH, run_id: str = None) -> list:
+    """Records of one run (default: the run of the last record), or all if run_id == "all"."""
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    if run_id == "all" or not records:
+        return records
+    run_id = run_id or records[-1]["run"]
+    return [record for record in records if record["run"] == run_id]
+
+
+def summarize(records: list) -> dict:
+    """Aggregate records per stage (sums, except peaks which take the maximum)."""
+    stages = {}
+    for record in records:
+        summary = stages.setdefault(record["stage"], {
+            "count": 0, "failed": 0, "wall_seconds": 0.0, "cpu_seconds": 0.0,
+            "child_cpu_seconds": 0.0, "peak_rss_mb": 0.0, "child_peak_rss_mb": 0.0,
+            "bytes_read": 0, "bytes_written": 0, "caches": {},
+        })
+        summary["count"] += 1
+        summary["failed"] += 0 if record["ok"] else 1
+        for field in ("wall_seconds", "cpu_seconds", "child_cpu_seconds"):
+            summary[field] += record[field]
+        for field in ("peak_rss_mb", "child_peak_rss_mb"):
+            summary[field] = max(summary[field], record[field])
+        for field in ("bytes_read", "bytes_written"):
+            summary[field] += record[field] or 0
+        for name, counts in record["caches"].items():
+            total = summary["caches"].setdefault(name, {"hits": 0, "misses": 0})
+            total["hits"] += counts["hits"]
+            total["misses"] += counts["misses"]
+
+    total_wall = sum(summary["wall_seconds"] for summary in stages.values())
+    for summary in stages.values():
+        summary["share"] = summary["wall_seconds"] / total_wall if total_wall else 0.0
+        for counts in summary["caches"].values():
+            lookups = counts["hits"] + counts["misses"]
+            counts["hit_rate"] = counts["hits"] / lookups if lookups else None
+    return {
+        "runs": sorted({record["run"] for record in records}),
+        "wall_seconds": round(total_wall, 3),
+        "stages": stages,
+    }
+
+
+def print_report(report: dict):
+    if not report["stages"]:
+        print("No stages recorded")
+        return
+    print(f"Run {', '.join(report['runs'])}: {len(report['stages'])} stages, "
+          f"{report['wall_seconds']:.1f}s wall in total")
+    print(f"{'stage':<16}{'n':>3}{'wall s':>9}{'share':>7}{'cpu s':>8}{'child s':>9}"
+          f"{'peak MB':>9}{'read MB':>9}{'write MB':>9}  caches")
+    ordered = sorted(report["stages"].items(), key=lambda item: -item[1]["wall_seconds"])
+    for name, s in ordered:
+        caches = ", ".join(
+            f"{cache} {counts['hit_rate']:.0%} ({counts['hits']}/{counts['hits'] + counts['misses']})"
+            for cache, counts in s["caches"].items() if counts["hit_rate"] is not None
+        )
+        failed = f"  ({s['failed']} failed)" if s["failed"] else ""
+        print(f"{name:<16}{s['count']:>3}{s['wall_seconds']:>9.1f}{s['share']:>7.0%}"
+              f"{s['cpu_seconds']:>8.1f}{s['child_cpu_seconds']:>9.1f}"
+              f"{max(s['peak_rss_mb'], s['child_peak_rss_mb']):>9.0f}"
+              f"{s['bytes_read'] / 1024**2:>9.1f}{s['bytes_written'] / 1024**2:>9.1f}  "
+              f"{caches}{failed}")
+    slowest, s = ordered[0]
+    print(f"Slowest stage: {slowest} ({s['share']:.0%} of wall time)")
+
+
+def run_command(profiler: StageProfiler, name: str, command: list) -> int:
+    """Profile an external command (e.g. `manim`) as one stage."""
+    with profiler.stage(name, command=" ".join(command)) as stage:
+        returncode = subprocess.run(command).returncode
+        stage.details["returncode"] = returncode
+        stage.ok = returncode == 0
+    return returncode
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pipeline stage profiles and run reports")
+    parser.add_argument("--profile", default=PROFILE_PATH, help=f"Profile file (default: {PROFILE_PATH})")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("new-run", help="Start a new run ID for the following stages")
+    run = sub.add_parser("run", help="Run a command as a profiled stage")
+    run.add_argument("stage")
+    run.add_argument("cmd", nargs=argparse.REMAINDER, help="-- command and arguments")
+    report = sub.add_parser("report", help="Summarize the stages of a run")
+    report.add_argument("--run", help="Run ID, or 'all' (default: the latest run)")
+    report.add_argument("--json", help="Also write the summary as JSON to this file")
+    args = parser.parse_args()
+
+    if args.command == "new-run":
+        print(new_run_id())
+        return 0
+    if args.command == "run":
+        command = args.cmd[1:] if args.cmd[:1] == ["--"] else args.cmd
+        if not command:
+            parser.error("run needs a command after --")
+        return run_command(StageProfiler(args.profile), args.stage, command)
+
+    summary = summarize(load_records(args.profile, args.run))
+    print_report(summary)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2, ensure_ascii=False)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
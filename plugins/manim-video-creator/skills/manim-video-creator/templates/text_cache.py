@@ -0,0 +1,136 @@
+"""
+Persistent Text Mobject Cache
+
+Shared helper for scene.py (used with render_sections.py, which also prunes
+the cache). Copy it next to the other templates in your project directory.
+
+Building a Text lays the string out with Pango, writes an SVG, parses it
+and closes every glyph outline point by point in Python; for Japanese
+titles and captions this dominates the build time of a text-heavy scene.
+It is also repeated far more often than it looks: the timing check builds
+the whole scene once more, every render_sections.py worker replays all the
+sections before its own, and Manim's SVG files live in each render's own
+media directory, so no process reuses another one's work.
+
+CachedText and CachedMarkupText are drop-in replacements that store the
+finished mobject (outlines, colors, chars) under TEXT_CACHE_DIR, keyed by a
+hash of the string, every constructor argument, Text.set_default()
+defaults, the default color, the renderer and the Manim version. Any
+process building the same text loads it from disk instead; repeated texts
+in one process are served from memory. The cache is size-bounded with LRU
+eviction like the TTS cache.
+
+Usage (scene.py):
+    from manim import *
+    from text_cache import CachedText as Text, CachedMarkupText as MarkupText
+"""
+
+import hashlib
+import json
+import os
+import pickle
+from functools import partialmethod
+
+import manim
+from manim import MarkupText, Text, VMobject, config
+
+from tts_cache import SegmentCache
+
+TEXT_CACHE_DIR = ".text_cache"
+TEXT_CACHE_MAX_MB = 200
+
+
+class TextCache(SegmentCache):
+    """On-disk cache of built Text mobjects, with an in-memory layer per process."""
+
+    label = "Text cache"
+
+    def __init__(self, cache_dir: str = TEXT_CACHE_DIR, max_bytes: int = TEXT_CACHE_MAX_MB * 1024**2):
+        super().__init__(cache_dir, max_bytes)
+        self.memory = {}
+
+    @staticmethod
+    def key(kind: str, text: str, settings: dict) -> str:
+        """Return the content hash for one text built with `settings`."""
+        identity = {
+            "kind": kind,
+            "text": text,
+            "settings": settings,
+            "renderer": str(config.renderer),
+            "manim": manim.__version__,
+        }
+        payload = json.dumps(identity, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def load(self, key: str):
+        """Return a fresh copy of the cached mobject state, or None on a miss."""
+        data = self.memory.get(key)
+        if data is not None:
+            self.hits += 1
+        else:
+            path = self.get(key, "pkl")
+            if path is None:
+                return None
+            with open(path, "rb") as f:
+                data = self.memory[key] = f.read()
+        return pickle.loads(data)
+
+    def store(self, key: str, state: dict) -> bool:
+        """Save the state of a freshly built mobject; False if it cannot be pickled."""
+        try:
+            data = pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            return False
+        self.memory[key] = data
+        temp_path = f"{self.path_for(key, 'pkl')}.{os.getpid()}.new.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(data)
+        self.put(key, "pkl", temp_path)
+        return True
+
+
+_cache = None
+
+
+def text_cache() -> TextCache:
+    """The cache shared by every CachedText of this process."""
+    global _cache
+    if _cache is None:
+        _cache = TextCache()
+    return _cache
+
+
+def class_defaults(cls) -> dict:
+    """Keyword defaults installed with Mobject.set_default() on cls and its bases."""
+    defaults = {}
+    for klass in reversed(cls.__mro__):
+        init = vars(klass).get("__init__")
+        if isinstance(init, partialmethod):
+            defaults.update(init.keywords)
+    return defaults
+
+
+class CachedTextMixin:
+    def __init__(self, text: str, *args, **kwargs):
+        cache = text_cache()
+        settings = {
+            "args": repr(args),
+            "kwargs": repr(sorted({**class_defaults(type(self)), **kwargs}.items())),
+            "default_color": repr(VMobject().color),
+        }
+        key = cache.key(type(self).__name__, text, settings)
+        state = cache.load(key)
+        if state is not None:
+            # A mobject is fully described by its attributes (like Mobject.copy())
+            self.__dict__.update(state)
+            return
+        super().__init__(text, *args, **kwargs)
+        cache.store(key, self.__dict__)
+
+
+class CachedText(CachedTextMixin, Text):
+    """Text built once per project and then loaded from TEXT_CACHE_DIR."""
+
+
+class CachedMarkupText(CachedTextMixin, MarkupText):
+    """MarkupText built once per project and then loaded from TEXT_CACHE_DIR."""
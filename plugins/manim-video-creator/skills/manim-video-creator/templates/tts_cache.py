@@ -0,0 +1,97 @@
+"""
+Content-Addressed TTS Segment Cache
+
+Shared helper used by measure_audio.py and generate_audio.py. Copy it next
+to the other templates in your project directory.
+
+Each synthesized segment is stored once under CACHE_DIR, keyed by a hash of
+(text, voice, rate, backend name, backend version). Measuring and generating
+the same script therefore calls TTS only once per line, and editing one line
+only re-synthesizes that line. The cache is size-bounded with LRU eviction
+(file mtime is refreshed on every hit).
+"""
+
+import hashlib
+import json
+import os
+import shutil
+
+
+class SegmentCache:
+    """On-disk cache of synthesized narration segments."""
+
+    label = "TTS cache"
+
+    def __init__(self, cache_dir: str = ".tts_cache", max_bytes: int = 500 * 1024**2):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def key(text: str, backend) -> str:
+        """Return the content hash for a text rendered by a backend."""
+        identity = {
+            "text": text,
+            "backend": backend.name,
+            "version": backend.version,
+            "voice": getattr(backend, "voice", None),
+            "rate": getattr(backend, "rate", None),
+        }
+        payload = json.dumps(identity, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def path_for(self, key: str, extension: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.{extension}")
+
+    def get(self, key: str, extension: str):
+        """Return the cached file path, or None on a miss."""
+        path = self.path_for(key, extension)
+        if os.path.exists(path):
+            os.utime(path)  # Mark as recently used
+            self.hits += 1
+            return path
+        self.misses += 1
+        return None
+
+    def put(self, key: str, extension: str, source_path: str) -> str:
+        """Move a freshly synthesized file into the cache and return its path."""
+        path = self.path_for(key, extension)
+        # Move via a temp name so concurrent readers never see a partial file
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        shutil.move(source_path, temp_path)
+        os.replace(temp_path, path)
+        return path
+
+    def prune(self, protect=()):
+        """Evict least recently used entries until the cache fits max_bytes.
+
+        Paths in `protect` (e.g. segments used by the current run) are kept.
+        """
+        protect = {os.path.abspath(p) for p in protect}
+        entries = []
+        total = 0
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            if not os.path.isfile(path) or name.endswith(".tmp"):
+                continue
+            stat = os.stat(path)
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if os.path.abspath(path) in protect:
+                continue
+            os.remove(path)
+            total -= size
+            removed += 1
+        return removed
+
+    def summary(self) -> str:
+        lookups = self.hits + self.misses
+        rate = self.hits / lookups * 100 if lookups else 0.0
+        return f"{self.label}: {self.hits} hits, {self.misses} misses ({rate:.0f}% hit rate)"
@@ -0,0 +1,317 @@
+"""
+TTS Synthesis Engine for Manim Videos
+
+Shared helper used by measure_audio.py, generate_audio.py and
+narration_pipeline.py. Copy it next to the other templates in your project
+directory.
+
+Provides:
+- A pluggable TTS backend interface (edge-tts by default)
+- Local engines that run offline: any command-line synthesizer such as
+  Open JTalk (one subprocess per segment), or pyopenjtalk in a pool of
+  worker processes, so batches use every CPU core
+- create_backend() to pick a backend from the template configuration
+- A fake backend with injected latency for offline testing
+- A bounded-concurrency synthesis stage with timeout and retry
+- Optional reuse of segments through tts_cache.SegmentCache
+"""
+
+import asyncio
+import hashlib
+import os
+import wave
+from concurrent.futures import ProcessPoolExecutor
+
+# Open JTalk as installed by `apt install open-jtalk open-jtalk-mecab-naist-jdic
+# hts-voice-nitech-jp-atr503-m001` (Homebrew: adjust the dictionary and voice paths)
+OPEN_JTALK_COMMAND = [
+    "open_jtalk",
+    "-x", "/var/lib/mecab/dic/open-jtalk/naist-jdic",
+    "-m", "/usr/share/hts-voice/nitech-jp-atr503-m001/nitech_jp_atr503_m001.htsvoice",
+    "-r", "{speed}",
+    "-ow", "{output}",
+]
+
+
+class TTSBackend:
+    """Base class for TTS backends.
+
+    Subclasses implement synthesize() and write one audio file per call.
+    """
+
+    name = "base"
+    version = "0"
+    extension = "mp3"
+    # Local engines are bound by CPU rather than by a remote service
+    local = False
+
+    async def synthesize(self, text: str, output_path: str):
+        raise NotImplementedError
+
+    def close(self):
+        """Release worker processes or other resources (if any)."""
+
+
+class EdgeTTSBackend(TTSBackend):
+    """Microsoft Edge TTS (requires network access)."""
+
+    name = "edge-tts"
+    extension = "mp3"
+
+    def __init__(self, voice: str, rate: str = "+0%"):
+        self.voice = voice
+        self.rate = rate
+
+    @property
+    def version(self) -> str:
+        import edge_tts
+        return getattr(edge_tts, "__version__", "unknown")
+
+    async def synthesize(self, text: str, output_path: str):
+        import edge_tts
+        communicate = edge_tts.Communicate(text, self.voice, rate=self.rate)
+        await communicate.save(output_path)
+
+
+def rate_to_speed(rate: str) -> float:
+    """Convert an edge-tts rate such as "+20%" to a speed factor (1.2)."""
+    return 1.0 + float(rate.strip().rstrip("%")) / 100
+
+
+class CommandTTSBackend(TTSBackend):
+    """Local synthesizer run as one subprocess per segment (no network).
+
+    `command` is an argument list in which "{output}" is replaced by the
+    WAV path, "{speed}" by the speed factor and "{text}" by the text; if
+    no argument contains "{text}", the text is written to stdin. Examples:
+        OPEN_JTALK_COMMAND
+        ["piper", "--model", "voice.onnx", "--length_scale", "1.0", "--output_file", "{output}"]
+        ["espeak-ng", "-v", "ja", "-w", "{output}", "{text}"]
+    """
+
+    name = "command"
+    extension = "wav"
+    local = True
+
+    def __init__(self, command: list, rate: str = "+0%"):
+        self.command = list(command)
+        self.rate = rate
+
+    @property
+    def version(self) -> str:
+        # The command names the model and voice, so a change invalidates cached segments
+        return hashlib.sha256("\0".join(self.command).encode("utf-8")).hexdigest()[:16]
+
+    def arguments(self, text: str, output_path: str) -> list:
+        values = {"output": output_path, "speed": f"{rate_to_speed(self.rate):g}", "text": text}
+        return [arg.format(**values) for arg in self.command]
+
+    async def synthesize(self, text: str, output_path: str):
+        uses_stdin = not any("{text}" in arg for arg in self.command)
+        process = await asyncio.create_subprocess_exec(
+            *self.arguments(text, output_path),
+            stdin=asyncio.subprocess.PIPE if uses_stdin else asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.PIPE,
+        )
+        try:
+            _, stderr = await process.communicate(text.encode("utf-8") if uses_stdin else None)
+        except asyncio.CancelledError:
+            # Timed out: do not leave the engine running
+            process.kill()
+            await process.wait()
+            raise
+        if process.returncode != 0:
+            message = stderr.decode("utf-8", "replace").strip()
+            raise RuntimeError(f"{self.command[0]} exited with {process.returncode}: {message}")
+
+
+def _pyopenjtalk_load():
+    """Load (on first use: download) the dictionary in a worker process."""
+    import pyopenjtalk
+    pyopenjtalk.g2p("あ")
+
+
+def _pyopenjtalk_synthesize(text: str, output_path: str, speed: float):
+    """Worker process side of PyOpenJTalkBackend."""
+    import numpy as np
+    import pyopenjtalk
+
+    samples, sample_rate = pyopenjtalk.tts(text, speed=speed)
+    with wave.open(output_path, "w") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(np.clip(samples, -32768, 32767).astype("<i2").tobytes())
+
+
+class PyOpenJTalkBackend(TTSBackend):
+    """Open JTalk in-process through pyopenjtalk (`uv add pyopenjtalk`).
+
+    Synthesis holds the GIL, so segments run in a pool of `workers`
+    processes (default: one per CPU core). Each worker loads the
+    dictionary once and keeps it for the following segments.
+    """
+
+    name = "pyopenjtalk"
+    extension = "wav"
+    local = True
+
+    def __init__(self, rate: str = "+0%", workers: int = None):
+        self.rate = rate
+        self.workers = workers or os.cpu_count() or 1
+        self.pool = None
+        self.loaded = False
+        self.starting = asyncio.Lock()
+
+    @property
+    def version(self) -> str:
+        import pyopenjtalk
+        return getattr(pyopenjtalk, "__version__", "unknown")
+
+    async def synthesize(self, text: str, output_path: str):
+        loop = asyncio.get_running_loop()
+        async with self.starting:
+            if self.pool is None:
+                self.pool = ProcessPoolExecutor(max_workers=self.workers)
+            if not self.loaded:
+                # The first use downloads the dictionary: let one worker do
+                # it before all of them try at once
+                await loop.run_in_executor(self.pool, _pyopenjtalk_load)
+                self.loaded = True
+        await loop.run_in_executor(
+            self.pool, _pyopenjtalk_synthesize, text, output_path, rate_to_speed(self.rate))
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+            self.loaded = False
+
+
+def create_backend(engine: str, voice: str, rate: str = "+0%", command: list = None,
+                   workers: int = None) -> TTSBackend:
+    """Backend for a template's TTS_ENGINE setting.
+
+    engine: "edge-tts", "open_jtalk" (OPEN_JTALK_COMMAND unless `command`
+    is given), "command" (`command` required) or "pyopenjtalk".
+    `voice` only applies to edge-tts; local engines take the voice from
+    their command or model.
+    """
+    if engine == "edge-tts":
+        return EdgeTTSBackend(voice, rate)
+    if engine == "open_jtalk":
+        return CommandTTSBackend(command or OPEN_JTALK_COMMAND, rate)
+    if engine == "command":
+        if not command:
+            raise ValueError('TTS_ENGINE = "command" needs LOCAL_TTS_COMMAND')
+        return CommandTTSBackend(command, rate)
+    if engine == "pyopenjtalk":
+        return PyOpenJTalkBackend(rate, workers)
+    raise ValueError(f"Unknown TTS engine: {engine!r} "
+                     f"(use edge-tts, open_jtalk, command or pyopenjtalk)")
+
+
+def worker_count(backend: TTSBackend, workers: int, local_workers: int = None) -> int:
+    """Concurrent syntheses: `workers` for remote services, CPU cores for local engines."""
+    if backend.local:
+        return local_workers or os.cpu_count() or 1
+    return workers
+
+
+class FakeTTSBackend(TTSBackend):
+    """Local stand-in synthesizer for tests and load checks.
+
+    Writes a silent WAV whose length is proportional to the text length,
+    after sleeping for `latency` seconds to mimic a remote round trip.
+    The first `failures` calls raise ConnectionError to exercise retries.
+    """
+
+    name = "fake"
+    version = "1"
+    extension = "wav"
+
+    def __init__(self, latency: float = 0.2, seconds_per_char: float = 0.15,
+                 sample_rate: int = 24000, failures: int = 0):
+        self.latency = latency
+        self.seconds_per_char = seconds_per_char
+        self.sample_rate = sample_rate
+        self.failures = failures
+        self.calls = 0
+
+    async def synthesize(self, text: str, output_path: str):
+        self.calls += 1
+        call_index = self.calls
+        await asyncio.sleep(self.latency)
+        if call_index <= self.failures:
+            raise ConnectionError("fake transient failure")
+
+        n_frames = int(self.sample_rate * self.seconds_per_char * max(len(text), 1))
+        with wave.open(output_path, "w") as wav_file:
+            wav_file.setnchannels(1)
+            wav_file.setsampwidth(2)
+            wav_file.setframerate(self.sample_rate)
+            wav_file.writeframes(b"\x00\x00" * n_frames)
+
+
+async def synthesize_with_retry(backend: TTSBackend, text: str, output_path: str,
+                                timeout: float = 30.0, retries: int = 3,
+                                backoff: float = 1.0):
+    """Synthesize one segment, retrying on errors with exponential backoff.
+
+    Each attempt is bounded by `timeout` seconds. After `retries` failed
+    retries the last error is raised.
+    """
+    attempt = 0
+    while True:
+        try:
+            await asyncio.wait_for(backend.synthesize(text, output_path), timeout)
+            return output_path
+        except Exception as e:
+            if attempt >= retries:
+                raise
+            delay = backoff * (2 ** attempt)
+            print(f"  ⚠️  TTS failed ({type(e).__name__}), retrying in {delay:.1f}s...")
+            await asyncio.sleep(delay)
+            attempt += 1
+
+
+async def synthesize_all(jobs: list, backend: TTSBackend, workers: int = 8,
+                         timeout: float = 30.0, retries: int = 3,
+                         backoff: float = 1.0, cache=None) -> list:
+    """Synthesize all (text, output_path) jobs concurrently.
+
+    At most `workers` requests are in flight at once. Results are returned
+    in the same order as `jobs`, regardless of completion order.
+
+    If a SegmentCache is given, cached segments are reused without calling
+    the backend and new segments are moved into the cache; the returned
+    paths then point into the cache directory.
+    """
+    semaphore = asyncio.Semaphore(max(1, workers))
+    done = 0
+
+    async def run(text: str, output_path: str):
+        nonlocal done
+        key = None
+        if cache is not None:
+            key = cache.key(text, backend)
+            cached_path = cache.get(key, backend.extension)
+            if cached_path:
+                done += 1
+                print(f"  [{done}/{len(jobs)}] (cached) {text[:30]}...")
+                return cached_path
+
+        async with semaphore:
+            await synthesize_with_retry(backend, text, output_path,
+                                        timeout, retries, backoff)
+        if cache is not None:
+            output_path = cache.put(key, backend.extension, output_path)
+        done += 1
+        print(f"  [{done}/{len(jobs)}] {text[:30]}...")
+        return output_path
+
+    paths = await asyncio.gather(*(run(text, path) for text, path in jobs))
+    if cache is not None:
+        cache.prune(protect=paths)
+        print(f"  {cache.summary()}")
+    return paths
@@ -0,0 +1,179 @@
+"""
+Retry policy for YouTube uploads
+
+Exponential backoff with full jitter, a maximum attempt count and a total
+deadline per request, plus classification of which failures are worth
+retrying:
+
+- HTTP 408, 429, 500, 502, 503, 504
+- connection resets / refused / aborted, broken pipes, socket timeouts,
+  truncated responses (requests and http.client transport errors)
+
+Everything else (400, 401, 403 quota errors, 404, ...) fails immediately
+so that quota is not wasted on requests that cannot succeed.
+
+RetryMetrics counts attempts, retries by reason, bytes sent and re-sent,
+and reports the effective throughput (unique bytes / wall time).
+
+Used by youtube_uploader.py; keep both files in the same directory.
+"""
+
+import http.client
+import json
+import random
+import threading
+import time
+from typing import Callable, Optional
+
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+
+
+def error_status(error: Exception) -> Optional[int]:
+    """HTTP status carried by an uploader or googleapiclient error, if any"""
+    status = getattr(error, "status", None)
+    if status is None and getattr(error, "resp", None) is not None:
+        status = getattr(error.resp, "status", None)
+    return int(status) if status is not None else None
+
+
+def transport_errors() -> tuple:
+    """Exception types that mean the connection failed, not the request"""
+    errors = [ConnectionError, TimeoutError, http.client.HTTPException]
+    try:
+        import requests
+
+        errors += [
+            requests.exceptions.ConnectionError,
+            requests.exceptions.Timeout,
+            requests.exceptions.ChunkedEncodingError,
+        ]
+    except ImportError:
+        pass
+    return tuple(errors)
+
+
+def classify(error: Exception) -> Optional[str]:
+    """Return a retry reason ("http_503", "ConnectionResetError", ...) or None if fatal"""
+    status = error_status(error)
+    if status is not None:
+        return f"http_{status}" if status in RETRYABLE_STATUS else None
+    if isinstance(error, transport_errors()):
+        return type(error).__name__
+    return None
+
+
+class RetryMetrics:
+    """Thread-safe counters shared by every upload of a run"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.start = time.perf_counter()
+        self.attempts = 0
+        self.retries = 0
+        self.retries_by_reason = {}
+        self.gave_up = 0
+        self.backoff_seconds = 0.0
+        self.bytes_sent = 0
+        self.bytes_resent = 0
+
+    def record_attempt(self, bytes_sent: int = 0, bytes_resent: int = 0):
+        """One request; bytes_resent = part of bytes_sent that was sent before"""
+        with self.lock:
+            self.attempts += 1
+            self.bytes_sent += bytes_sent
+            self.bytes_resent += bytes_resent
+
+    def record_retry(self, reason: str, delay: float):
+        with self.lock:
+            self.retries += 1
+            self.retries_by_reason[reason] = self.retries_by_reason.get(reason, 0) + 1
+            self.backoff_seconds += delay
+
+    def record_give_up(self):
+        with self.lock:
+            self.gave_up += 1
+
+    def summary(self) -> dict:
+        with self.lock:
+            elapsed = time.perf_counter() - self.start
+            unique = self.bytes_sent - self.bytes_resent
+            return {
+                "attempts": self.attempts,
+                "retries": self.retries,
+                "retries_by_reason": dict(self.retries_by_reason),
+                "gave_up": self.gave_up,
+                "backoff_seconds": round(self.backoff_seconds, 3),
+                "bytes_sent": self.bytes_sent,
+                "bytes_resent": self.bytes_resent,
+                "elapsed_seconds": round(elapsed, 3),
+                "effective_mb_per_second": round(unique / (1024**2) / elapsed, 3) if elapsed else 0.0,
+            }
+
+    def write(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.summary(), f, indent=2)
+
+
+class RetryError(Exception):
+    """Retrying stopped (attempts or deadline exhausted); wraps the last error"""
+
+    def __init__(self, message: str, last_error: Exception):
+        super().__init__(f"{message}: {last_error}")
+        self.last_error = last_error
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter, bounded by attempts and a deadline
+
+    The delay before retry n (1-based) is uniform in
+    [0, min(max_delay, base_delay * 2 ** (n - 1))]. The deadline bounds the
+    total time of one request including all its retries.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 8,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+        deadline: float = 600.0,
+        metrics: Optional[RetryMetrics] = None,
+        rng: Optional[random.Random] = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self.metrics = metrics or RetryMetrics()
+        self.rng = rng or random.Random()
+        self.sleep = sleep
+
+    def backoff(self, retry: int) -> float:
+        return self.rng.uniform(0, min(self.max_delay, self.base_delay * 2 ** (retry - 1)))
+
+    def call(self, operation: Callable):
+        """Run operation(attempt) until it succeeds, fails fatally or the budget runs out
+
+        `attempt` starts at 1, so the operation can resynchronize (e.g. ask
+        for the confirmed upload offset) before a retry.
+        """
+        start = time.monotonic()
+        attempt = 1
+        while True:
+            try:
+                return operation(attempt)
+            except Exception as e:
+                reason = classify(e)
+                if reason is None:
+                    raise
+                if attempt >= self.max_attempts:
+                    self.metrics.record_give_up()
+                    raise RetryError(f"Gave up after {attempt} attempts", e) from e
+                delay = self.backoff(attempt)
+                if time.monotonic() - start + delay > self.deadline:
+                    self.metrics.record_give_up()
+                    raise RetryError(f"Retry deadline of {self.deadline:g}s exceeded", e) from e
+                print(f"⚠️  {reason}, retrying in {delay:.1f}s (attempt {attempt + 1}/{self.max_attempts})")
+                self.metrics.record_retry(reason, delay)
+                self.sleep(delay)
+                attempt += 1
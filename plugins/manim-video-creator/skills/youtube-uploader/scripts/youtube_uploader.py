@@ -22,21 +22,118 @@ Metadata Options:
     --credentials: Path to OAuth 2.0 credentials JSON file (default: credentials.json)
     --playlist: Add to existing playlist (optional, requires playlist ID)
     --publish-at: Schedule publish time in ISO 8601 format (optional)
+
+Batch mode (several videos concurrently, resumable across restarts):
+    python youtube_uploader.py --manifest uploads.json --workers 3 --chunk-mb 32
+
+    The manifest is a JSON list (or {"videos": [...]}) of entries with the
+    same fields as the options above:
+        [{"file": "final_16_9.mp4", "title": "...", "description": "...",
+          "tags": ["manim"], "category": 27, "privacy": "unlisted",
+          "playlist": null, "publish_at": null}]
+
+    Each upload's resumable session URI and confirmed byte offset are saved
+    to --state after every chunk. Running the same command again after an
+    interruption continues each file from its last offset and skips files
+    that are already uploaded.
+
+Retries (both modes, see retry_policy.py):
+    5xx / 408 / 429 responses and connection resets or timeouts are retried
+    with exponential backoff and jitter, up to --max-attempts per request
+    and --retry-deadline seconds; other errors fail immediately. --metrics
+    writes retries, re-sent bytes and effective throughput as JSON.
+
+Service mode (one process, one login, one connection pool for many uploads):
+    some_producer | python youtube_uploader.py --serve
+
+    Reads upload jobs from stdin, one JSON per line (a manifest entry or a
+    list of entries), uploads each job like batch mode and prints one
+    result line per video: RESULT {"file": ..., "video_id": ...} or
+    RESULT {"file": ..., "error": ...}. Ends at EOF.
+
+Profiling:
+    --profile pipeline_profile.jsonl appends "auth" and "upload" stage
+    records (wall / CPU time, peak RSS, bytes, retries) in the format of
+    the manim-video-creator templates' stage_profiler.py, so
+    `stage_profiler.py report` covers the upload with the rest of the video.
+
+Startup:
+    Arguments, files and the manifest are checked before the Google client
+    libraries are imported, so mistakes fail in milliseconds. Uploads only
+    need google-auth; googleapiclient and its discovery document are never
+    loaded.
+
+A single file is uploaded like a one-entry manifest: --chunk-mb applies, and
+re-running the same command after an interruption resumes from --state.
 """
 
 import argparse
 import sys
 import os
 import json
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
-from googleapiclient.http import MediaFileUpload
-from googleapiclient.errors import HttpError
+from retry_policy import RETRYABLE_STATUS, RetryError, RetryPolicy
+
+
+# YouTube resumable upload endpoints
+UPLOAD_URL = "https://www.googleapis.com/upload/youtube/v3/videos"
+PLAYLIST_ITEMS_URL = "https://www.googleapis.com/youtube/v3/playlistItems"
+
+# Resumable upload chunks must be multiples of 256 KiB
+CHUNK_ALIGNMENT = 256 * 1024
+DEFAULT_CHUNK_MB = 32
+DEFAULT_WORKERS = 3
+DEFAULT_STATE_FILE = ".youtube_upload_state.json"
+
+# Seconds to wait for the server on each request
+REQUEST_TIMEOUT = 300
+
+PRIVACY_STATUSES = ("private", "unlisted", "public")
+
+# stage_profiler.py lives with the manim-video-creator templates
+TEMPLATES_DIR = Path(__file__).resolve().parents[2] / "manim-video-creator" / "templates"
+
+
+class UploadError(Exception):
+    """Unexpected response from the resumable upload endpoint"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(f"HTTP {status}: {message}")
+        self.status = status
+
+
+def build_request_body(
+    title: str,
+    description: str = "",
+    tags: Optional[list] = None,
+    category: int = 22,
+    privacy_status: str = "private",
+    publish_at: Optional[str] = None,
+) -> dict:
+    """Build the videos.insert resource body (snippet + status)"""
+    body = {
+        "snippet": {
+            "title": title,
+            "description": description,
+            "tags": tags or [],
+            "categoryId": str(category),
+        },
+        "status": {
+            "privacyStatus": privacy_status,
+        },
+    }
+
+    # Add scheduled publish time if provided
+    if publish_at:
+        body["status"]["publishAt"] = publish_at
+    return body
 
 
 def find_credentials_file(explicit_path: Optional[str] = None) -> str:
@@ -138,14 +235,19 @@ class YouTubeUploader:
         "science": "28",
     }
 
-    def __init__(self, credentials_file: str):
+    def __init__(self, credentials_file: str, retry_policy: Optional[RetryPolicy] = None):
         """Initialize uploader with credentials file"""
         self.credentials_file = credentials_file
-        self.youtube = None
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.credentials = None
+        self._youtube = None
         self._authenticate()
     
     def _authenticate(self):
         """Authenticate with YouTube API using OAuth 2.0"""
+        from google.auth.transport.requests import Request
+        from google.oauth2.credentials import Credentials
+
         credentials = None
         token_file = self.credentials_file.replace("credentials.json", "token.json")
         
@@ -164,6 +266,8 @@ class YouTubeUploader:
                         f"Please download it from Google Cloud Console."
                     )
                 
+                from google_auth_oauthlib.flow import InstalledAppFlow
+
                 flow = InstalledAppFlow.from_client_secrets_file(
                     self.credentials_file, self.SCOPES
                 )
@@ -173,7 +277,13 @@ class YouTubeUploader:
             with open(token_file, "w") as f:
                 f.write(credentials.to_json())
         
-        self.youtube = build(self.API_SERVICE_NAME, self.API_VERSION, credentials=credentials)
+        self.credentials = credentials
+
+    def authorized_session(self):
+        """HTTP session that sends (and refreshes) this uploader's OAuth token"""
+        from google.auth.transport.requests import AuthorizedSession
+
+        return AuthorizedSession(self.credentials)
     
     def upload(
         self,
@@ -185,10 +295,15 @@ class YouTubeUploader:
         privacy_status: str = "private",
         playlist_id: Optional[str] = None,
         publish_at: Optional[str] = None,
+        chunk_size: int = DEFAULT_CHUNK_MB * 1024 * 1024,
+        state_file: str = DEFAULT_STATE_FILE,
     ) -> str:
         """
         Upload video to YouTube
-        
+
+        Uses the resumable sessions of batch mode: calling it again after an
+        interruption continues from the offset saved in state_file.
+
         Args:
             file_path: Path to MP4 video file
             title: Video title
@@ -198,85 +313,372 @@ class YouTubeUploader:
             privacy_status: 'private', 'unlisted', or 'public'
             playlist_id: Optional playlist ID to add video to
             publish_at: Optional ISO 8601 datetime for scheduled publish
-        
+            chunk_size: Bytes per PUT (rounded down to a multiple of 256 KiB)
+            state_file: JSON file holding session URIs and offsets
+
         Returns:
             Video ID on success
         """
-        # Validate file
-        if not os.path.exists(file_path):
-            raise FileNotFoundError(f"Video file not found: {file_path}")
-        
-        file_size = os.path.getsize(file_path)
-        print(f"📹 Uploading: {Path(file_path).name} ({file_size / (1024**2):.1f} MB)")
-        
-        # Build request body
-        body = {
-            "snippet": {
-                "title": title,
-                "description": description,
-                "tags": tags or [],
-                "categoryId": str(category),
-            },
-            "status": {
-                "privacyStatus": privacy_status,
+        entry = check_entry({
+            "file": file_path, "title": title, "description": description, "tags": tags,
+            "category": category, "privacy": privacy_status, "playlist": playlist_id,
+            "publish_at": publish_at,
+        })
+        batch = BatchUploader(self.authorized_session, state_file, chunk_size, workers=1,
+                              policy=self.retry_policy)
+        return batch.upload_entry(entry)
+
+
+class UploadState:
+    """Resumable session URIs and byte offsets, persisted to a JSON file
+
+    Entries are keyed by the absolute video path and written atomically
+    after every confirmed chunk, so a killed process loses at most the
+    chunk that was in flight.
+    """
+
+    def __init__(self, path: str = DEFAULT_STATE_FILE):
+        self.path = path
+        self.lock = threading.Lock()
+        self.entries = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self.entries = json.load(f)
+
+    @staticmethod
+    def key(file_path: str) -> str:
+        return str(Path(file_path).resolve())
+
+    def get(self, file_path: str) -> dict:
+        """Saved entry for the file, or {} if none or the file has changed since"""
+        stat = os.stat(file_path)
+        with self.lock:
+            entry = dict(self.entries.get(self.key(file_path), {}))
+        if entry.get("size") != stat.st_size or entry.get("mtime_ns") != stat.st_mtime_ns:
+            return {}
+        return entry
+
+    def update(self, file_path: str, **fields):
+        stat = os.stat(file_path)
+        with self.lock:
+            entry = self.entries.setdefault(self.key(file_path), {})
+            entry.update(fields, size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(self.entries, f, ensure_ascii=False, indent=2)
+            os.replace(temp_path, self.path)
+
+
+class ResumableUpload:
+    """One video upload over the YouTube resumable upload protocol
+
+    Protocol: POST the metadata to start a session (Location header = session
+    URI), PUT chunks with Content-Range, 308 + Range header = bytes the
+    server has so far, 200/201 = done. `PUT bytes */size` asks for the
+    current offset, which is how an interrupted upload resumes.
+    """
+
+    def __init__(
+        self,
+        session,
+        file_path: str,
+        body: dict,
+        state: UploadState,
+        chunk_size: int = DEFAULT_CHUNK_MB * 1024 * 1024,
+        upload_url: str = UPLOAD_URL,
+        policy: Optional[RetryPolicy] = None,
+    ):
+        self.session = session
+        self.file_path = file_path
+        self.body = body
+        self.state = state
+        self.chunk_size = max(CHUNK_ALIGNMENT, chunk_size // CHUNK_ALIGNMENT * CHUNK_ALIGNMENT)
+        self.upload_url = upload_url
+        self.policy = policy or RetryPolicy()
+        self.size = os.path.getsize(file_path)
+        self.name = Path(file_path).name
+        # End of the furthest byte range sent so far (for the re-sent metric)
+        self.sent_upto = 0
+
+    def start_session(self) -> str:
+        """Create a resumable session and return its URI"""
+        self.policy.metrics.record_attempt()
+        response = self.session.post(
+            self.upload_url,
+            params={"uploadType": "resumable", "part": "snippet,status"},
+            json=self.body,
+            headers={
+                "X-Upload-Content-Type": "video/*",
+                "X-Upload-Content-Length": str(self.size),
             },
-        }
-        
-        # Add scheduled publish time if provided
-        if publish_at:
-            body["status"]["publishAt"] = publish_at
-        
-        # Upload video
-        media = MediaFileUpload(file_path, chunksize=256 * 1024, resumable=True)
-        request = self.youtube.videos().insert(
-            part="snippet,status",
-            body=body,
-            media_body=media,
+            timeout=REQUEST_TIMEOUT,
         )
-        
-        # Execute with progress tracking
-        response = None
-        while response is None:
+        if response.status_code != 200 or "Location" not in response.headers:
+            raise UploadError(response.status_code, response.text)
+        uri = response.headers["Location"]
+        self.state.update(self.file_path, uri=uri, offset=0)
+        return uri
+
+    def _parse(self, response):
+        """Return (offset, None) while in progress or (size, resource) when done"""
+        if response.status_code in (200, 201):
+            return self.size, response.json()
+        if response.status_code == 308:
+            # "Range: bytes=0-N" = N + 1 bytes received; no header = nothing yet
+            received = response.headers.get("Range")
+            return (int(received.rsplit("-", 1)[1]) + 1 if received else 0), None
+        raise UploadError(response.status_code, response.text)
+
+    def query_offset(self, uri: str):
+        """Ask the server how much of the file it has (used when resuming)"""
+        self.policy.metrics.record_attempt()
+        response = self.session.put(
+            uri,
+            headers={"Content-Range": f"bytes */{self.size}", "Content-Length": "0"},
+            timeout=REQUEST_TIMEOUT,
+        )
+        return self._parse(response)
+
+    def send_chunk(self, uri: str, offset: int):
+        with open(self.file_path, "rb") as f:
+            f.seek(offset)
+            data = f.read(self.chunk_size)
+        end = offset + len(data) - 1
+        resent = max(0, min(self.sent_upto, end + 1) - offset)
+        self.sent_upto = max(self.sent_upto, end + 1)
+        self.policy.metrics.record_attempt(len(data), resent)
+        response = self.session.put(
+            uri,
+            data=data,
+            headers={"Content-Range": f"bytes {offset}-{end}/{self.size}"},
+            timeout=REQUEST_TIMEOUT,
+        )
+        return self._parse(response)
+
+    def next_chunk(self, uri: str, offset: int, attempt: int):
+        """Send the chunk at `offset`; on a retry, first ask where the server stopped"""
+        if attempt > 1:
+            # The failed request may have been stored in part (or completely)
+            offset, resource = self.query_offset(uri)
+            if resource is not None:
+                return offset, resource
+        return self.send_chunk(uri, offset)
+
+    def run(self) -> str:
+        """Upload (or resume) the file and return the video ID"""
+        saved = self.state.get(self.file_path)
+        if saved.get("video_id"):
+            print(f"✅ Already uploaded: {self.name} (Video ID: {saved['video_id']})")
+            return saved["video_id"]
+
+        resource = None
+        uri = saved.get("uri")
+        if uri:
             try:
-                status, response = request.next_chunk()
-                if status:
-                    progress = int(status.progress() * 100)
-                    print(f"⏳ Progress: {progress}%")
-            except HttpError as e:
-                if e.resp.status in [500, 502, 503, 504]:
-                    print("⚠️  Server error, retrying...")
-                else:
+                offset, resource = self.policy.call(lambda attempt: self.query_offset(uri))
+                print(f"🔁 Resuming {self.name} at {offset / self.size:.0%}")
+            except UploadError as e:
+                # 404 / 410: the session expired, start over
+                if e.status not in (404, 410):
                     raise
-        
-        video_id = response["id"]
-        print(f"✅ Upload successful! Video ID: {video_id}")
-        print(f"   URL: https://www.youtube.com/watch?v={video_id}")
-        
-        # Add to playlist if specified
-        if playlist_id:
-            self._add_to_playlist(video_id, playlist_id)
-        
+                uri = None
+        if not uri:
+            uri = self.policy.call(lambda attempt: self.start_session())
+            offset = 0
+        self.sent_upto = offset
+
+        last_reported = -1
+        while resource is None:
+            offset, resource = self.policy.call(
+                lambda attempt: self.next_chunk(uri, offset, attempt)
+            )
+            self.state.update(self.file_path, uri=uri, offset=offset)
+            progress = int(offset * 100 / self.size)
+            if progress // 10 != last_reported // 10:
+                print(f"⏳ {self.name}: {progress}%")
+                last_reported = progress
+
+        video_id = resource["id"]
+        self.state.update(self.file_path, uri=None, offset=self.size, video_id=video_id)
+        print(f"✅ Upload successful! {self.name} → https://www.youtube.com/watch?v={video_id}")
         return video_id
-    
-    def _add_to_playlist(self, video_id: str, playlist_id: str):
-        """Add uploaded video to a playlist"""
+
+
+class BatchUploader:
+    """Uploads the videos of a manifest concurrently with resumable sessions"""
+
+    def __init__(
+        self,
+        session_factory,
+        state_file: str = DEFAULT_STATE_FILE,
+        chunk_size: int = DEFAULT_CHUNK_MB * 1024 * 1024,
+        workers: int = DEFAULT_WORKERS,
+        upload_url: str = UPLOAD_URL,
+        playlist_url: str = PLAYLIST_ITEMS_URL,
+        policy: Optional[RetryPolicy] = None,
+    ):
+        """
+        Args:
+            session_factory: Callable returning a requests-compatible session
+                (AuthorizedSession for YouTube); sessions are pooled, so their
+                connections are reused by later uploads and batches
+            state_file: JSON file holding session URIs and offsets
+            chunk_size: Bytes per PUT (rounded down to a multiple of 256 KiB)
+            workers: Number of files uploaded at the same time
+            policy: Retry policy shared by all uploads (its metrics cover the batch)
+        """
+        self.session_factory = session_factory
+        self.state = UploadState(state_file)
+        self.chunk_size = chunk_size
+        self.workers = workers
+        self.upload_url = upload_url
+        self.playlist_url = playlist_url
+        self.policy = policy or RetryPolicy()
+        self.idle_sessions = queue.SimpleQueue()
+
+    @contextmanager
+    def session(self):
+        """Borrow an idle session (open connections included) or create one"""
         try:
-            request = self.youtube.playlistItems().insert(
-                part="snippet",
-                body={
+            session = self.idle_sessions.get_nowait()
+        except queue.Empty:
+            session = self.session_factory()
+        try:
+            yield session
+        finally:
+            self.idle_sessions.put(session)
+
+    def upload_entry(self, entry: dict) -> str:
+        body = build_request_body(
+            entry["title"],
+            entry.get("description", ""),
+            entry.get("tags"),
+            entry.get("category", 22),
+            entry.get("privacy", "private"),
+            entry.get("publish_at"),
+        )
+        with self.session() as session:
+            upload = ResumableUpload(
+                session, entry["file"], body, self.state, self.chunk_size, self.upload_url,
+                self.policy,
+            )
+            video_id = upload.run()
+            if entry.get("playlist") and not self.state.get(entry["file"]).get("playlist_added"):
+                self.add_to_playlist(session, video_id, entry["playlist"])
+                self.state.update(entry["file"], playlist_added=True)
+        return video_id
+
+    def add_to_playlist(self, session, video_id: str, playlist_id: str):
+        def insert(attempt: int):
+            self.policy.metrics.record_attempt()
+            response = session.post(
+                self.playlist_url,
+                params={"part": "snippet"},
+                json={
                     "snippet": {
                         "playlistId": playlist_id,
-                        "resourceId": {
-                            "kind": "youtube#video",
-                            "videoId": video_id,
-                        },
+                        "resourceId": {"kind": "youtube#video", "videoId": video_id},
                     }
                 },
+                timeout=REQUEST_TIMEOUT,
             )
-            request.execute()
+            if response.status_code in RETRYABLE_STATUS:
+                raise UploadError(response.status_code, response.text)
+            return response
+
+        response = self.policy.call(insert)
+        if response.status_code == 200:
             print(f"✅ Added to playlist: {playlist_id}")
-        except HttpError as e:
-            print(f"⚠️  Could not add to playlist: {e}")
+        else:
+            print(f"⚠️  Could not add to playlist: HTTP {response.status_code} {response.text}")
+
+    def upload_all(self, entries: list) -> dict:
+        """Upload every entry; return {file: video ID or the exception}
+
+        Entries naming the same file (by resolved path) are uploaded once,
+        under the first entry's metadata.
+        """
+        unique = {}
+        for entry in entries:
+            key = UploadState.key(entry["file"])
+            if key in unique:
+                print(f"⚠️  {entry['file']} is listed more than once; uploading it once "
+                      f"as '{unique[key]['title']}'", file=sys.stderr)
+            else:
+                unique[key] = entry
+        entries = list(unique.values())
+        total = sum(os.path.getsize(entry["file"]) for entry in entries)
+        print(f"📦 Uploading {len(entries)} videos ({total / (1024**2):.1f} MB) "
+              f"with {min(self.workers, len(entries))} workers, {self.chunk_size / (1024**2):g} MB chunks")
+        results = {}
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = {entry["file"]: pool.submit(self.upload_entry, entry) for entry in entries}
+            for file_path, future in futures.items():
+                try:
+                    results[file_path] = future.result()
+                except Exception as e:
+                    print(f"❌ {file_path}: {e}", file=sys.stderr)
+                    results[file_path] = e
+        return results
+
+
+def check_entry(entry: dict) -> dict:
+    """Check one upload (manifest entry, service job or CLI arguments) before anything is sent"""
+    if not isinstance(entry, dict) or "file" not in entry or "title" not in entry:
+        raise ValueError(f"Upload entry needs 'file' and 'title': {entry}")
+    if not os.path.exists(entry["file"]):
+        raise FileNotFoundError(f"Video file not found: {entry['file']}")
+    if os.path.getsize(entry["file"]) == 0:
+        # What a failed render leaves behind; the upload protocol needs at least one byte
+        raise ValueError(f"Video file is empty: {entry['file']}")
+    if entry.get("privacy", "private") not in PRIVACY_STATUSES:
+        raise ValueError(f"privacy must be one of {', '.join(PRIVACY_STATUSES)}: {entry['privacy']}")
+    if entry.get("publish_at"):
+        try:
+            datetime.fromisoformat(entry["publish_at"].replace("Z", "+00:00"))
+        except ValueError:
+            raise ValueError(
+                f"publish_at must be ISO 8601 (e.g. 2025-01-15T15:30:00Z): {entry['publish_at']}"
+            ) from None
+    if isinstance(entry.get("tags"), str):
+        entry["tags"] = [tag.strip() for tag in entry["tags"].split(",") if tag.strip()]
+    return entry
+
+
+def load_manifest(path: str) -> list:
+    """Read an upload manifest and check every entry before anything is sent"""
+    with open(path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    entries = manifest["videos"] if isinstance(manifest, dict) else manifest
+    return [check_entry(entry) for entry in entries]
+
+
+def serve(batch: "BatchUploader", jobs=sys.stdin) -> int:
+    """Upload jobs read line by line from `jobs` with one client; return the failure count
+
+    Each line is a manifest entry or a list of entries. Every video gets one
+    `RESULT {json}` line on stdout, so a producer can pair results with jobs.
+    """
+    failures = 0
+    print("🟢 Ready for upload jobs (one JSON per line, EOF to stop)", flush=True)
+    for line in jobs:
+        if not line.strip():
+            continue
+        try:
+            job = json.loads(line)
+            entries = [check_entry(entry) for entry in (job if isinstance(job, list) else [job])]
+        except (ValueError, FileNotFoundError) as e:
+            print("RESULT " + json.dumps({"job": line.strip(), "error": str(e)}), flush=True)
+            failures += 1
+            continue
+        for file_path, result in batch.upload_all(entries).items():
+            if isinstance(result, Exception):
+                failures += 1
+                outcome = {"file": file_path, "error": str(result)}
+            else:
+                outcome = {"file": file_path, "video_id": result}
+            print("RESULT " + json.dumps(outcome), flush=True)
+    return failures
 
 
 def parse_args():
@@ -306,14 +708,17 @@ Examples:
   python youtube_uploader.py video.mp4 \\
     --title "Playlist Video" \\
     --playlist "PLxxxxxxxxxxxx"
+  
+  # Upload several videos concurrently (re-run to resume after an interruption)
+  python youtube_uploader.py --manifest uploads.json --workers 3 --chunk-mb 32
         """,
     )
     
-    # Required arguments
-    parser.add_argument("file", help="Path to MP4 video file")
+    # Required arguments (or --manifest)
+    parser.add_argument("file", nargs="?", help="Path to MP4 video file")
     
     # Metadata arguments
-    parser.add_argument("--title", required=True, help="Video title (required)")
+    parser.add_argument("--title", help="Video title (required without --manifest)")
     parser.add_argument("--description", default="", help="Video description")
     parser.add_argument(
         "--tags",
@@ -324,7 +729,7 @@ Examples:
     # Status arguments
     parser.add_argument(
         "--privacy",
-        choices=["private", "unlisted", "public"],
+        choices=PRIVACY_STATUSES,
         default="private",
         help="Privacy status (default: private)",
     )
@@ -350,7 +755,122 @@ Examples:
         help="Playlist ID to add video to (optional)",
     )
     
-    return parser.parse_args()
+    # Batch mode
+    parser.add_argument(
+        "--manifest",
+        help="JSON list of videos to upload concurrently (replaces file/--title)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f"Videos uploaded at the same time in batch mode (default: {DEFAULT_WORKERS})",
+    )
+    parser.add_argument(
+        "--chunk-mb",
+        type=float,
+        default=DEFAULT_CHUNK_MB,
+        help=f"Upload chunk size in MB, rounded to 256 KiB (default: {DEFAULT_CHUNK_MB})",
+    )
+    parser.add_argument(
+        "--state",
+        default=DEFAULT_STATE_FILE,
+        help=f"File keeping resumable upload sessions (default: {DEFAULT_STATE_FILE})",
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Read upload jobs (JSON lines) from stdin and upload them with one login",
+    )
+    parser.add_argument(
+        "--profile",
+        help="Append stage timings (JSON lines, see stage_profiler.py) to this file",
+    )
+    # Base URL of the API (local stand-in server for benchmarks)
+    parser.add_argument("--api-root", help=argparse.SUPPRESS)
+    
+    # Retries
+    parser.add_argument(
+        "--max-attempts",
+        type=int,
+        default=8,
+        help="Attempts per request before giving up (default: 8)",
+    )
+    parser.add_argument(
+        "--retry-deadline",
+        type=float,
+        default=600,
+        help="Seconds one request may spend retrying (default: 600)",
+    )
+    parser.add_argument(
+        "--metrics",
+        help="Write retry / throughput metrics as JSON to this file",
+    )
+    
+    args = parser.parse_args()
+    if not args.manifest and not args.serve and not (args.file and args.title):
+        parser.error("file and --title are required (or use --manifest / --serve)")
+    return args
+
+
+def validate_inputs(args) -> Optional[list]:
+    """Check files, manifest and options before the Google libraries are loaded
+
+    Returns the entries to upload (the manifest, or the single file as one
+    entry), or None in service mode.
+    """
+    if args.manifest:
+        return load_manifest(args.manifest)
+    if args.serve:
+        return None
+    return [check_entry({
+        "file": args.file, "title": args.title, "description": args.description,
+        "tags": args.tags, "category": args.category, "privacy": args.privacy,
+        "playlist": args.playlist, "publish_at": args.publish_at,
+    })]
+
+
+def report_metrics(policy: RetryPolicy, metrics_path: Optional[str] = None):
+    """Print the retry summary and optionally save it as JSON"""
+    metrics = policy.metrics.summary()
+    print(f"📊 {metrics['retries']} retries, {metrics['bytes_resent'] / (1024**2):.1f} MB re-sent, "
+          f"{metrics['effective_mb_per_second']:.1f} MB/s effective")
+    if metrics_path:
+        policy.metrics.write(metrics_path)
+
+
+class NullStage:
+    """Stage of NullProfiler: takes details and cache counts, records nothing"""
+
+    def __init__(self, details: dict):
+        self.details = details
+        self.ok = True
+
+    def cache(self, name: str, hits: int, misses: int):
+        pass
+
+
+class NullProfiler:
+    """Used without --profile, so the uploader does not need the templates"""
+
+    @contextmanager
+    def stage(self, name: str, **details):
+        yield NullStage(details)
+
+
+def load_profiler(profile_path: Optional[str]):
+    """StageProfiler writing to profile_path, or a NullProfiler without one
+
+    stage_profiler.py is imported from the manim-video-creator templates
+    only when profiling was asked for.
+    """
+    if not profile_path:
+        return NullProfiler()
+    if str(TEMPLATES_DIR) not in sys.path:
+        sys.path.append(str(TEMPLATES_DIR))
+    from stage_profiler import StageProfiler
+
+    return StageProfiler(profile_path)
 
 
 def main():
@@ -358,34 +878,57 @@ def main():
     args = parse_args()
 
     try:
-        # Parse tags
-        tags = [tag.strip() for tag in args.tags.split(",")] if args.tags else []
-
+        # Fail fast: nothing below this block is needed to reject bad input
+        entries = validate_inputs(args)
+        
         # Find credentials file (auto-search if not explicitly specified)
         credentials_path = find_credentials_file(args.credentials)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"❌ Error: {e}", file=sys.stderr)
+        return 1
 
+    try:
         # Initialize uploader
-        uploader = YouTubeUploader(credentials_path)
+        profiler = load_profiler(args.profile)
+        policy = RetryPolicy(max_attempts=args.max_attempts, deadline=args.retry_deadline)
+        with profiler.stage("auth"):
+            uploader = YouTubeUploader(credentials_path, policy)
         
-        # Upload video
-        video_id = uploader.upload(
-            file_path=args.file,
-            title=args.title,
-            description=args.description,
-            tags=tags,
-            category=args.category,
-            privacy_status=args.privacy,
-            playlist_id=args.playlist,
-            publish_at=args.publish_at,
+        urls = {}
+        if args.api_root:
+            urls = {"upload_url": f"{args.api_root}/upload/youtube/v3/videos",
+                    "playlist_url": f"{args.api_root}/youtube/v3/playlistItems"}
+        batch = BatchUploader(
+            uploader.authorized_session,
+            state_file=args.state,
+            chunk_size=int(args.chunk_mb * 1024 * 1024),
+            workers=args.workers,
+            policy=policy,
+            **urls,
         )
-        
-        return 0
+        if args.serve:
+            with profiler.stage("upload", mode="serve") as stage:
+                failures = serve(batch)
+                stage.details.update(failures=failures, **policy.metrics.summary())
+            report_metrics(policy, args.metrics)
+            return 1 if failures else 0
+
+        # A single file is a one-entry batch (same chunks, same resume)
+        mode = "batch" if args.manifest else "single"
+        with profiler.stage("upload", mode=mode, videos=len(entries)) as stage:
+            results = batch.upload_all(entries)
+            stage.details.update(policy.metrics.summary())
+        report_metrics(policy, args.metrics)
+        failed = [path for path, result in results.items() if isinstance(result, Exception)]
+        print(f"📋 {len(results) - len(failed)}/{len(results)} uploaded"
+              + (f", {len(failed)} failed (re-run to resume)" if failed else ""))
+        return 1 if failed else 0
     
-    except FileNotFoundError as e:
+    except (FileNotFoundError, ValueError) as e:
         print(f"❌ Error: {e}", file=sys.stderr)
         return 1
-    except HttpError as e:
-        print(f"❌ YouTube API Error: {e}", file=sys.stderr)
+    except RetryError as e:
+        print(f"❌ Upload failed: {e}", file=sys.stderr)
         return 1
     except Exception as e:
         print(f"❌ Error: {e}", file=sys.stderr)